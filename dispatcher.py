@@ -0,0 +1,214 @@
+import collections
+import logging
+import threading
+import time
+from ratelimit import TokenBucket
+
+# Batas Telegram Bot API: ~30 pesan/detik global, ~1 pesan/detik per chat, ~20 pesan/menit per grup
+DEFAULT_GLOBAL_RATE = 30.0
+DEFAULT_CHAT_RATE = 1.0
+DEFAULT_GROUP_RATE = 20.0 / 60.0
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_MAX_RETRIES = 5
+# Panjang maksimum teks satu pesan Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+def split_message(message: str, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """
+    Memecah pesan panjang menjadi beberapa bagian yang masing-masing muat dalam batas Telegram.
+
+    Pemotongan dilakukan di batas paragraf (baris kosong), lalu di akhir baris,
+    dan baru dipotong paksa jika satu baris saja sudah melebihi batas.
+
+    :param message: Teks pesan.
+    :param limit: Panjang maksimum per bagian.
+    :return: List bagian pesan (satu elemen jika sudah cukup pendek).
+    """
+    parts = []
+    while len(message) > limit:
+        cut = message.rfind('\n\n', 0, limit)
+        if cut <= 0:
+            cut = message.rfind('\n', 0, limit)
+        if cut <= 0:
+            cut = limit
+        parts.append(message[:cut].rstrip('\n'))
+        message = message[cut:].lstrip('\n')
+    if message or not parts:
+        parts.append(message)
+    return parts
+
+class TelegramDispatcher:
+    """
+    Antrian pengiriman pesan Telegram dengan worker di background.
+
+    `enqueue` tidak pernah memblokir loop pemantauan. Worker membatasi laju
+    dengan token bucket global dan per chat, menghormati `retry_after` pada
+    respons 429, dan mencoba ulang error lain dengan backoff.
+    """
+
+    def __init__(self, send, default_chat_id: str, global_rate: float = DEFAULT_GLOBAL_RATE,
+                 chat_rate: float = DEFAULT_CHAT_RATE, group_rate: float = DEFAULT_GROUP_RATE,
+                 max_queue: int = DEFAULT_MAX_QUEUE, max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        :param send: Fungsi (message, chat_id) -> (berhasil, retry_after atau None).
+        :param default_chat_id: Chat tujuan jika enqueue tidak menyebut chat_id.
+        :param global_rate: Pesan per detik untuk semua chat.
+        :param chat_rate: Pesan per detik per chat pribadi.
+        :param group_rate: Pesan per detik per grup/channel (chat_id negatif).
+        :param max_queue: Panjang antrian maksimum; pesan baru dibuang jika penuh.
+        :param max_retries: Jumlah percobaan untuk error selain 429.
+        """
+        self.send = send
+        self.default_chat_id = default_chat_id
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.global_bucket = TokenBucket(global_rate)
+        self._chat_buckets = {}
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._paused_until = 0.0
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.send_latency_total = 0.0
+        self.queue_latency_total = 0.0
+
+    def configure(self, global_rate: float = None, chat_rate: float = None, group_rate: float = None) -> None:
+        """
+        Mengganti batas laju; bucket per chat dibuat ulang dengan laju baru.
+        """
+        if global_rate:
+            self.global_bucket = TokenBucket(global_rate)
+        if chat_rate:
+            self.chat_rate = chat_rate
+        if group_rate:
+            self.group_rate = group_rate
+        self._chat_buckets = {}
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self.group_rate if str(chat_id).startswith('-') else self.chat_rate
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate, capacity=3)
+        return bucket
+
+    def enqueue(self, message: str, chat_id: str = None) -> bool:
+        """
+        Memasukkan pesan ke antrian tanpa menunggu pengiriman; pesan yang
+        melebihi batas panjang Telegram dipecah menjadi beberapa pesan.
+
+        :param message: Pesan yang akan dikirim.
+        :param chat_id: ID chat tujuan (default dari konstruktor).
+        :return: True jika masuk antrian, False jika antrian penuh.
+        """
+        chat_id = str(chat_id or self.default_chat_id)
+        parts = split_message(message)
+        with self._condition:
+            if len(self._queue) + len(parts) > self.max_queue:
+                self.dropped += 1
+                logging.warning(f"Antrian Telegram penuh ({self.max_queue}), pesan dibuang.")
+                return False
+            now = time.monotonic()
+            for part in parts:
+                self._queue.append([part, chat_id, now, 0])
+            self._condition.notify()
+        return True
+
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        """
+        Menjalankan worker pengiriman di thread daemon.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Menghentikan worker setelah antrian kosong atau timeout tercapai.
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running and not self._queue:
+                    return
+                item = self._queue[0]
+
+            message, chat_id, enqueued_at, attempts = item
+            chat_bucket = self._chat_bucket(chat_id)
+            wait = max(self._paused_until - time.monotonic(), self.global_bucket.wait_time(), chat_bucket.wait_time())
+            if wait > 0:
+                time.sleep(min(wait, 1.0))
+                continue
+            self.global_bucket.try_acquire()
+            chat_bucket.try_acquire()
+
+            with self._condition:
+                self._queue.popleft()
+
+            start_time = time.monotonic()
+            try:
+                ok, retry_after = self.send(message, chat_id)
+            except Exception as e:
+                logging.error(f"Error di worker Telegram: {e}")
+                ok, retry_after = False, None
+            now = time.monotonic()
+
+            if ok:
+                self.sent += 1
+                self.send_latency_total += now - start_time
+                self.queue_latency_total += now - enqueued_at
+                continue
+
+            if retry_after is not None:
+                # 429: tahan semua pengiriman selama retry_after lalu kirim ulang pesan yang sama
+                self.rate_limited += 1
+                self._paused_until = now + retry_after
+                logging.warning(f"Telegram 429, menunggu {retry_after}s sebelum mengirim ulang.")
+                with self._condition:
+                    self._queue.appendleft(item)
+                continue
+
+            item[3] = attempts + 1
+            if item[3] >= self.max_retries:
+                self.failed += 1
+                logging.error(f"Pesan ke chat {chat_id} gagal setelah {item[3]} percobaan, dibuang.")
+                continue
+            self._paused_until = now + min(2 ** attempts, 30)
+            with self._condition:
+                self._queue.appendleft(item)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict berisi kedalaman antrian, jumlah terkirim/gagal/dibuang/429, dan latensi rata-rata (ms).
+        """
+        return {
+            "queue_depth": len(self._queue),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rate_limited": self.rate_limited,
+            "avg_send_latency_ms": self.send_latency_total / self.sent * 1000 if self.sent else 0.0,
+            "avg_queue_latency_ms": self.queue_latency_total / self.sent * 1000 if self.sent else 0.0,
+        }
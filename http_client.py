@@ -0,0 +1,45 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from misc import get_header
+
+# Ukuran pool koneksi keep-alive per host (>= concurrency polling)
+DEFAULT_POOL_SIZE = 32
+# Timeout (connect, read) dalam detik
+DEFAULT_TIMEOUT = (5.0, 10.0)
+
+class HttpClient:
+    """
+    Klien HTTP bersama dengan connection pooling dan keep-alive.
+
+    Satu sesi dipakai ulang untuk semua request sehingga koneksi TLS tidak
+    dibuka ulang setiap kali; header default dibuat sekali, dan
+    `Accept-Encoding` hanya mengiklankan kompresi yang bisa didekode.
+    """
+
+    def __init__(self, headers=None, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        """
+        :param headers: Header default setiap request (opsional).
+        :param pool_size: Jumlah koneksi keep-alive per host.
+        :param timeout: Timeout default (connect, read) dalam detik.
+        """
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(headers or {})
+        self._session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+
+    def post(self, url, timeout=None, **kwargs):
+        return self._session.post(url, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+
+    def get(self, url, timeout=None, **kwargs):
+        return self._session.get(url, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+
+    def close(self):
+        self._session.close()
+
+# Klien untuk API Hyperliquid (dengan header browser) dan untuk Telegram Bot API
+api_client = HttpClient(headers=get_header())
+telegram_client = HttpClient()
@@ -1,47 +1,38 @@
 import requests
 import json
+from http_client import api_client
+from markprice import MarkPriceCache
 
-def get_markprice(symbol):
+def get_meta_and_asset_ctxs():
     """
-    Mendapatkan harga mark (mark price) dari Hyperliquid API.
+    Mengunduh seluruh universe metaAndAssetCtxs dari Hyperliquid API.
     
-    :param symbol: Simbol trading (misalnya, BTC, ETH).
-    :return: Harga mark atau pesan kesalahan jika gagal.
+    :return: List [meta, assetCtxs] atau pesan kesalahan jika gagal.
     """
     url = "https://api.hyperliquid.xyz/info"
     payload = {
         "type": "metaAndAssetCtxs"
     }
-    headers = {
-        'User-Agent': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-        'Accept-Encoding': "gzip, deflate, br, zstd",
-        'Content-Type': "application/json",
-        'sec-ch-ua-platform': "\"Linux\"",
-        'sec-ch-ua': "\"Chromium\";v=\"134\", \"Not:A-Brand\";v=\"24\", \"Brave\";v=\"134\"",
-        'sec-ch-ua-mobile': "?0",
-        'Sec-GPC': "1",
-        'Accept-Language': "en-US,en;q=0.9",
-        'Origin': "https://hyperdash.info",
-        'Sec-Fetch-Site': "cross-site",
-        'Sec-Fetch-Mode': "cors",
-        'Sec-Fetch-Dest': "empty",
-        'Referer': "https://hyperdash.info/"
-    }
 
     try:
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = api_client.post(url, data=json.dumps(payload))
         response.raise_for_status()
-        data = response.json()
+        return response.json()
 
-        for asset in data[1]:  # Data mark price ada di indeks 1
-            if 'markPx' in asset:
-                if asset.get('name') == symbol:
-                    return asset['markPx']
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return f"Error occurred while fetching mark price: {e}"
 
-        return f"Symbol {symbol} not found in the response."
+# Cache bersama untuk mark price; semua notifikasi posisi ditutup membaca dari sini
+mark_price_cache = MarkPriceCache(get_meta_and_asset_ctxs)
 
-    except requests.exceptions.RequestException as e:
-        return f"Error occurred while fetching mark price: {e}"
+def get_markprice(symbol):
+    """
+    Mendapatkan harga mark (mark price) dari cache snapshot metaAndAssetCtxs.
+    
+    :param symbol: Simbol trading (misalnya, BTC, ETH).
+    :return: Harga mark atau pesan kesalahan jika gagal.
+    """
+    return mark_price_cache.get(symbol)
 
 def get_position(user_address):
     """
@@ -55,24 +46,8 @@ def get_position(user_address):
         "type": "clearinghouseState",
         "user": user_address
     }
-    headers = {
-        'User-Agent': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-        'Accept-Encoding': "gzip, deflate, br, zstd",
-        'Content-Type': "application/json",
-        'sec-ch-ua-platform': "\"Linux\"",
-        'sec-ch-ua': "\"Chromium\";v=\"134\", \"Not:A-Brand\";v=\"24\", \"Brave\";v=\"134\"",
-        'sec-ch-ua-mobile': "?0",
-        'Sec-GPC': "1",
-        'Accept-Language': "en-US,en;q=0.9",
-        'Origin': "https://hyperdash.info",
-        'Sec-Fetch-Site': "cross-site",
-        'Sec-Fetch-Mode': "cors",
-        'Sec-Fetch-Dest': "empty",
-        'Referer': "https://hyperdash.info/"
-    }
-
     try:
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = api_client.post(url, data=json.dumps(payload))
         response.raise_for_status()
         data = response.json()
 
@@ -112,25 +87,9 @@ def get_leaderboard_base_info(user_address):
         "type": "clearinghouseState",
         "user": user_address
     }
-    headers = {
-        'User-Agent': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-        'Accept-Encoding': "gzip, deflate, br, zstd",
-        'Content-Type': "application/json",
-        'sec-ch-ua-platform': "\"Linux\"",
-        'sec-ch-ua': "\"Chromium\";v=\"134\", \"Not:A-Brand\";v=\"24\", \"Brave\";v=\"134\"",
-        'sec-ch-ua-mobile': "?0",
-        'Sec-GPC': "1",
-        'Accept-Language': "en-US,en;q=0.9",
-        'Origin': "https://hyperdash.info",
-        'Sec-Fetch-Site': "cross-site",
-        'Sec-Fetch-Mode': "cors",
-        'Sec-Fetch-Dest': "empty",
-        'Referer': "https://hyperdash.info/"
-    }
-
     try:
         logging.info(f"Fetching leaderboard data for {user_address}")
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = api_client.post(url, data=json.dumps(payload))
         response.raise_for_status()
         data = response.json()
         logging.debug(f"Raw API response for {user_address}: {data}")
@@ -6,8 +6,9 @@ import logging
 import sys
 from misc import get_header, get_json
 from datetime import timedelta
-from message import telegram_send_message
-from hyperliquid import get_position, get_leaderboard_base_info, get_markprice
+from message import dispatcher, config
+from hyperliquid import get_position, get_leaderboard_base_info, get_markprice, mark_price_cache
+from poller import poll_addresses, DEFAULT_CONCURRENCY
 
 # Konfigurasi logging
 logging.basicConfig(
@@ -35,6 +36,22 @@ TARGETED_USER_ADDRESSES = load_user_addresses()
 
 ACCOUNT_INFO_URL_TEMPLATE = 'https://hyperdash.info/trader/{}'
 
+# Jumlah request clearinghouseState yang berjalan bersamaan per siklus
+POLL_CONCURRENCY = config.getint('monitor', 'concurrency', fallback=DEFAULT_CONCURRENCY)
+
+# Cache mark price bersama untuk notifikasi posisi ditutup, diperbarui di background
+mark_price_cache.ttl = config.getfloat('markprice', 'ttl', fallback=mark_price_cache.ttl)
+mark_price_cache.max_staleness = config.getfloat('markprice', 'max_staleness', fallback=mark_price_cache.max_staleness)
+mark_price_cache.start()
+
+# Notifikasi dikirim lewat antrian dengan batas laju Telegram, bukan di dalam loop pemantauan
+dispatcher.configure(
+    global_rate=config.getfloat('telegram', 'global_rate', fallback=None),
+    chat_rate=config.getfloat('telegram', 'chat_rate', fallback=None),
+    group_rate=config.getfloat('telegram', 'group_rate', fallback=None),
+)
+dispatcher.start()
+
 # Fungsi untuk memotong alamat pengguna
 def shorten_address(user_address):
     """
@@ -124,7 +141,7 @@ def send_new_position_message(symbol, row, user_address):
         f"<b>Last Update:</b>\n{updatetime} (UTC+7)\n"
         f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
     )
-    telegram_send_message(message)
+    dispatcher.enqueue(message)
 
 # Function to send closed position message
 def send_closed_position_message(symbol, row, user_address):
@@ -148,7 +165,7 @@ def send_closed_position_message(symbol, row, user_address):
         f"<b>Last Update:</b>\n{updatetime} (UTC+7)\n"
         f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
     )
-    telegram_send_message(message)
+    dispatcher.enqueue(message)
 
 # Function to send current positions
 def send_current_positions(position_result, user_address):
@@ -161,72 +178,80 @@ def send_current_positions(position_result, user_address):
     """
     short_address = shorten_address(user_address)  # Potong alamat
     if position_result.empty:
-        telegram_send_message(f"⚠️ [<b>{short_address}</b>]\n💎 <b>No positions found</b>")
-    else:
-        telegram_send_message(f"⚠️ [<b>{short_address}</b>]\n💎 <b>Current positions:</b>")
-        for symbol, row in position_result.iterrows():
-            estimated_position = row['estimatedPosition']
-            leverage = row['leverage']
-            estimated_entry_size = row['estimatedEntrySize']
-            entry_price = row['entry_price']
-            pnl = row['unrealized_pnl']
-            updatetime = row['updateTime']
-            pnl_emoji = "🟢" if pnl >= 0 else "🔴"  # Emoji untuk PnL positif/negatif
-            message = (
-                f"<b>Position:</b> {symbol} {estimated_position} {leverage}X\n\n"
-                f"Base currency - USDT\n"
-                f"------------------------------\n"
-                f"🎯 <b>Entry Price:</b> {entry_price}\n"
-                f"💰 <b>Est. Entry Size:</b> {estimated_entry_size}\n"
-                f"{pnl_emoji} <b>PnL:</b> {pnl}\n\n"
-                f"<b>Last Update:</b>\n{updatetime} (UTC+7)\n"
-                f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
-            )
-            telegram_send_message(message)
+        dispatcher.enqueue(f"⚠️ [<b>{short_address}</b>]\n💎 <b>No positions found</b>")
+        return
 
-while True:
-    try:
-        start_time = time.time()  # Catat waktu mulai iterasi
-        
-        for user_address in TARGETED_USER_ADDRESSES:
-            ACCOUNT_INFO_URL = ACCOUNT_INFO_URL_TEMPLATE.format(user_address)
-            leaderboard_info = get_leaderboard_base_info(user_address)
+    # Semua posisi dikirim dalam satu pesan; dispatcher memecahnya jika melebihi batas panjang Telegram
+    message = f"⚠️ [<b>{short_address}</b>]\n💎 <b>Current positions:</b>\n\n"
+    for symbol, row in position_result.iterrows():
+        pnl = row['unrealized_pnl']
+        pnl_emoji = "🟢" if pnl >= 0 else "🔴"  # Emoji untuk PnL positif/negatif
+        message += (
+            f"<b>{symbol}</b> {row['estimatedPosition']} {row['leverage']}X\n"
+            f"🎯 Entry: {row['entry_price']} | 💰 Size: {row['estimatedEntrySize']}\n"
+            f"{pnl_emoji} PnL: {pnl}\n"
+            f"<b>Last Update:</b> {row['updateTime']} (UTC+7)\n\n"
+        )
+    message += f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
+    dispatcher.enqueue(message)
+
+# Function to process one address
+def process_address(user_address, leaderboard_info):
+    """
+    Membandingkan posisi terbaru dengan siklus sebelumnya dan mengirim notifikasi.
+    
+    Parameters:
+        user_address (str): Alamat pengguna.
+        leaderboard_info (dict | str): Hasil get_leaderboard_base_info atau pesan error.
+    """
+    if isinstance(leaderboard_info, str):  # Jika terjadi error
+        logging.error(f"Error untuk alamat {user_address}: {leaderboard_info}")
+        dispatcher.enqueue(f"Error untuk alamat {user_address}: {leaderboard_info}")
+        return
 
-            if isinstance(leaderboard_info, str):  # Jika terjadi error
-                logging.error(f"Error untuk alamat {user_address}: {leaderboard_info}")
-                telegram_send_message(f"Error untuk alamat {user_address}: {leaderboard_info}")
-                continue
+    position_result = modify_data(leaderboard_info)
 
-            position_result = modify_data(leaderboard_info)
+    new_symbols = position_result.index.difference(previous_symbols.get(user_address, pd.Index([])))
+    if not is_first_runs[user_address] and not new_symbols.empty:
+        for symbol in new_symbols:
+            send_new_position_message(symbol, position_result.loc[symbol], user_address)
 
-            new_symbols = position_result.index.difference(previous_symbols.get(user_address, pd.Index([])))
-            if not is_first_runs[user_address] and not new_symbols.empty:
-                for symbol in new_symbols:
-                    send_new_position_message(symbol, position_result.loc[symbol], user_address)
+    closed_symbols = previous_symbols.get(user_address, pd.Index([])).difference(position_result.index)
+    if not is_first_runs[user_address] and not closed_symbols.empty:
+        for symbol in closed_symbols:
+            if symbol in previous_position_results.get(user_address, pd.DataFrame()).index:
+                send_closed_position_message(symbol, previous_position_results[user_address].loc[symbol], user_address)
 
-            closed_symbols = previous_symbols.get(user_address, pd.Index([])).difference(position_result.index)
-            if not is_first_runs[user_address] and not closed_symbols.empty:
-                for symbol in closed_symbols:
-                    if symbol in previous_position_results.get(user_address, pd.DataFrame()).index:
-                        send_closed_position_message(symbol, previous_position_results[user_address].loc[symbol], user_address)
+    if is_first_runs[user_address]:
+        send_current_positions(position_result, user_address)
 
-            if is_first_runs[user_address]:
-                send_current_positions(position_result, user_address)
+    previous_position_results[user_address] = position_result.copy()
+    previous_symbols[user_address] = position_result.index.copy()
+    is_first_runs[user_address] = False
 
-            previous_position_results[user_address] = position_result.copy()
-            previous_symbols[user_address] = position_result.index.copy()
-            is_first_runs[user_address] = False
+while True:
+    try:
+        start_time = time.time()  # Catat waktu mulai iterasi
+        
+        # Ambil data semua alamat secara concurrent, lalu proses berurutan
+        results, fetch_time = poll_addresses(TARGETED_USER_ADDRESSES, get_leaderboard_base_info, POLL_CONCURRENCY)
+        for user_address, leaderboard_info in results.items():
+            process_address(user_address, leaderboard_info)
 
         # Hitung waktu eksekusi dan log
         ping_time = (time.time() - start_time) * 1000  # Konversi ke milidetik
         current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        logging.info(f"✅ Bot is still running | Time: {current_time} | Ping: {ping_time:.2f}ms")
+        logging.info(
+            f"✅ Bot is still running | Time: {current_time} | Ping: {ping_time:.2f}ms "
+            f"| Fetch: {fetch_time * 1000:.2f}ms | Addresses: {len(results)} "
+            f"| Telegram queue: {dispatcher.queue_depth()}"
+        )
         
         time.sleep(60)  # Tunggu 60 detik sebelum iterasi berikutnya
         
     except Exception as e:
         logging.error(f"Error occurred: {e}")
-        message = f"Error occurred for address <b>{user_address}</b>:\n{e}\n\n" \
+        message = f"Error occurred:\n{e}\n\n" \
                   f"Retrying after 60s"
-        telegram_send_message(message)
+        dispatcher.enqueue(message)
         time.sleep(60)
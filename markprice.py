@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+
+# Umur maksimum snapshot sebelum dianggap kedaluwarsa (detik)
+DEFAULT_TTL = 15.0
+# Batas umur snapshot yang masih boleh dipakai selama refresh di background berjalan (detik)
+DEFAULT_MAX_STALENESS = 120.0
+
+class MarkPriceCache:
+    """
+    Cache snapshot `metaAndAssetCtxs` dengan index simbol -> mark price dan simbol -> asset context.
+
+    Seluruh universe diunduh sekali per refresh, lalu setiap lookup dilayani
+    dari dict dalam O(1). Snapshot dianggap segar selama umurnya <= `ttl`.
+    Jika thread refresh background aktif, snapshot yang lebih tua tetap dipakai
+    sampai `max_staleness` sebelum lookup memaksa refresh sinkron.
+    """
+
+    def __init__(self, fetch, ttl: float = DEFAULT_TTL, max_staleness: float = DEFAULT_MAX_STALENESS):
+        """
+        :param fetch: Fungsi tanpa argumen yang mengembalikan respons `metaAndAssetCtxs` atau pesan error (str).
+        :param ttl: Umur maksimum snapshot yang dianggap segar (detik).
+        :param max_staleness: Umur maksimum snapshot yang masih dilayani saat refresh background aktif (detik).
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.hits = 0
+        self.misses = 0
+        self._prices = {}
+        self._contexts = {}
+        self._updated_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def refresh(self) -> bool:
+        """
+        Mengunduh ulang universe dan membangun ulang index.
+
+        :return: True jika berhasil, False jika gagal (snapshot lama tetap dipakai).
+        """
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        # Dipanggil dengan _refresh_lock dipegang
+        data = self.fetch()
+        if isinstance(data, str):
+            logging.error(f"Gagal memperbarui cache mark price: {data}")
+            return False
+
+        try:
+            universe = data[0].get("universe", [])
+            asset_ctxs = data[1]
+        except (IndexError, KeyError, TypeError, AttributeError) as e:
+            logging.error(f"Format respons metaAndAssetCtxs tidak valid: {e}")
+            return False
+
+        prices = {}
+        contexts = {}
+        for i, ctx in enumerate(asset_ctxs):
+            # Nama aset ada di meta.universe dengan indeks yang sama dengan asset context
+            name = ctx.get("name") or (universe[i].get("name") if i < len(universe) else None)
+            if not name:
+                continue
+            contexts[name] = ctx
+            if "markPx" in ctx:
+                prices[name] = ctx["markPx"]
+
+        # Tukar referensi dict sekaligus agar pembaca tidak melihat index setengah jadi
+        self._prices = prices
+        self._contexts = contexts
+        self._updated_at = time.monotonic()
+        logging.debug(f"Cache mark price diperbarui: {len(prices)} simbol")
+        return True
+
+    def age(self) -> float:
+        """
+        :return: Umur snapshot saat ini dalam detik (inf jika belum pernah diisi).
+        """
+        if not self._updated_at:
+            return float("inf")
+        return time.monotonic() - self._updated_at
+
+    def _ensure_fresh(self) -> None:
+        limit = self.max_staleness if self.is_running() else self.ttl
+        if self.age() > limit:
+            with self._refresh_lock:
+                # Umur diperiksa ulang: thread yang menunggu lock memakai snapshot yang baru saja diunduh thread lain
+                if self.age() > limit:
+                    self.misses += 1
+                    self._refresh()
+                    return
+        self.hits += 1
+
+    def get(self, symbol: str) -> str:
+        """
+        Mendapatkan mark price untuk simbol dari snapshot.
+
+        :param symbol: Simbol trading (misalnya, BTC, ETH).
+        :return: Harga mark atau pesan kesalahan jika tidak tersedia.
+        """
+        self._ensure_fresh()
+        price = self._prices.get(symbol)
+        if price is None:
+            if not self._updated_at:
+                return "Error occurred while fetching mark price: cache is empty"
+            return f"Symbol {symbol} not found in the response."
+        return price
+
+    def get_asset_ctx(self, symbol: str) -> dict | None:
+        """
+        Mendapatkan asset context lengkap (funding, openInterest, markPx, dll.) untuk simbol.
+
+        :param symbol: Simbol trading.
+        :return: Dict asset context atau None jika tidak ada.
+        """
+        self._ensure_fresh()
+        return self._contexts.get(symbol)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict berisi hits, misses, hit_rate, jumlah simbol, dan umur snapshot.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "symbols": len(self._prices),
+            "age": self.age(),
+        }
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Menjalankan thread daemon yang memperbarui snapshot setiap `ttl` detik.
+        """
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="markprice-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.error(f"Error di thread refresh mark price: {e}")
+            self._stop_event.wait(self.ttl)
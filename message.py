@@ -1,5 +1,6 @@
-import requests
 import configparser
+from http_client import telegram_client
+from dispatcher import TelegramDispatcher
 
 # Membaca konfigurasi dari file config.ini
 config = configparser.ConfigParser()
@@ -11,20 +12,39 @@ try:
 except KeyError:
     raise Exception("Pastikan file config.ini sudah diisi dengan token bot dan chat ID Telegram.")
 
-def telegram_send_message(message):
+def telegram_api_send(message, chat_id=None):
     """
-    Mengirim pesan ke Telegram.
+    Mengirim satu pesan ke Telegram dan melaporkan batas laju.
     
     :param message: Pesan yang akan dikirim.
+    :param chat_id: ID chat tujuan (default dari config).
+    :return: Tuple (berhasil, retry_after); retry_after berisi detik tunggu jika Telegram membalas 429.
     """
     api_url = f"https://api.telegram.org/bot{telegram_bot_token}/sendMessage"
     try:
-        response = requests.post(api_url, json={
-            'chat_id': telegram_chat_id,
+        response = telegram_client.post(api_url, json={
+            'chat_id': chat_id or telegram_chat_id,
             'text': message,
             'parse_mode': 'html',
             'disable_web_page_preview': True
-        })
-        print(response.text)
+        }, timeout=10)
+        if response.status_code == 429:
+            try:
+                return False, float(response.json().get('parameters', {}).get('retry_after', 1))
+            except ValueError:
+                return False, 1.0
+        return response.ok, None
     except Exception as e:
         print(f"Error sending message to Telegram: {e}")
+        return False, None
+
+def telegram_send_message(message):
+    """
+    Mengirim pesan ke Telegram.
+    
+    :param message: Pesan yang akan dikirim.
+    """
+    telegram_api_send(message)
+
+# Antrian pengiriman non-blocking untuk notifikasi dari loop pemantauan
+dispatcher = TelegramDispatcher(telegram_api_send, telegram_chat_id)
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Jumlah request clearinghouseState yang boleh berjalan bersamaan
+DEFAULT_CONCURRENCY = 16
+
+async def _fetch_all(addresses: list, fetch, concurrency: int) -> dict:
+    """
+    Mengambil data untuk semua alamat secara bersamaan dengan batas concurrency.
+
+    :param addresses: Daftar alamat pengguna.
+    :param fetch: Fungsi pengambil data (sync atau async) yang menerima satu alamat.
+    :param concurrency: Jumlah maksimum request yang berjalan bersamaan.
+    :return: Dict alamat -> hasil fetch (urutan sama dengan `addresses`).
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    is_async = asyncio.iscoroutinefunction(fetch)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="poller") as executor:
+        async def fetch_one(user_address):
+            async with semaphore:
+                try:
+                    if is_async:
+                        return user_address, await fetch(user_address)
+                    return user_address, await loop.run_in_executor(executor, fetch, user_address)
+                except Exception as e:
+                    logging.error(f"Error saat polling {user_address}: {e}")
+                    return user_address, f"Error occurred while fetching leaderboard info: {e}"
+
+        results = await asyncio.gather(*(fetch_one(address) for address in addresses))
+
+    return dict(results)
+
+def poll_addresses(addresses: list, fetch, concurrency: int = DEFAULT_CONCURRENCY) -> tuple:
+    """
+    Menjalankan satu siklus polling untuk semua alamat secara concurrent.
+
+    Latensi siklus bergantung pada `concurrency`, bukan jumlah alamat:
+    kira-kira ceil(len(addresses) / concurrency) x round-trip time.
+
+    :param addresses: Daftar alamat pengguna.
+    :param fetch: Fungsi pengambil data, misalnya get_leaderboard_base_info.
+    :param concurrency: Jumlah maksimum request yang berjalan bersamaan.
+    :return: Tuple (dict alamat -> hasil fetch, waktu siklus dalam detik).
+    """
+    concurrency = max(1, int(concurrency))
+    start_time = time.perf_counter()
+    results = asyncio.run(_fetch_all(list(addresses), fetch, concurrency)) if addresses else {}
+    elapsed = time.perf_counter() - start_time
+    logging.info(f"Polling {len(results)} alamat selesai dalam {elapsed * 1000:.2f}ms (concurrency={concurrency})")
+    return results, elapsed
@@ -0,0 +1,76 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: `rate` token per detik dengan kapasitas burst `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        :param rate: Jumlah token yang diisi ulang per detik.
+        :param capacity: Jumlah token maksimum (default sama dengan `rate`, minimal 1).
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Mencoba mengambil token tanpa menunggu.
+
+        :param tokens: Jumlah token yang dibutuhkan.
+        :return: 0.0 jika berhasil, selain itu perkiraan waktu tunggu (detik) sampai token cukup.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        :return: Waktu tunggu (detik) sampai `tokens` tersedia, tanpa mengambil token.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, tokens: float = 1.0, timeout: float = None) -> bool:
+        """
+        Mengambil token, menunggu jika perlu.
+
+        :param tokens: Jumlah token yang dibutuhkan.
+        :param timeout: Batas waktu tunggu dalam detik (None = tanpa batas).
+        :return: True jika token didapat, False jika timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def available(self) -> float:
+        """
+        :return: Jumlah token yang tersedia saat ini.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
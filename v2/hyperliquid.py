@@ -1,7 +1,9 @@
 import requests
 import json
 import logging
-from misc import get_header, get_json
+from misc import get_json
+from http_client import api_client
+from markprice import MarkPriceCache
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO)
@@ -15,33 +17,39 @@ def _safe_float(value, default=0.0) -> float:
     except (ValueError, TypeError):
         return default
 
-def get_markprice(symbol: str) -> str:
+def get_meta_and_asset_ctxs() -> list | str:
     """
-    Mendapatkan harga mark (mark price) dari Hyperliquid API.
+    Mengunduh seluruh universe `metaAndAssetCtxs` dari Hyperliquid API.
     
-    :param symbol: Simbol trading (misalnya, BTC, ETH).
-    :return: Harga mark atau pesan kesalahan jika gagal.
+    :return: List [meta, assetCtxs] atau pesan kesalahan jika gagal.
     """
     payload = {"type": "metaAndAssetCtxs"}  # Tidak perlu get_json karena tidak ada user_address
     
     try:
-        logging.debug(f"Fetching mark price for {symbol}")
-        response = requests.post(API_URL, data=json.dumps(payload), headers=get_header(), timeout=10)
+        logging.debug("Fetching metaAndAssetCtxs")
+        response = api_client.post(API_URL, data=json.dumps(payload))
         response.raise_for_status()
-        data = response.json()
-
-        for asset in data[1]:  # Data mark price ada di indeks 1
-            if asset.get('name') == symbol and 'markPx' in asset:
-                logging.debug(f"Mark price for {symbol}: {asset['markPx']}")
-                return asset['markPx']
-        
-        logging.warning(f"Symbol {symbol} not found in response")
-        return f"Symbol {symbol} not found in the response."
+        return response.json()
 
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching mark price for {symbol}: {e}")
+        logging.error(f"Error fetching metaAndAssetCtxs: {e}")
+        return f"Error occurred while fetching mark price: {e}"
+    except ValueError as e:
+        logging.error(f"Invalid metaAndAssetCtxs response: {e}")
         return f"Error occurred while fetching mark price: {e}"
 
+# Cache bersama untuk mark price; semua notifikasi posisi ditutup membaca dari sini
+mark_price_cache = MarkPriceCache(get_meta_and_asset_ctxs)
+
+def get_markprice(symbol: str) -> str:
+    """
+    Mendapatkan harga mark (mark price) dari cache snapshot metaAndAssetCtxs.
+    
+    :param symbol: Simbol trading (misalnya, BTC, ETH).
+    :return: Harga mark atau pesan kesalahan jika gagal.
+    """
+    return mark_price_cache.get(symbol)
+
 def get_position(user_address: str) -> list | str:
     """
     Mendapatkan posisi trading dari Hyperliquid API.
@@ -53,7 +61,7 @@ def get_position(user_address: str) -> list | str:
     
     try:
         logging.debug(f"Fetching positions for {user_address}")
-        response = requests.post(API_URL, data=json.dumps(payload), headers=get_header(), timeout=10)
+        response = api_client.post(API_URL, data=json.dumps(payload))
         response.raise_for_status()
         data = response.json()
 
@@ -96,7 +104,7 @@ def get_leaderboard_base_info(user_address: str) -> dict | str:
     
     try:
         logging.info(f"Fetching leaderboard data for {user_address}")
-        response = requests.post(API_URL, data=json.dumps(payload), headers=get_header(), timeout=10)
+        response = api_client.post(API_URL, data=json.dumps(payload))
         response.raise_for_status()
         data = response.json()
         logging.debug(f"Raw API response for {user_address}: {data}")
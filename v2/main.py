@@ -6,8 +6,8 @@ import logging
 import sys
 from misc import get_header, get_json
 from datetime import timedelta
-from message import telegram_send_message
-from hyperliquid import get_position, get_leaderboard_base_info, get_markprice
+from message import telegram_send_message, config
+from hyperliquid import get_position, get_leaderboard_base_info, get_markprice, mark_price_cache
 
 # Konfigurasi logging
 logging.basicConfig(
@@ -35,6 +35,11 @@ TARGETED_USER_ADDRESSES = load_user_addresses()
 
 ACCOUNT_INFO_URL_TEMPLATE = 'https://hyperdash.info/trader/{}'
 
+# Cache mark price bersama untuk notifikasi posisi ditutup, diperbarui di background
+mark_price_cache.ttl = config.getfloat('markprice', 'ttl', fallback=mark_price_cache.ttl)
+mark_price_cache.max_staleness = config.getfloat('markprice', 'max_staleness', fallback=mark_price_cache.max_staleness)
+mark_price_cache.start()
+
 # Fungsi untuk memotong alamat pengguna
 def shorten_address(user_address):
     """
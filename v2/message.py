@@ -1,6 +1,7 @@
 import requests
 import configparser
 import logging
+from http_client import telegram_client
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -43,7 +44,7 @@ def telegram_send_message(message: str, chat_id: str = telegram_chat_id) -> bool
     
     try:
         logging.debug(f"Mengirim pesan ke chat {chat_id}: {message[:50]}...")
-        response = requests.post(api_url, json=payload, timeout=10)
+        response = telegram_client.post(api_url, json=payload, timeout=10)
         response.raise_for_status()
         logging.info(f"Pesan berhasil dikirim ke chat {chat_id}.")
         return True
@@ -0,0 +1,638 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from hypertracker.positions import modify_data, diff_positions, Position
+
+COINS = ["BTC", "ETH", "SOL", "HYPE", "ARB", "OP", "DOGE", "AVAX", "LINK", "SUI",
+         "APT", "TIA", "SEI", "INJ", "WIF", "PEPE", "BNB", "XRP", "LTC", "NEAR"]
+
+def make_leaderboard_info(user_address: str, n_positions: int, seed: int = 0) -> dict:
+    """
+    Membuat data sintetis dengan format hasil get_leaderboard_base_info.
+
+    :param user_address: Alamat pengguna.
+    :param n_positions: Jumlah posisi.
+    :param seed: Seed acak agar hasil bisa diulang.
+    :return: Dict informasi trader.
+    """
+    rng = random.Random(seed)
+    positions = []
+    for i in range(n_positions):
+        coin = COINS[i] if i < len(COINS) else f"COIN{i}"
+        size = rng.uniform(-100, 100) or 1.0
+        entry_price = rng.uniform(1, 50000)
+        positions.append({
+            "coin": coin,
+            "size": size,
+            "entry_price": entry_price,
+            "position_value": abs(size) * entry_price,
+            "unrealized_pnl": rng.uniform(-1000, 1000),
+            "leverage": float(rng.randint(1, 50)),
+            "margin_used": rng.uniform(0, 10000),
+            "liquidation_price": rng.uniform(1, 50000),
+            "max_leverage": 50.0,
+            "cum_funding": {},
+        })
+    return {"user_address": user_address, "positions": positions}
+
+def _legacy_modify_and_diff(previous: dict, data: dict) -> tuple:
+    """
+    Implementasi lama berbasis pandas (modify_data + pd.Index.difference), hanya untuk pembanding.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(data['positions'])
+    df.set_index('coin', inplace=True)
+    df['estimatedEntrySize'] = df.apply(
+        lambda row: round((abs(row['size']) / row['leverage']) * row['entry_price'], 2)
+        if row['leverage'] != 0 else 0, axis=1
+    )
+    df['estimatedPosition'] = df['size'].apply(lambda x: 'LONG' if x > 0 else 'SHORT')
+    df['updateTime'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    result = df[['estimatedPosition', 'leverage', 'estimatedEntrySize',
+                 'entry_price', 'position_value', 'unrealized_pnl', 'updateTime']]
+    previous_index = previous.get('index', pd.Index([]))
+    new_symbols = result.index.difference(previous_index)
+    closed_symbols = previous_index.difference(result.index)
+    previous['index'] = result.index.copy()
+    previous['frame'] = result.copy()
+    return new_symbols, closed_symbols
+
+def _legacy_safe_float(value, default=0.0) -> float:
+    try:
+        return float(value or default) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+def _legacy_parse_clearinghouse_state(user_address: str, data: dict) -> dict:
+    """
+    Implementasi lama (rantai _safe_float/.get untuk semua field), hanya untuk pembanding.
+    """
+    margin_summary = data.get("marginSummary", {})
+    leaderboard_info = {
+        "user_address": user_address,
+        "profile_url": f"https://hyperdash.info/trader/{user_address}",
+        "account_value": _legacy_safe_float(margin_summary.get("accountValue")),
+        "total_notional_position": _legacy_safe_float(margin_summary.get("totalNtlPos")),
+        "total_raw_usd": _legacy_safe_float(margin_summary.get("totalRawUsd")),
+        "total_margin_used": _legacy_safe_float(margin_summary.get("totalMarginUsed")),
+        "withdrawable": _legacy_safe_float(data.get("withdrawable")),
+        "positions": []
+    }
+    for position in data.get("assetPositions", []):
+        pos_info = position.get("position", {})
+        leaderboard_info["positions"].append({
+            "coin": pos_info.get("coin", ""),
+            "size": _legacy_safe_float(pos_info.get("szi")),
+            "entry_price": _legacy_safe_float(pos_info.get("entryPx")),
+            "position_value": _legacy_safe_float(pos_info.get("positionValue")),
+            "unrealized_pnl": _legacy_safe_float(pos_info.get("unrealizedPnl")),
+            "leverage": _legacy_safe_float(pos_info.get("leverage", {}).get("value")),
+            "margin_used": _legacy_safe_float(pos_info.get("marginUsed")),
+            "liquidation_price": _legacy_safe_float(pos_info.get("liquidationPx")),
+            "max_leverage": _legacy_safe_float(pos_info.get("maxLeverage")),
+            "cum_funding": pos_info.get("cumFunding", {})
+        })
+    return leaderboard_info
+
+def _measure(func, iterations: int, repeat: int = 1) -> float:
+    """
+    :return: Median waktu per panggilan (detik) dari `repeat` putaran masing-masing `iterations` panggilan.
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start_time) / iterations)
+    return statistics.median(timings)
+
+def bench_diff(n_positions: int = 5, iterations: int = 2000) -> dict:
+    """
+    Mengukur biaya pemrosesan per alamat (modify_data + diff) sebelum dan sesudah penggantian pandas.
+
+    :param n_positions: Jumlah posisi per alamat.
+    :param iterations: Jumlah pengulangan.
+    :return: Dict berisi waktu per alamat dalam mikrodetik.
+    """
+    snapshots = [make_leaderboard_info("0xbench", n_positions, seed) for seed in range(2)]
+    results = {}
+
+    state = {'previous': {}, 'i': 0}
+
+    def run_new():
+        data = snapshots[state['i'] % 2]
+        state['i'] += 1
+        positions = modify_data(data)
+        diff_positions(state['previous'], positions)
+        state['previous'] = positions
+
+    results['positions_us'] = _measure(run_new, iterations) * 1e6
+
+    try:
+        legacy_state = {}
+        counter = {'i': 0}
+
+        def run_legacy():
+            data = snapshots[counter['i'] % 2]
+            counter['i'] += 1
+            _legacy_modify_and_diff(legacy_state, data)
+
+        results['pandas_us'] = _measure(run_legacy, max(1, iterations // 10)) * 1e6
+    except ImportError:
+        results['pandas_us'] = None
+    return results
+
+def bench_table(address_counts=(10, 100, 1000, 10000), n_positions: int = 5) -> dict:
+    """
+    Mengukur biaya per posisi untuk membangun PositionTable dan diff massal satu siklus.
+
+    :param address_counts: Variasi jumlah alamat.
+    :param n_positions: Jumlah posisi per alamat.
+    :return: Dict jumlah alamat -> waktu per posisi dalam mikrodetik.
+    """
+    from hypertracker.position_table import PositionTable
+
+    results = {}
+    for count in address_counts:
+        cycles = [
+            {f"0x{i:040x}": make_leaderboard_info(f"0x{i:040x}", n_positions, seed * count + i) for i in range(count)}
+            for seed in range(2)
+        ]
+        previous = PositionTable.from_snapshots(cycles[0])
+        previous.to_positions()
+        iterations = max(1, 20000 // (count * n_positions))
+        start_time = time.perf_counter()
+        for i in range(iterations):
+            table = PositionTable.from_snapshots(cycles[(i + 1) % 2], previous)
+            table.events(previous)
+            previous = table
+        elapsed = (time.perf_counter() - start_time) / iterations
+        results[count] = elapsed / (count * n_positions) * 1e6
+    return results
+
+def bench_state_memory(n_addresses: int = 100000, n_positions: int = 5) -> dict:
+    """
+    Membandingkan memori state posisi per alamat: dict Position biasa vs PositionStateStore.
+
+    :param n_addresses: Jumlah alamat yang dipantau.
+    :param n_positions: Jumlah posisi per alamat.
+    :return: Dict byte per alamat dan waktu set/get per alamat (mikrodetik).
+    """
+    import tracemalloc
+    from hypertracker.position_store import PositionStateStore
+
+    # String alamat dimiliki registry, jadi dibuat sebelum pengukuran
+    addresses = [f"0x{i:040x}" for i in range(n_addresses)]
+    snapshots = [modify_data(make_leaderboard_info(addresses[i], n_positions, i)) for i in range(min(n_addresses, 500))]
+
+    tracemalloc.start()
+    states = {}
+    for i, address in enumerate(addresses):
+        states[address] = {coin: Position.from_tuple(p.to_tuple()) for coin, p in snapshots[i % len(snapshots)].items()}
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del states
+
+    store = PositionStateStore()
+    start_time = time.perf_counter()
+    for i, address in enumerate(addresses):
+        store[address] = snapshots[i % len(snapshots)]
+    set_time = (time.perf_counter() - start_time) / n_addresses
+    sample = addresses[:min(n_addresses, 10000)]
+    start_time = time.perf_counter()
+    for address in sample:
+        store.get(address)
+    get_time = (time.perf_counter() - start_time) / len(sample)
+
+    return {
+        "state_dict_bytes_per_address": dict_bytes / n_addresses,
+        "state_store_bytes_per_address": store.stats()["bytes_per_address"],
+        "state_store_total_mb": store.stats()["bytes"] / 1e6,
+        "state_set_us": set_time * 1e6,
+        "state_get_us": get_time * 1e6,
+    }
+
+def bench_exposure(n_addresses: int = 10000, n_positions: int = 5, cycles: int = 5, change_ratio: float = 0.1) -> dict:
+    """
+    Mengukur pembaruan inkremental ExposureTracker dan memeriksanya terhadap hitung ulang penuh.
+
+    Setiap siklus sebagian alamat membuka, menutup, atau mengubah posisi; setelah
+    setiap siklus agregat inkremental harus sama dengan compute_exposure().
+
+    :param n_addresses: Jumlah alamat.
+    :param n_positions: Rata-rata jumlah posisi per alamat.
+    :param cycles: Jumlah siklus perubahan.
+    :param change_ratio: Porsi alamat yang berubah per siklus.
+    :return: Dict waktu update per alamat, hitung ulang penuh, dan query (mikrodetik / milidetik).
+    :raises AssertionError: Jika agregat inkremental berbeda dari hitung ulang.
+    """
+    from hypertracker.exposure import ExposureTracker, compute_exposure
+    from hypertracker.position_store import PositionStateStore
+
+    rng = random.Random(0)
+    addresses = [f"0x{i:040x}" for i in range(n_addresses)]
+    states = PositionStateStore()
+    for i, address in enumerate(addresses):
+        states[address] = modify_data(make_leaderboard_info(address, rng.randint(0, n_positions * 2), i))
+    tracker = ExposureTracker()
+    tracker.rebuild(states)
+
+    update_time = 0.0
+    updates = 0
+    for cycle in range(1, cycles + 1):
+        for address in rng.sample(addresses, max(1, int(n_addresses * change_ratio))):
+            current = modify_data(make_leaderboard_info(address, rng.randint(0, n_positions * 2), cycle * n_addresses + rng.random()))
+            start_time = time.perf_counter()
+            tracker.update(states.get(address), current)
+            update_time += time.perf_counter() - start_time
+            updates += 1
+            states[address] = current
+        mismatched = tracker.verify(states)
+        assert not mismatched, f"agregat eksposur tidak cocok setelah siklus {cycle}: {mismatched}"
+
+    start_time = time.perf_counter()
+    compute_exposure(states)
+    recompute_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    tracker.top_exposure()
+    tracker.crowded()
+    query_time = time.perf_counter() - start_time
+    return {
+        "exposure_update_us": update_time / updates * 1e6,
+        "exposure_recompute_ms": recompute_time * 1000,
+        "exposure_query_ms": query_time * 1000,
+    }
+
+def bench_micro(n_positions: int = 5, iterations: int = 2000, repeat: int = 5) -> dict:
+    """
+    Microbenchmark tiap tahap pipeline per alamat: parsing JSON + clearinghouseState,
+    modify_data, diff, dan render pesan. Input dibuat deterministik dari seed tetap.
+
+    :param n_positions: Jumlah posisi per alamat.
+    :param iterations: Jumlah panggilan per putaran.
+    :param repeat: Jumlah putaran (yang dilaporkan median).
+    :return: Dict nama tahap -> waktu per panggilan dalam mikrodetik.
+    """
+    from hypertracker.alerts import render_new_position_message, render_position_changed_message, render_current_positions
+    from hypertracker.hyperliquid import parse_clearinghouse_state
+    from mock_server import make_clearinghouse_state
+
+    address = "0x" + "ab" * 20
+    bodies = [json.dumps(make_clearinghouse_state(address, n_positions, seed)).encode() for seed in range(2)]
+    infos = [parse_clearinghouse_state(address, json.loads(body)) for body in bodies]
+    positions = [modify_data(info) for info in infos]
+    events = diff_positions(positions[0], positions[1])
+    changed = [e for e in events if e.previous is not None and e.current is not None] or events
+    event = changed[0] if changed else None
+    first = next(iter(positions[1].values()))
+
+    results = {
+        "json_loads_us": _measure(lambda: json.loads(bodies[1]), iterations, repeat),
+        "parse_clearinghouse_us": _measure(lambda: parse_clearinghouse_state(address, json.loads(bodies[1])), iterations, repeat),
+        "modify_data_us": _measure(lambda: modify_data(infos[1]), iterations, repeat),
+        "diff_us": _measure(lambda: diff_positions(positions[0], positions[1]), iterations, repeat),
+        "render_new_us": _measure(lambda: render_new_position_message(first.coin, first, address), iterations, repeat),
+        "render_current_us": _measure(lambda: render_current_positions(positions[1], address), iterations, repeat),
+    }
+    if event is not None and event.previous is not None and event.current is not None:
+        results["render_changed_us"] = _measure(lambda: render_position_changed_message(event, address), iterations, repeat)
+    return {name: value * 1e6 for name, value in results.items()}
+
+def bench_parse(position_counts=(5, 50, 200), iterations: int = 500, repeat: int = 5) -> dict:
+    """
+    Mengukur decode + parsing clearinghouseState: implementasi lama (stdlib json + semua field)
+    dibandingkan codec aktif + skema terkompilasi, pada payload dengan banyak posisi.
+
+    :param position_counts: Variasi jumlah posisi per payload.
+    :param iterations: Jumlah panggilan per putaran.
+    :param repeat: Jumlah putaran (yang dilaporkan median).
+    :return: Dict jumlah posisi -> dict waktu (mikrodetik) per varian.
+    """
+    from hypertracker import codec
+    from hypertracker.hyperliquid import parse_clearinghouse_state
+    from mock_server import make_clearinghouse_state
+
+    address = "0x" + "cd" * 20
+    results = {}
+    for count in position_counts:
+        body = json.dumps(make_clearinghouse_state(address, count)).encode()
+        expected = _legacy_parse_clearinghouse_state(address, json.loads(body))
+        parsed = parse_clearinghouse_state(address, codec.loads(body))
+        for old, new in zip(expected["positions"], parsed["positions"]):
+            if any(old[key] != value for key, value in new.items()):
+                raise RuntimeError(f"Hasil parsing berbeda untuk {old['coin']}")
+        scale = max(1, iterations * 5 // count)
+        results[count] = {
+            "legacy_us": _measure(lambda: _legacy_parse_clearinghouse_state(address, json.loads(body)), scale, repeat) * 1e6,
+            "schema_json_us": _measure(lambda: parse_clearinghouse_state(address, json.loads(body)), scale, repeat) * 1e6,
+            "schema_codec_us": _measure(lambda: parse_clearinghouse_state(address, codec.loads(body)), scale, repeat) * 1e6,
+        }
+    return results
+
+def bench_end_to_end(n_addresses: int = 200, n_positions: int = 5, latency: float = 0.02,
+                     concurrency: int = 16, cycles: int = 3, messages: int = 50) -> dict:
+    """
+    Mengukur siklus polling lengkap dan pengiriman Telegram terhadap server mock lokal.
+
+    :param n_addresses: Jumlah alamat per siklus.
+    :param n_positions: Jumlah posisi per alamat.
+    :param latency: Latensi buatan server per request (detik).
+    :param concurrency: Jumlah request bersamaan.
+    :param cycles: Jumlah siklus (yang dilaporkan median).
+    :param messages: Jumlah pesan Telegram yang dikirim.
+    :return: Dict metrik siklus (ms), throughput, latensi dan byte per request HTTP (di jaringan vs setelah
+             dekode gzip), dan pembagian request single-flight (dijalankan / ikut request berjalan / dari cache)
+             per siklus terukur dan pada poll ulang dengan cache aktif.
+    """
+    import requests
+    from hypertracker import hyperliquid
+    from hypertracker.http_client import HttpClient, api_client
+    from mock_server import MockServer
+    from hypertracker.poller import poll_addresses
+    from hypertracker.position_table import PositionTable
+
+    addresses = [f"0x{i:040x}" for i in range(n_addresses)]
+    flight = hyperliquid.clearinghouse_flight
+
+    def flight_delta(before: dict) -> dict:
+        after = flight.stats()
+        return {kind: after[kind] - before[kind] for kind in ('executed', 'shared', 'cached')}
+
+    def client_delta(before: dict) -> dict:
+        after = api_client.stats()
+        count = after['requests'] - before['requests']
+        return {
+            "latency_ms": (after['avg_latency_ms'] * after['requests'] - before['avg_latency_ms'] * before['requests']) / count,
+            "bytes_wire": (after['bytes_wire'] - before['bytes_wire']) / count,
+            "bytes_decoded": (after['bytes_decoded'] - before['bytes_decoded']) / count,
+        }
+
+    with MockServer(latency=latency, n_positions=n_positions, compress=True) as server:
+        original_url = hyperliquid.API_URL
+        original_bucket = hyperliquid.api_governor.bucket
+        original_freshness = hyperliquid.clearinghouse_flight.freshness
+        hyperliquid.API_URL = f"{server.url}/info"
+        # Server mock tidak punya batas weight; yang diukur adalah laju maksimum klien
+        hyperliquid.api_governor.configure(float('inf'))
+        # Tanpa cache single-flight: setiap siklus benar-benar di-poll dan melihat perubahan server.cycle
+        hyperliquid.clearinghouse_flight.freshness = 0
+        # Log INFO per alamat tidak ikut terukur
+        logging.disable(logging.INFO)
+        try:
+            poll_times, process_times = [], []
+            previous = None
+            for cycle in range(cycles + 1):
+                server.cycle = cycle
+                if cycle == 1:
+                    flight_before = flight.stats()
+                    client_before = api_client.stats()
+                results, fetch_time = poll_addresses(addresses, hyperliquid.get_leaderboard_base_info, concurrency)
+                errors = [r for r in results.values() if isinstance(r, str)]
+                if errors:
+                    raise RuntimeError(f"Server mock mengembalikan error: {errors[0]}")
+                start_time = time.perf_counter()
+                table = PositionTable.from_snapshots(results, previous)
+                if previous is not None:
+                    table.events(previous)
+                process_time = time.perf_counter() - start_time
+                previous = table
+                if cycle:
+                    # Siklus pertama hanya pemanasan koneksi
+                    poll_times.append(fetch_time)
+                    process_times.append(process_time)
+            cycle_flight = flight_delta(flight_before)
+            cycle_client = client_delta(client_before)
+
+            # Poll ulang dengan freshness asli: poll kedua dilayani cache selama hasilnya masih segar
+            flight.freshness = original_freshness
+            poll_addresses(addresses, hyperliquid.get_leaderboard_base_info, concurrency)
+            flight_before = flight.stats()
+            _, cached_poll_time = poll_addresses(addresses, hyperliquid.get_leaderboard_base_info, concurrency)
+            cached_flight = flight_delta(flight_before)
+
+            mark_start = time.perf_counter()
+            hyperliquid.get_meta_and_asset_ctxs()
+            meta_time = time.perf_counter() - mark_start
+
+            # Latensi per request tanpa jeda server: koneksi baru per request (seperti requests.post lama) vs keep-alive
+            server.latency = 0.0
+            body = json.dumps({"type": "clearinghouseState", "user": addresses[0]})
+            new_start = time.perf_counter()
+            for _ in range(messages):
+                requests.post(hyperliquid.API_URL, data=body, headers={"Connection": "close"}).raise_for_status()
+            new_connection_time = (time.perf_counter() - new_start) / messages
+            pooled_start = time.perf_counter()
+            for _ in range(messages):
+                api_client.post(hyperliquid.API_URL, data=body).raise_for_status()
+            keepalive_time = (time.perf_counter() - pooled_start) / messages
+        finally:
+            logging.disable(logging.NOTSET)
+            hyperliquid.API_URL = original_url
+            hyperliquid.api_governor.bucket = original_bucket
+            hyperliquid.clearinghouse_flight.freshness = original_freshness
+
+        client = HttpClient()
+        send_url = f"{server.url}/botTEST/sendMessage"
+        send_start = time.perf_counter()
+        for i in range(messages):
+            client.post(send_url, json={"chat_id": "1", "text": f"bench {i}", "parse_mode": "HTML"}).raise_for_status()
+        send_time = (time.perf_counter() - send_start) / messages
+        client.close()
+
+    poll_time = statistics.median(poll_times)
+    return {
+        "poll_cycle_ms": poll_time * 1000,
+        "process_cycle_ms": statistics.median(process_times) * 1000,
+        "addresses_per_s": n_addresses / poll_time,
+        "flight_executed": cycle_flight['executed'] / cycles,
+        "flight_shared": cycle_flight['shared'] / cycles,
+        "flight_cached": cycle_flight['cached'] / cycles,
+        "cached_poll_ms": cached_poll_time * 1000,
+        "cached_poll_executed": cached_flight['executed'],
+        "cached_poll_cached": cached_flight['cached'],
+        "http_request_ms": cycle_client['latency_ms'],
+        "http_bytes_wire": cycle_client['bytes_wire'],
+        "http_bytes_decoded": cycle_client['bytes_decoded'],
+        "http_new_connection_ms": new_connection_time * 1000,
+        "http_keepalive_ms": keepalive_time * 1000,
+        "meta_and_asset_ctxs_ms": meta_time * 1000,
+        "telegram_send_ms": send_time * 1000,
+    }
+
+STARTUP_DRIVER = """
+import sys, time
+start_time = time.perf_counter()
+sys.path.insert(0, {path!r})
+from hypertracker import hyperliquid, message, main
+hyperliquid.API_URL = {api_url!r}
+message.TELEGRAM_API_BASE = {telegram_base!r}
+main.run("config.ini", max_cycles=1)
+print(time.perf_counter() - start_time)
+"""
+
+def _run_python(args, cwd=None) -> tuple:
+    start_time = time.perf_counter()
+    completed = subprocess.run([sys.executable] + args, cwd=cwd, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Proses gagal ({completed.returncode}): {completed.stderr[-500:]}")
+    return time.perf_counter() - start_time, completed.stdout
+
+def bench_startup(n_addresses: int = 100, n_positions: int = 5, repeat: int = 3) -> dict:
+    """
+    Mengukur waktu startup di proses baru: `cli.py --help`, impor hypertracker.main, dan
+    `run()` sampai siklus polling pertama selesai terhadap server mock.
+
+    :param n_addresses: Jumlah alamat di user_addresses.json sementara.
+    :param n_positions: Jumlah posisi per alamat.
+    :param repeat: Jumlah pengulangan (yang dilaporkan median).
+    :return: Dict metrik startup dalam milidetik.
+    """
+    from mock_server import MockServer
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    help_times, import_times, first_poll_times = [], [], []
+    with MockServer(n_positions=n_positions) as server:
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                with open(os.path.join(workdir, "config.ini"), "w") as f:
+                    f.write(
+                        "[telegram]\nbottoken = 1:TEST\nchatid = 1\nadmins = 1\n"
+                        "[metrics]\nenabled = false\n"
+                        # Server mock tidak punya batas weight
+                        "[ratelimit]\nweight_per_minute = 1000000\n"
+                        f"[scheduler]\nbudget_per_minute = {n_addresses * 4}\n"
+                    )
+                with open(os.path.join(workdir, "user_addresses.json"), "w") as f:
+                    json.dump([f"0x{i:040x}" for i in range(n_addresses)], f)
+
+                help_times.append(_run_python([os.path.join(here, "cli.py"), "--help"], workdir)[0])
+                import_times.append(_run_python(["-c", f"import sys; sys.path.insert(0, {here!r}); import hypertracker.main"], workdir)[0])
+                driver = STARTUP_DRIVER.format(path=here, api_url=f"{server.url}/info", telegram_base=server.url)
+                _, output = _run_python(["-c", driver], workdir)
+                first_poll_times.append(float(output.strip().splitlines()[-1]))
+
+    return {
+        "cli_help_ms": statistics.median(help_times) * 1000,
+        "import_main_ms": statistics.median(import_times) * 1000,
+        "first_poll_ms": statistics.median(first_poll_times) * 1000,
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Membandingkan hasil dengan baseline; metrik waktu yang melambat lebih dari `threshold` dianggap regresi.
+
+    :return: List (nama, baseline, sekarang, rasio) untuk metrik yang regresi.
+    """
+    regressions = []
+    for name, value in results.items():
+        old = baseline.get(name)
+        if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        # Jumlah request single-flight dan ukuran body hanya informasi, bukan metrik waktu
+        if name.startswith(('flight_', 'cached_poll_', 'http_bytes_')) and not name.endswith('_ms'):
+            continue
+        # Untuk throughput, makin kecil makin buruk
+        ratio = old / value if name.endswith("_per_s") else value / old
+        print(f"  {name:<28} {old:>10.2f} -> {value:>10.2f}  ({ratio:.2f}x)")
+        if ratio > threshold:
+            regressions.append((name, old, value, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench", description="Benchmark offline HYPERTrackingLb")
+    parser.add_argument("--positions", type=int, default=5, help="Jumlah posisi per alamat")
+    parser.add_argument("--iterations", type=int, default=2000, help="Jumlah pengulangan")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah putaran microbenchmark (dilaporkan median)")
+    parser.add_argument("--max-addresses", type=int, default=10000, help="Jumlah alamat terbesar untuk bench tabel")
+    parser.add_argument("--state-addresses", type=int, default=100000, help="Jumlah alamat untuk bench memori state")
+    parser.add_argument("--addresses", type=int, default=200, help="Jumlah alamat untuk bench end-to-end")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latensi server mock per request (detik)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Request bersamaan pada bench end-to-end")
+    parser.add_argument("--skip-e2e", action="store_true", help="Lewati bench end-to-end dengan server mock")
+    parser.add_argument("--skip-startup", action="store_true", help="Lewati bench waktu startup")
+    parser.add_argument("--json", metavar="PATH", help="Simpan hasil ke file JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Bandingkan dengan hasil JSON sebelumnya")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Rasio perlambatan yang dianggap regresi")
+    args = parser.parse_args(argv)
+
+    # Konfigurasi ikut disimpan agar perbandingan hanya dilakukan antar run dengan parameter sama
+    results = {"_config": {k: v for k, v in vars(args).items() if k not in ("json", "compare", "threshold")}}
+
+    result = bench_diff(args.positions, args.iterations)
+    results["positions_us"] = result["positions_us"]
+    print(f"diff per alamat ({args.positions} posisi):")
+    print(f"  positions (slots) : {result['positions_us']:.1f} us")
+    if result['pandas_us'] is not None:
+        print(f"  pandas (lama)     : {result['pandas_us']:.1f} us  ({result['pandas_us'] / result['positions_us']:.0f}x)")
+    else:
+        print("  pandas (lama)     : dilewati, pandas tidak terpasang")
+
+    print(f"tahap per alamat ({args.positions} posisi, median {args.repeat} putaran):")
+    for name, value in bench_micro(args.positions, args.iterations, args.repeat).items():
+        results[name] = value
+        print(f"  {name:<24}: {value:.2f} us")
+
+    from hypertracker import codec
+    print(f"decode + parse clearinghouseState (backend {codec.backend}):")
+    for count, timings in bench_parse(iterations=max(1, args.iterations // 4), repeat=args.repeat).items():
+        for name, value in timings.items():
+            results[f"parse_{count}_{name}"] = value
+        print(f"  {count:>4} posisi : lama {timings['legacy_us']:.1f} us | skema+json {timings['schema_json_us']:.1f} us "
+              f"| skema+{codec.backend} {timings['schema_codec_us']:.1f} us ({timings['legacy_us'] / timings['schema_codec_us']:.1f}x)")
+
+    counts = [c for c in (10, 100, 1000, 10000, 100000) if c <= args.max_addresses]
+    print(f"PositionTable per posisi ({args.positions} posisi/alamat):")
+    for count, per_position in bench_table(counts, args.positions).items():
+        results[f"table_{count}_us"] = per_position
+        print(f"  {count:>6} alamat : {per_position:.2f} us")
+
+    print(f"memori state ({args.state_addresses} alamat, {args.positions} posisi/alamat):")
+    for name, value in bench_state_memory(args.state_addresses, args.positions).items():
+        results[name] = value
+        print(f"  {name:<30}: {value:.2f}")
+
+    print(f"agregat eksposur ({args.max_addresses} alamat, diperiksa terhadap hitung ulang penuh):")
+    for name, value in bench_exposure(args.max_addresses, args.positions).items():
+        results[name] = value
+        print(f"  {name:<30}: {value:.2f}")
+
+    if not args.skip_e2e:
+        print(f"end-to-end ({args.addresses} alamat, latensi {args.latency * 1000:.0f}ms, concurrency {args.concurrency}):")
+        for name, value in bench_end_to_end(args.addresses, args.positions, args.latency, args.concurrency).items():
+            results[name] = value
+            print(f"  {name:<24}: {value:.2f}")
+
+    if not args.skip_startup:
+        print(f"startup proses baru (median {args.repeat} putaran):")
+        for name, value in bench_startup(repeat=args.repeat).items():
+            results[name] = value
+            print(f"  {name:<24}: {value:.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Hasil disimpan ke {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("_config") not in (None, results["_config"]):
+            print(f"Peringatan: parameter baseline berbeda ({baseline['_config']}), hasil tidak sebanding.")
+        print(f"perbandingan dengan {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrik melambat lebih dari {args.threshold:.2f}x")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
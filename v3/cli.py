@@ -0,0 +1,5 @@
+from hypertracker.cli import main
+
+# Titik masuk dari checkout sumber; setelah `pip install` perintah yang sama tersedia sebagai `hypertracker`
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+HYPERTrackingLb v3: pemantau posisi Hyperliquid ke Telegram.
+"""
@@ -0,0 +1,173 @@
+import html
+from .positions import INCREASED, REDUCED, FLIPPED
+
+ACCOUNT_INFO_URL_TEMPLATE = 'https://hyperdash.info/trader/{}'
+
+def shorten_address(user_address):
+    if user_address.startswith("0x") and len(user_address) > 7:
+        return user_address[:7]
+    return user_address
+
+def render_address_header(user_address) -> str:
+    """
+    :return: Baris pembuka semua notifikasi per alamat.
+    """
+    return f"⚠️ [<b>{shorten_address(user_address)}</b>]\n"
+
+def _header(user_address, with_header: bool) -> str:
+    return render_address_header(user_address) if with_header else ""
+
+def render_new_position_message(symbol, position, user_address, with_header: bool = True) -> str:
+    """
+    :param with_header: False untuk digest, yang menulis header alamat sendiri.
+    :return: Teks HTML notifikasi posisi baru.
+    """
+    pnl = position.unrealized_pnl
+    pnl_emoji = "🟢" if pnl >= 0 else "🔴"
+    return (
+        f"{_header(user_address, with_header)}"
+        f"❇️ <b>New position opened</b>\n\n"
+        f"<b>Position:</b> {symbol} {position.side} {position.leverage}X\n\n"
+        f"💵 Base currency - USDT\n"
+        f"------------------------------\n"
+        f"🎯 <b>Entry Price:</b> {position.entry_price}\n"
+        f"💰 <b>Est. Entry Size:</b> {position.estimated_entry_size}\n"
+        f"{pnl_emoji} <b>PnL:</b> {pnl}\n\n"
+        f"<b>Last Update:</b>\n{position.update_time} (UTC+7)\n"
+        f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
+    )
+
+def render_closed_position_message(symbol, position, user_address, mark_price, with_header: bool = True) -> str:
+    """
+    :param mark_price: Harga mark saat ini (atau pesan kesalahan dari cache).
+    :param with_header: False untuk digest, yang menulis header alamat sendiri.
+    :return: Teks HTML notifikasi posisi ditutup.
+    """
+    return (
+        f"{_header(user_address, with_header)}"
+        f"⛔️ <b>Position closed</b>\n\n"
+        f"<b>Position:</b> {symbol} {position.side} {position.leverage}X\n"
+        f"💵 <b>Current Price:</b> {mark_price} USDT\n\n"
+        f"<b>Last Update:</b>\n{position.update_time} (UTC+7)\n"
+        f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
+    )
+
+def render_position_changed_message(event, user_address, with_header: bool = True) -> str:
+    """
+    :param with_header: False untuk digest, yang menulis header alamat sendiri.
+    :return: Teks HTML notifikasi posisi bertambah, berkurang, berbalik arah, atau ganti leverage.
+    """
+    old, new = event.previous, event.current
+    titles = {
+        INCREASED: "📈 <b>Position increased</b>",
+        REDUCED: "📉 <b>Position reduced</b>",
+        FLIPPED: "🔄 <b>Position flipped</b>",
+    }
+    title = titles.get(event.kind, "⚙️ <b>Leverage changed</b>")
+    pnl_emoji = "🟢" if new.unrealized_pnl >= 0 else "🔴"
+    return (
+        f"{_header(user_address, with_header)}"
+        f"{title}\n\n"
+        f"<b>Position:</b> {event.coin} {new.side} {new.leverage}X\n"
+        f"<b>Before:</b> {old.side} {abs(old.size)} @ {old.leverage}X\n"
+        f"<b>After:</b> {new.side} {abs(new.size)} @ {new.leverage}X\n\n"
+        f"🎯 <b>Entry Price:</b> {new.entry_price}\n"
+        f"💰 <b>Est. Entry Size:</b> {new.estimated_entry_size}\n"
+        f"{pnl_emoji} <b>PnL:</b> {new.unrealized_pnl}\n\n"
+        f"<b>Last Update:</b>\n{new.update_time} (UTC+7)\n"
+        f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
+    )
+
+def render_current_positions(positions, user_address, with_header: bool = True) -> str:
+    """
+    :param positions: Dict coin -> Position.
+    :param with_header: False untuk digest, yang menulis header alamat sendiri.
+    :return: Teks HTML daftar posisi saat ini.
+    """
+    header = _header(user_address, with_header)
+    if not positions:
+        return f"{header}💎 <b>No positions found</b>"
+
+    message = f"{header}💎 <b>Current positions:</b>\n\n"
+    for symbol, position in positions.items():
+        pnl_emoji = "🟢" if position.unrealized_pnl >= 0 else "🔴"
+        message += (
+            f"<b>{symbol}</b> {position.side} {position.leverage}X\n"
+            f"🎯 Entry: {position.entry_price} | 💰 Size: {position.estimated_entry_size}\n"
+            f"{pnl_emoji} PnL: {position.unrealized_pnl}\n"
+            f"------------------------------\n"
+        )
+    message += f"<b>Last Update:</b> {position.update_time} (UTC+7)\n"
+    message += f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE</b></a>"
+    return message
+
+def render_outage_started_message(failures, addresses, last_error) -> str:
+    """
+    :param failures: Jumlah request yang gagal sejauh ini.
+    :param addresses: Jumlah alamat yang terdampak.
+    :param last_error: Pesan error terakhir.
+    :return: Teks HTML notifikasi gangguan API (dikirim sekali per gangguan).
+    """
+    return (
+        f"🚨 <b>Hyperliquid API errors</b>\n\n"
+        f"{failures} failed requests for {addresses} addresses.\n"
+        f"<b>Last error:</b> {html.escape(str(last_error))}\n\n"
+        f"Further errors are suppressed until the API recovers."
+    )
+
+def render_outage_recovered_message(failures, addresses, duration) -> str:
+    """
+    :param duration: Lama gangguan dalam detik.
+    :return: Teks HTML ringkasan saat API pulih.
+    """
+    return (
+        f"✅ <b>Hyperliquid API recovered</b>\n\n"
+        f"Outage lasted {duration:.0f}s with {failures} failed requests for {addresses} addresses."
+    )
+
+def format_usd(value: float) -> str:
+    """
+    :return: Nilai dolar ringkas bertanda, misalnya "+$12.3M" atau "-$850K".
+    """
+    sign = "-" if value < 0 else "+"
+    value = abs(value)
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if value >= threshold:
+            return f"{sign}${value / threshold:.1f}{suffix}"
+    return f"{sign}${value:.0f}"
+
+def _render_exposure_line(exposure) -> str:
+    pnl_emoji = "🟢" if exposure.unrealized_pnl >= 0 else "🔴"
+    return (
+        f"<b>{html.escape(exposure.coin)}</b> net {format_usd(exposure.net_notional)} "
+        f"({exposure.long_count}L {format_usd(exposure.long_notional)[1:]} / "
+        f"{exposure.short_count}S {format_usd(exposure.short_notional)[1:]})\n"
+        f"{pnl_emoji} uPnL {format_usd(exposure.unrealized_pnl)}\n"
+    )
+
+def render_exposure_message(exposures, wallets) -> str:
+    """
+    :param exposures: List CoinExposure urut net notional absolut.
+    :param wallets: Jumlah alamat yang punya state.
+    :return: Teks HTML eksposur bersih per coin.
+    """
+    if not exposures:
+        return "📊 <b>Whale exposure</b>\n\nNo open positions."
+    message = f"📊 <b>Whale exposure</b> ({wallets} wallets)\n\n"
+    for exposure in exposures:
+        message += _render_exposure_line(exposure)
+    return message
+
+def render_crowded_message(exposures, min_wallets) -> str:
+    """
+    :param exposures: List CoinExposure urut porsi searah tertinggi.
+    :param min_wallets: Jumlah alamat minimum per coin yang dipakai.
+    :return: Teks HTML coin dengan posisi paling searah.
+    """
+    if not exposures:
+        return f"🐑 <b>Crowded trades</b>\n\nNo coin is held by at least {min_wallets} wallets."
+    message = f"🐑 <b>Crowded trades</b> (≥{min_wallets} wallets)\n\n"
+    for exposure in exposures:
+        side, ratio = ("LONG", exposure.long_ratio) if exposure.long_ratio >= 0.5 else ("SHORT", 1 - exposure.long_ratio)
+        message += f"{ratio:.0%} {side} · " + _render_exposure_line(exposure)
+    return message
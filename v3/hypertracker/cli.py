@@ -0,0 +1,66 @@
+import argparse
+import sys
+
+DEFAULT_CONFIG_PATH = 'config.ini'
+
+def cmd_run(args, extra) -> None:
+    from .main import run
+    run(args.config)
+
+def cmd_setup(args, extra) -> None:
+    from .setup import setup
+    setup()
+
+def cmd_bench(args, extra) -> None:
+    # bench.py dan mock_server.py tidak ikut dipasang; hanya tersedia dari checkout sumber v3/
+    try:
+        from bench import main as bench_main
+    except ModuleNotFoundError as e:
+        if e.name != 'bench':
+            raise
+        sys.exit("bench hanya tersedia dari checkout sumber: jalankan `python cli.py bench` di direktori v3/")
+    bench_main(extra)
+
+def cmd_replay(args, extra) -> None:
+    from .replay import main as replay_main
+    replay_main(extra)
+
+def cmd_discover(args, extra) -> None:
+    from .discovery import main as discover_main
+    discover_main(extra)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hypertracker", description="HYPERTrackingLb: pemantau posisi Hyperliquid ke Telegram")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Menjalankan bot pemantauan")
+    run_parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="Lokasi config.ini")
+    run_parser.set_defaults(handler=cmd_run)
+
+    setup_parser = subparsers.add_parser("setup", help="Membuat config.ini dan user_addresses.json secara interaktif")
+    setup_parser.set_defaults(handler=cmd_setup)
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark offline (argumen lain diteruskan ke bench.py)", add_help=False)
+    bench_parser.set_defaults(handler=cmd_bench, passthrough=True)
+
+    replay_parser = subparsers.add_parser("replay", help="Memutar ulang rekaman clearinghouseState (argumen lain diteruskan ke replay.py)", add_help=False)
+    replay_parser.set_defaults(handler=cmd_replay, passthrough=True)
+
+    discover_parser = subparsers.add_parser("discover", help="Menampilkan/menyinkronkan trader teratas leaderboard (argumen lain diteruskan ke discovery.py)", add_help=False)
+    discover_parser.set_defaults(handler=cmd_discover, passthrough=True)
+    return parser
+
+def main(argv=None) -> None:
+    """
+    Satu titik masuk untuk semua perintah. Modul perintah diimpor hanya saat
+    dipakai, sehingga `--help` dan perintah ringan tidak memuat dependensi berat.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and not getattr(args, "passthrough", False):
+        parser.error(f"argumen tidak dikenal: {' '.join(extra)}")
+    args.handler(args, extra)
+
+if __name__ == "__main__":
+    main()
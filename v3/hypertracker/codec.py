@@ -0,0 +1,126 @@
+import json
+import logging
+
+def _safe_float(value, default=0.0) -> float:
+    """Konversi aman ke float dengan nilai default jika gagal."""
+    try:
+        return float(value or default) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+def _stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+_BACKENDS = {'json': (_stdlib_loads, _stdlib_dumps)}
+try:
+    import orjson
+    _BACKENDS['orjson'] = (orjson.loads, orjson.dumps)
+except ImportError:
+    pass
+
+backend = None
+loads = None
+dumps = None
+
+def set_backend(name: str = 'auto') -> str:
+    """
+    Memilih decoder/encoder JSON.
+
+    :param name: "orjson", "json", atau "auto" (orjson jika terpasang, selain itu stdlib).
+    :return: Nama backend yang aktif.
+    """
+    global backend, loads, dumps
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in _BACKENDS else 'json'
+    if name not in _BACKENDS:
+        logging.warning(f"Backend JSON '{name}' tidak tersedia, memakai stdlib json.")
+        name = 'json'
+    backend = name
+    loads, dumps = _BACKENDS[name]
+    return name
+
+set_backend()
+
+def decode_response(response):
+    """
+    :param response: Objek respons HTTP.
+    :return: Body respons yang sudah didekode dengan backend aktif.
+    :raises ValueError: Jika body bukan JSON yang valid.
+    """
+    return loads(response.content)
+
+def compile_schema(fields, name: str = 'extract'):
+    """
+    Mengompilasi skema ekstraksi field menjadi satu fungsi Python.
+
+    Setiap field adalah tuple (nama_output, path, jenis) dengan path berupa
+    tuple key bersarang dan jenis "float", "str", atau "raw". Fungsi hasil
+    hanya membaca field yang disebut; jika ada nilai yang tidak bisa
+    dikonversi, ekstraksi diulang lewat jalur aman (_safe_float).
+
+    :param fields: Daftar definisi field.
+    :param name: Nama fungsi (untuk traceback).
+    :return: Fungsi (dict) -> dict.
+    """
+    def accessor(path):
+        expr = 'obj'
+        for i, key in enumerate(path):
+            expr = f"{expr}.get({key!r})" if i == len(path) - 1 else f"({expr}.get({key!r}) or _EMPTY)"
+        return expr
+
+    fast, safe = [], []
+    for out, path, kind in fields:
+        expr = accessor(path)
+        if kind == 'float':
+            fast.append(f"{out!r}: float({expr} or 0.0)")
+            safe.append(f"{out!r}: _safe_float({expr})")
+        elif kind == 'str':
+            fast.append(f"{out!r}: {expr} or ''")
+            safe.append(f"{out!r}: {expr} or ''")
+        else:
+            fast.append(f"{out!r}: {expr} or {{}}")
+            safe.append(f"{out!r}: {expr} or {{}}")
+
+    source = (
+        f"def {name}(obj):\n"
+        f"    try:\n"
+        f"        return {{{', '.join(fast)}}}\n"
+        f"    except (TypeError, ValueError):\n"
+        f"        return {{{', '.join(safe)}}}\n"
+    )
+    namespace = {'_safe_float': _safe_float, '_EMPTY': {}}
+    exec(compile(source, f"<schema {name}>", "exec"), namespace)
+    return namespace[name]
+
+# Field posisi yang dipakai tracker (modify_data / PositionTable)
+TRACKER_POSITION_FIELDS = (
+    ('coin', ('coin',), 'str'),
+    ('size', ('szi',), 'float'),
+    ('entry_price', ('entryPx',), 'float'),
+    ('position_value', ('positionValue',), 'float'),
+    ('unrealized_pnl', ('unrealizedPnl',), 'float'),
+    ('leverage', ('leverage', 'value'), 'float'),
+    ('liquidation_price', ('liquidationPx',), 'float'),
+)
+
+# Semua field posisi untuk get_position
+FULL_POSITION_FIELDS = TRACKER_POSITION_FIELDS + (
+    ('margin_used', ('marginUsed',), 'float'),
+    ('max_leverage', ('maxLeverage',), 'float'),
+    ('cum_funding', ('cumFunding',), 'raw'),
+)
+
+MARGIN_SUMMARY_FIELDS = (
+    ('account_value', ('marginSummary', 'accountValue'), 'float'),
+    ('total_notional_position', ('marginSummary', 'totalNtlPos'), 'float'),
+    ('total_raw_usd', ('marginSummary', 'totalRawUsd'), 'float'),
+    ('total_margin_used', ('marginSummary', 'totalMarginUsed'), 'float'),
+    ('withdrawable', ('withdrawable',), 'float'),
+)
+
+extract_tracker_position = compile_schema(TRACKER_POSITION_FIELDS, 'extract_tracker_position')
+extract_full_position = compile_schema(FULL_POSITION_FIELDS, 'extract_full_position')
+extract_margin_summary = compile_schema(MARGIN_SUMMARY_FIELDS, 'extract_margin_summary')
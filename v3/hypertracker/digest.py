@@ -0,0 +1,105 @@
+import threading
+import time
+from .alerts import render_address_header
+from .dispatcher import MAX_MESSAGE_LENGTH, split_message
+
+DEFAULT_FLUSH_WINDOW = 0.0
+BLOCK_SEPARATOR = "\n\n"
+ADDRESS_SEPARATOR = "\n\n➖➖➖➖➖➖➖➖\n\n"
+
+def pack_digest(groups, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """
+    Menyusun notifikasi yang sudah dikelompokkan per alamat menjadi sesedikit mungkin pesan.
+
+    Header alamat hanya ditulis sekali per pesan; pesan baru dimulai di batas
+    notifikasi, dan header diulang jika satu alamat berlanjut ke pesan berikutnya.
+
+    :param groups: Iterable (alamat, list teks notifikasi tanpa header alamat).
+    :param limit: Panjang maksimum satu pesan.
+    :return: List teks pesan.
+    """
+    messages = []
+    current = ""
+    current_address = None
+    for user_address, blocks in groups:
+        header = render_address_header(user_address)
+        for block in blocks:
+            if current and current_address == user_address:
+                candidate = current + BLOCK_SEPARATOR + block
+            elif current:
+                candidate = current + ADDRESS_SEPARATOR + header + block
+            else:
+                candidate = header + block
+            if len(candidate) <= limit:
+                current, current_address = candidate, user_address
+                continue
+            if current:
+                messages.append(current)
+            current, current_address = header + block, user_address
+            if len(current) > limit:
+                # Satu notifikasi saja melebihi batas: dipecah di akhir baris
+                messages.extend(split_message(current, limit))
+                current, current_address = "", None
+    if current:
+        messages.append(current)
+    return messages
+
+class DigestBuffer:
+    """
+    Mengumpulkan notifikasi satu siklus (atau satu jendela waktu) lalu
+    mengirimnya sebagai digest per alamat dalam sesedikit mungkin pesan.
+    """
+
+    def __init__(self, send, window: float = DEFAULT_FLUSH_WINDOW, limit: int = MAX_MESSAGE_LENGTH):
+        """
+        :param send: Fungsi (teks) untuk mengirim satu pesan, misalnya dispatcher.enqueue.
+        :param window: Lama (detik) notifikasi pertama boleh menunggu sebelum digest dikirim; 0 = setiap flush.
+        :param limit: Panjang maksimum satu pesan.
+        """
+        self.send = send
+        self.window = window
+        self.limit = limit
+        self._pending = {}
+        self._first_at = None
+        self._lock = threading.Lock()
+        self.events = 0
+        self.messages = 0
+
+    def add(self, user_address: str, text: str) -> None:
+        """
+        :param user_address: Alamat yang notifikasinya ditambahkan.
+        :param text: Teks notifikasi hasil renderer di alerts.py dengan with_header=False.
+        """
+        with self._lock:
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            self._pending.setdefault(user_address, []).append(text)
+            self.events += 1
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Mengirim digest jika jendela waktu sudah lewat (atau selalu jika force).
+
+        :return: Jumlah pesan yang dikirim.
+        """
+        with self._lock:
+            if self._first_at is None:
+                return 0
+            if not force and time.monotonic() - self._first_at < self.window:
+                return 0
+            pending, self._pending, self._first_at = self._pending, {}, None
+        messages = pack_digest(pending.items(), self.limit)
+        for message in messages:
+            self.send(message)
+        self.messages += len(messages)
+        return len(messages)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah notifikasi yang masuk, pesan yang dikirim, dan rata-rata notifikasi per pesan.
+        """
+        return {
+            "events": self.events,
+            "messages": self.messages,
+            "events_per_message": self.events / self.messages if self.messages else 0.0,
+        }
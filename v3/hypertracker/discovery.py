@@ -0,0 +1,276 @@
+import argparse
+import codecs
+import heapq
+import json
+import logging
+import os
+import time
+from contextlib import closing
+from .http_client import api_client
+from .registry import is_valid_address
+
+LEADERBOARD_URL = "https://stats-data.hyperliquid.xyz/Mainnet/leaderboard"
+DEFAULT_DISCOVERY_STATE_PATH = 'discovery_state.json'
+DEFAULT_TOP_N = 50
+DEFAULT_METRIC = 'month_pnl'
+DEFAULT_INTERVAL = 3600.0
+CHUNK_SIZE = 64 * 1024
+# Dataset leaderboard berukuran puluhan MB; read timeout per chunk, bukan untuk seluruh unduhan
+DOWNLOAD_TIMEOUT = (5.0, 60.0)
+
+WINDOWS = {'day': 'day', 'week': 'week', 'month': 'month', 'alltime': 'allTime'}
+WINDOW_FIELDS = ('pnl', 'roi', 'vlm')
+_WHITESPACE = ' \t\r\n,'
+
+def metric_getter(metric: str):
+    """
+    Membuat fungsi pengambil nilai metrik dari satu baris leaderboard.
+
+    :param metric: "account_value" atau "<window>_<field>", dengan window day/week/month/alltime
+                   dan field pnl/roi/vlm (misalnya "month_pnl", "alltime_roi").
+    :return: Fungsi (row) -> float.
+    :raises ValueError: Jika nama metrik tidak dikenal.
+    """
+    if metric == 'account_value':
+        return lambda row: float(row['accountValue'])
+    window, _, field = metric.rpartition('_')
+    window = WINDOWS.get(window.lower())
+    if window is None or field not in WINDOW_FIELDS:
+        raise ValueError(f"Metrik tidak dikenal: {metric} (contoh: month_pnl, week_roi, alltime_vlm, account_value)")
+
+    def getter(row):
+        for name, performance in row['windowPerformances']:
+            if name == window:
+                return float(performance[field])
+        raise KeyError(window)
+    return getter
+
+def iter_leaderboard_rows(chunks, array_key: str = 'leaderboardRows'):
+    """
+    Mem-parse array baris leaderboard secara bertahap dari potongan byte.
+
+    Hanya satu potongan dan baris yang sedang didekode yang ada di memori;
+    setiap objek di dalam array didekode dengan `JSONDecoder.raw_decode`
+    segera setelah lengkap.
+
+    :param chunks: Iterable bytes (misalnya response.iter_content()).
+    :param array_key: Key array baris di objek JSON teratas.
+    :return: Generator dict baris.
+    :raises ValueError: Jika array tidak ditemukan atau data terpotong/rusak.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+
+    def read_more() -> bool:
+        nonlocal buffer, position
+        for chunk in chunks:
+            if chunk:
+                buffer = buffer[position:] + text_decoder.decode(chunk)
+                position = 0
+                return True
+        return False
+
+    marker = f'"{array_key}"'
+    while True:
+        index = buffer.find(marker)
+        bracket = buffer.find('[', index + len(marker)) if index >= 0 else -1
+        if bracket >= 0:
+            position = bracket + 1
+            break
+        # Sisakan ekor buffer agar marker yang terbelah antar potongan tetap ditemukan
+        position = index if index >= 0 else max(0, len(buffer) - len(marker))
+        if not read_more():
+            raise ValueError(f"Array '{array_key}' tidak ditemukan di leaderboard")
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if not read_more():
+                raise ValueError("Data leaderboard terpotong")
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            row, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Baris belum lengkap di buffer; tambah potongan berikutnya lalu coba lagi
+            if not read_more():
+                raise ValueError("Data leaderboard terpotong atau rusak")
+            continue
+        position = end
+        yield row
+
+def top_addresses(rows, n: int, metric: str = DEFAULT_METRIC, min_account_value: float = 0.0) -> list:
+    """
+    Memilih N alamat teratas menurut metrik dalam satu lintasan heap (O(n log k)).
+
+    :param rows: Iterable baris leaderboard.
+    :param n: Jumlah alamat yang dipilih.
+    :param metric: Nama metrik (lihat metric_getter).
+    :param min_account_value: Abaikan akun dengan nilai di bawah ini.
+    :return: List (nilai, alamat) urut dari nilai tertinggi.
+    """
+    getter = metric_getter(metric)
+
+    def candidates():
+        for row in rows:
+            try:
+                address = row['ethAddress'].lower()
+                if not is_valid_address(address):
+                    continue
+                if min_account_value and float(row['accountValue']) < min_account_value:
+                    continue
+                yield getter(row), address
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    return heapq.nlargest(n, candidates())
+
+class LeaderboardDiscovery:
+    """
+    Menyinkronkan daftar alamat dengan N trader teratas leaderboard Hyperliquid.
+
+    Dataset diunduh dengan If-None-Match / If-Modified-Since sehingga file yang
+    tidak berubah tidak diunduh dan di-parse ulang. Hanya alamat yang pernah
+    ditambahkan oleh discovery yang bisa dihapus olehnya; alamat yang
+    ditambahkan manual lewat /add atau setup.py tidak pernah disentuh.
+    """
+
+    def __init__(self, registry, url: str = LEADERBOARD_URL, top_n: int = DEFAULT_TOP_N, metric: str = DEFAULT_METRIC,
+                 min_account_value: float = 0.0, state_path: str = DEFAULT_DISCOVERY_STATE_PATH, protected=None):
+        """
+        :param registry: AddressRegistry yang disinkronkan.
+        :param url: URL dataset leaderboard.
+        :param top_n: Jumlah alamat teratas yang dipantau.
+        :param metric: Metrik peringkat (lihat metric_getter).
+        :param min_account_value: Abaikan akun dengan nilai di bawah ini.
+        :param state_path: File JSON berisi ETag/Last-Modified dan alamat yang dikelola discovery.
+        :param protected: Fungsi tanpa argumen yang mengembalikan alamat yang tidak boleh dihapus (misalnya yang dipin).
+        """
+        metric_getter(metric)
+        self.registry = registry
+        self.url = url
+        self.top_n = top_n
+        self.metric = metric
+        self.min_account_value = min_account_value
+        self.state_path = state_path
+        self.protected = protected
+        self.etag = None
+        self.last_modified = None
+        self.managed = set()
+        self.last_sync = None
+        self._load_state()
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        # Validator hanya berlaku untuk metrik dan jumlah yang sama; jika berubah, unduh ulang
+        if state.get('metric') == self.metric and state.get('top_n') == self.top_n:
+            self.etag = state.get('etag')
+            self.last_modified = state.get('last_modified')
+        self.managed = set(state.get('managed', []))
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'etag': self.etag, 'last_modified': self.last_modified, 'metric': self.metric,
+                'top_n': self.top_n, 'managed': sorted(self.managed), 'synced_at': self.last_sync,
+            }, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def fetch_top(self, conditional: bool = True):
+        """
+        Mengunduh dan memeringkat leaderboard secara streaming.
+
+        :param conditional: Kirim ETag/Last-Modified terakhir agar server bisa menjawab 304.
+        :return: List (nilai, alamat) teratas, atau None jika leaderboard tidak berubah.
+        :raises requests.exceptions.RequestException: Jika unduhan gagal.
+        :raises ValueError: Jika data leaderboard rusak.
+        """
+        headers = {}
+        if conditional and self.etag:
+            headers['If-None-Match'] = self.etag
+        if conditional and self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        start_time = time.perf_counter()
+        response = api_client.get(self.url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        with closing(response):
+            if response.status_code == 304:
+                logging.info("Leaderboard tidak berubah sejak unduhan terakhir (304)")
+                return None
+            response.raise_for_status()
+            ranked = top_addresses(iter_leaderboard_rows(response.iter_content(CHUNK_SIZE)),
+                                   self.top_n, self.metric, self.min_account_value)
+            # Validator baru disimpan hanya setelah seluruh file berhasil di-parse
+            self.etag = response.headers.get('ETag')
+            self.last_modified = response.headers.get('Last-Modified')
+        logging.info(f"Leaderboard di-parse dalam {(time.perf_counter() - start_time) * 1000:.0f}ms, {len(ranked)} alamat teratas menurut {self.metric}")
+        return ranked
+
+    def sync(self, force: bool = False) -> dict:
+        """
+        Menambahkan alamat teratas yang belum dipantau dan menghapus alamat kelolaan
+        yang keluar dari peringkat, masing-masing dalam satu batch registry.
+
+        :param force: Unduh ulang walaupun leaderboard tidak berubah.
+        :return: Dict {"changed": bool, "added": list alamat, "removed": list alamat}.
+        """
+        ranked = self.fetch_top(conditional=not force)
+        if ranked is None:
+            return {"changed": False, "added": [], "removed": []}
+
+        selected = [address for _, address in ranked]
+        selected_set = set(selected)
+        current = set(self.registry.snapshot())
+        protected = set(self.protected()) if self.protected is not None else set()
+
+        to_add = [address for address in selected if address not in current]
+        to_remove = [
+            self.registry.id_of(address) for address in self.managed
+            if address in current and address not in selected_set and address not in protected
+        ]
+        added, _ = self.registry.add_many(to_add) if to_add else ([], [])
+        removed = self.registry.remove_many(to_remove) if to_remove else []
+
+        # Alamat yang dihapus manual berhenti dikelola; alamat yang sudah ada sebelumnya tidak pernah dikelola
+        self.managed = (self.managed | {address for _, address in added}) & set(self.registry.snapshot())
+        self.last_sync = time.time()
+        self._save_state()
+        result = {"changed": True, "added": [address for _, address in added], "removed": [address for _, address in removed]}
+        logging.info(f"Discovery: +{len(result['added'])} / -{len(result['removed'])} alamat, {len(self.managed)} dikelola")
+        return result
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="discover", description="Menampilkan atau menyinkronkan trader teratas leaderboard Hyperliquid")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="Jumlah alamat teratas")
+    parser.add_argument("--metric", default=DEFAULT_METRIC, help="Metrik peringkat: <day|week|month|alltime>_<pnl|roi|vlm> atau account_value")
+    parser.add_argument("--min-account-value", type=float, default=0.0, help="Abaikan akun dengan nilai di bawah ini")
+    parser.add_argument("--url", default=LEADERBOARD_URL, help="URL dataset leaderboard")
+    parser.add_argument("--apply", action="store_true", help="Sinkronkan user_addresses.json dengan hasil peringkat")
+    parser.add_argument("--addresses", default=None, help="Lokasi file alamat untuk --apply (default user_addresses.json)")
+    args = parser.parse_args(argv)
+
+    if args.apply:
+        from .registry import AddressRegistry, DEFAULT_ADDRESSES_PATH
+        registry = AddressRegistry(args.addresses or DEFAULT_ADDRESSES_PATH).load()
+        discovery = LeaderboardDiscovery(registry, args.url, args.top, args.metric, args.min_account_value)
+        result = discovery.sync(force=True)
+        registry.compact()
+        print(f"Ditambahkan {len(result['added'])}, dihapus {len(result['removed'])}, total {len(registry)} alamat")
+        return
+
+    discovery = LeaderboardDiscovery(None, args.url, args.top, args.metric, args.min_account_value, state_path=os.devnull)
+    for rank, (value, address) in enumerate(discovery.fetch_top(conditional=False), 1):
+        print(f"{rank:>4}. {address}  {args.metric}={value:,.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import math
+import threading
+
+DEFAULT_TOP_COINS = 10
+DEFAULT_MIN_WALLETS = 3
+
+class CoinExposure:
+    """
+    Agregat posisi semua alamat yang dipantau untuk satu coin.
+    """
+
+    __slots__ = ('coin', 'long_count', 'short_count', 'long_notional', 'short_notional', 'unrealized_pnl')
+
+    def __init__(self, coin: str):
+        self.coin = coin
+        self.long_count = 0
+        self.short_count = 0
+        self.long_notional = 0.0
+        self.short_notional = 0.0
+        self.unrealized_pnl = 0.0
+
+    @property
+    def wallets(self) -> int:
+        return self.long_count + self.short_count
+
+    @property
+    def net_notional(self) -> float:
+        return self.long_notional - self.short_notional
+
+    @property
+    def long_ratio(self) -> float:
+        """
+        :return: Porsi alamat yang long (0.0 - 1.0).
+        """
+        return self.long_count / self.wallets if self.wallets else 0.0
+
+    def add(self, position, sign: int) -> None:
+        """
+        Menambahkan (sign=1) atau mengurangi (sign=-1) kontribusi satu posisi.
+        """
+        notional = abs(position.position_value) * sign
+        if position.size >= 0:
+            self.long_count += sign
+            self.long_notional += notional
+        else:
+            self.short_count += sign
+            self.short_notional += notional
+        self.unrealized_pnl += position.unrealized_pnl * sign
+
+    def copy(self) -> "CoinExposure":
+        other = CoinExposure(self.coin)
+        (other.long_count, other.short_count, other.long_notional, other.short_notional,
+         other.unrealized_pnl) = (self.long_count, self.short_count, self.long_notional,
+                                  self.short_notional, self.unrealized_pnl)
+        return other
+
+def _contribution(position) -> tuple:
+    # Field yang memengaruhi agregat; posisi yang hanya berubah update_time tidak diproses ulang
+    return position.size, position.position_value, position.unrealized_pnl
+
+def compute_exposure(states) -> dict:
+    """
+    Menghitung ulang agregat dari nol (O(total posisi)); acuan untuk ExposureTracker.verify().
+
+    :param states: Mapping alamat -> dict coin -> Position (dict biasa atau PositionStateStore).
+    :return: Dict coin -> CoinExposure.
+    """
+    coins = {}
+    for user_address in states.keys():
+        for coin, position in (states.get(user_address) or {}).items():
+            exposure = coins.get(coin)
+            if exposure is None:
+                exposure = coins[coin] = CoinExposure(coin)
+            exposure.add(position, 1)
+    return coins
+
+class ExposureTracker:
+    """
+    Eksposur long/short lintas alamat per coin yang diperbarui secara inkremental.
+
+    Setiap snapshot alamat hanya mengurangi kontribusi lama dan menambahkan
+    kontribusi baru untuk coin yang nilainya berubah, sehingga biayanya
+    sebanding dengan jumlah perubahan, bukan total posisi; perintah
+    /exposure dan /crowded cukup membaca agregat yang sudah ada.
+    """
+
+    def __init__(self):
+        self._coins = {}
+        self._lock = threading.Lock()
+        self.applied = 0
+
+    def _apply(self, position, sign: int) -> None:
+        exposure = self._coins.get(position.coin)
+        if exposure is None:
+            exposure = self._coins[position.coin] = CoinExposure(position.coin)
+        exposure.add(position, sign)
+        self.applied += 1
+        if exposure.wallets == 0:
+            # Buang coin tanpa posisi agar sisa pembulatan float tidak menumpuk
+            del self._coins[position.coin]
+
+    def update(self, previous: dict = None, current: dict = None) -> None:
+        """
+        Menerapkan perubahan posisi satu alamat.
+
+        :param previous: Dict coin -> Position sebelumnya (None jika alamat baru).
+        :param current: Dict coin -> Position terbaru (None jika alamat dihapus).
+        """
+        previous = previous or {}
+        current = current or {}
+        with self._lock:
+            for coin, old in previous.items():
+                new = current.get(coin)
+                if new is None or _contribution(new) != _contribution(old):
+                    self._apply(old, -1)
+            for coin, new in current.items():
+                old = previous.get(coin)
+                if old is None or _contribution(new) != _contribution(old):
+                    self._apply(new, 1)
+
+    def rebuild(self, states) -> None:
+        """
+        Mengganti semua agregat dengan hasil hitung ulang (saat startup atau perubahan lease).
+        """
+        coins = compute_exposure(states)
+        with self._lock:
+            self._coins = coins
+
+    def snapshot(self) -> dict:
+        """
+        :return: Salinan dict coin -> CoinExposure.
+        """
+        with self._lock:
+            return {coin: exposure.copy() for coin, exposure in self._coins.items()}
+
+    def get(self, coin: str):
+        with self._lock:
+            exposure = self._coins.get(coin)
+            return exposure.copy() if exposure is not None else None
+
+    def top_exposure(self, n: int = DEFAULT_TOP_COINS) -> list:
+        """
+        :return: N coin dengan net notional absolut terbesar.
+        """
+        return sorted(self.snapshot().values(), key=lambda e: abs(e.net_notional), reverse=True)[:n]
+
+    def crowded(self, n: int = DEFAULT_TOP_COINS, min_wallets: int = DEFAULT_MIN_WALLETS) -> list:
+        """
+        :param min_wallets: Hanya coin yang dipegang minimal sekian alamat.
+        :return: N coin dengan posisi paling searah (porsi long atau short tertinggi), lalu jumlah alamat terbanyak.
+        """
+        candidates = [e for e in self.snapshot().values() if e.wallets >= min_wallets]
+        return sorted(candidates, key=lambda e: (max(e.long_ratio, 1 - e.long_ratio), e.wallets), reverse=True)[:n]
+
+    def verify(self, states, rel_tol: float = 1e-9, abs_tol: float = 1e-6) -> list:
+        """
+        Membandingkan agregat inkremental dengan hitung ulang penuh.
+
+        :return: List coin yang tidak cocok (kosong jika konsisten).
+        """
+        expected = compute_exposure(states)
+        actual = self.snapshot()
+        mismatched = []
+        for coin in set(expected) | set(actual):
+            a, b = actual.get(coin), expected.get(coin)
+            if a is None or b is None or (a.long_count, a.short_count) != (b.long_count, b.short_count) or not all(
+                math.isclose(x, y, rel_tol=rel_tol, abs_tol=abs_tol)
+                for x, y in ((a.long_notional, b.long_notional), (a.short_notional, b.short_notional),
+                             (a.unrealized_pnl, b.unrealized_pnl))
+            ):
+                mismatched.append(coin)
+        return sorted(mismatched)
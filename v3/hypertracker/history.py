@@ -0,0 +1,165 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_HISTORY_PATH = 'position_history.db'
+DEFAULT_MAX_PENDING = 1000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS addresses (id INTEGER PRIMARY KEY, address TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS coins (id INTEGER PRIMARY KEY, coin TEXT NOT NULL UNIQUE)",
+    # Primary key (address_id, coin_id, ts) sekaligus menjadi index berkelompok untuk query rentang waktu
+    "CREATE TABLE IF NOT EXISTS position_history ("
+    "address_id INTEGER NOT NULL, coin_id INTEGER NOT NULL, ts REAL NOT NULL, "
+    "size REAL, leverage REAL, entry_price REAL, position_value REAL, unrealized_pnl REAL, liquidation_price REAL, "
+    "PRIMARY KEY (address_id, coin_id, ts)) WITHOUT ROWID",
+)
+
+class HistoryStore:
+    """
+    Penyimpanan time-series posisi per alamat di SQLite (mode WAL).
+
+    `record` hanya memasukkan snapshot ke antrian; thread writer menulis
+    semua snapshot yang menumpuk dalam satu transaksi sehingga siklus
+    polling tidak menunggu disk.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        :param path: Lokasi file SQLite.
+        :param max_pending: Jumlah batch maksimum di antrian writer; batch baru dibuang jika penuh.
+        """
+        self.path = path
+        self.dropped = 0
+        self.written_rows = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._address_ids = {}
+        self._coin_ids = {}
+
+        conn = self._connect()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.close()
+
+        self._reader = self._connect()
+        self._reader_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, positions_by_address: dict, ts: float = None) -> bool:
+        """
+        Menjadwalkan penulisan snapshot posisi satu siklus (tidak memblokir).
+
+        :param positions_by_address: Dict alamat -> dict coin -> Position.
+        :param ts: Timestamp UNIX siklus (default sekarang).
+        :return: True jika masuk antrian, False jika antrian penuh.
+        """
+        try:
+            self._queue.put_nowait((ts if ts is not None else time.time(), positions_by_address))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logging.warning("Antrian history penuh, snapshot siklus dibuang.")
+            return False
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """
+        Menunggu sampai semua snapshot di antrian tertulis.
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _intern(self, conn, table: str, column: str, cache: dict, value: str) -> int:
+        value_id = cache.get(value)
+        if value_id is None:
+            conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+            value_id = conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+            cache[value] = value_id
+        return value_id
+
+    def _run(self) -> None:
+        conn = self._connect()
+        while True:
+            batches = [self._queue.get()]
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                conn.execute("BEGIN")
+                rows = []
+                for ts, positions_by_address in batches:
+                    for address, positions in positions_by_address.items():
+                        address_id = self._intern(conn, "addresses", "address", self._address_ids, address)
+                        for coin, p in positions.items():
+                            coin_id = self._intern(conn, "coins", "coin", self._coin_ids, coin)
+                            rows.append((address_id, coin_id, ts, p.size, p.leverage, p.entry_price,
+                                         p.position_value, p.unrealized_pnl, p.liquidation_price))
+                conn.executemany("INSERT OR REPLACE INTO position_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+                self.written_rows += len(rows)
+            except sqlite3.Error as e:
+                # ROLLBACK sendiri gagal jika BEGIN tidak pernah berhasil
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                # ID yang di-intern dalam transaksi ini ikut dibatalkan; cache dibangun ulang dari tabel
+                self._address_ids.clear()
+                self._coin_ids.clear()
+                logging.error(f"Gagal menulis history posisi: {e}")
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def query(self, address: str, coin: str, since: float, until: float = None) -> list:
+        """
+        Mengambil riwayat posisi satu alamat dan coin dalam rentang waktu.
+
+        :param address: Alamat pengguna.
+        :param coin: Simbol coin.
+        :param since: Timestamp UNIX awal (inklusif).
+        :param until: Timestamp UNIX akhir (inklusif, default sekarang).
+        :return: List tuple (ts, size, leverage, entry_price, position_value, unrealized_pnl) urut waktu.
+        """
+        until = until if until is not None else time.time()
+        with self._reader_lock:
+            return self._reader.execute(
+                "SELECT h.ts, h.size, h.leverage, h.entry_price, h.position_value, h.unrealized_pnl "
+                "FROM position_history h "
+                "WHERE h.address_id = (SELECT id FROM addresses WHERE address = ?) "
+                "AND h.coin_id = (SELECT id FROM coins WHERE coin = ?) "
+                "AND h.ts BETWEEN ? AND ? ORDER BY h.ts",
+                (address, coin, since, until),
+            ).fetchall()
+
+    def pnl_summary(self, address: str, coin: str, hours: float = 24.0) -> dict | None:
+        """
+        Ringkasan unrealized PnL satu alamat dan coin selama `hours` jam terakhir.
+
+        :return: Dict berisi first, last, change, min, max, samples; None jika tidak ada data.
+        """
+        rows = self.query(address, coin, time.time() - hours * 3600)
+        if not rows:
+            return None
+        pnls = [row[5] for row in rows]
+        return {
+            "first": pnls[0],
+            "last": pnls[-1],
+            "change": pnls[-1] - pnls[0],
+            "min": min(pnls),
+            "max": max(pnls),
+            "samples": len(pnls),
+            "since": rows[0][0],
+        }
@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from .misc import DEFAULT_HEADERS
+
+# Ukuran pool koneksi keep-alive per host
+DEFAULT_POOL_SIZE = 32
+# Timeout (connect, read) dalam detik
+DEFAULT_TIMEOUT = (5.0, 10.0)
+
+class _Http2Response:
+    """
+    Pembungkus respons httpx agar antarmukanya sama dengan requests.Response.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content
+        self.url = str(response.url)
+        self.num_bytes_downloaded = response.num_bytes_downloaded
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+class HttpClient:
+    """
+    Klien HTTP bersama dengan connection pooling dan keep-alive.
+
+    Header default dibuat sekali per sesi, dan `Accept-Encoding` hanya
+    mengiklankan kompresi yang benar-benar bisa didekode di lingkungan ini
+    (gzip/deflate, ditambah br/zstd jika paket brotli/zstandard terpasang).
+    HTTP/2 bersifat opsional dan memakai httpx jika tersedia.
+    """
+
+    def __init__(self, headers: dict = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: tuple = DEFAULT_TIMEOUT, http2: bool = False):
+        self.base_headers = dict(headers or {})
+        self.requests_count = 0
+        self.errors_count = 0
+        self.bytes_wire = 0
+        self.bytes_decoded = 0
+        self.total_latency = 0.0
+        self._stats_lock = threading.Lock()
+        self._session = None
+        self._http2_client = None
+        self.configure(pool_size=pool_size, timeout=timeout, http2=http2)
+
+    def configure(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: tuple = DEFAULT_TIMEOUT,
+                  http2: bool = False) -> None:
+        """
+        Membangun ulang sesi dengan ukuran pool, timeout, dan mode HTTP yang baru.
+
+        :param pool_size: Jumlah koneksi keep-alive per host.
+        :param timeout: Timeout (connect, read) dalam detik.
+        :param http2: True untuk mencoba HTTP/2 (membutuhkan httpx[http2]).
+        """
+        self.close()
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        headers = dict(self.base_headers)
+        headers['Accept-Encoding'] = ACCEPT_ENCODING
+        headers['Connection'] = 'keep-alive'
+
+        self.http2 = False
+        if http2:
+            try:
+                import httpx
+                limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+                self._http2_client = httpx.Client(http2=True, headers=headers, limits=limits,
+                                                  timeout=httpx.Timeout(timeout[1], connect=timeout[0]))
+                self.http2 = True
+            except ImportError:
+                logging.warning("httpx[http2] tidak terpasang, kembali ke HTTP/1.1 keep-alive.")
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.clear()
+        session.headers.update(headers)
+        self._session = session
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._http2_client is not None:
+            self._http2_client.close()
+            self._http2_client = None
+
+    def _record(self, latency: float, response=None, error: bool = False) -> None:
+        with self._stats_lock:
+            self.requests_count += 1
+            self.total_latency += latency
+            if error:
+                self.errors_count += 1
+            if response is not None:
+                decoded = len(response.content)
+                self.bytes_decoded += decoded
+                raw = getattr(response, 'raw', None)
+                if hasattr(response, 'num_bytes_downloaded'):
+                    self.bytes_wire += response.num_bytes_downloaded
+                elif raw is not None and hasattr(raw, 'tell'):
+                    # urllib3 menghitung byte yang benar-benar dibaca dari socket (sebelum dekompresi)
+                    self.bytes_wire += raw.tell()
+                else:
+                    self.bytes_wire += decoded
+
+    def request(self, method: str, url: str, timeout=None, **kwargs):
+        """
+        Mengirim request lewat pool koneksi bersama.
+
+        :param method: Metode HTTP ("GET", "POST").
+        :param url: URL tujuan.
+        :param timeout: Override timeout untuk request ini (opsional).
+        :param kwargs: Diteruskan ke requests; `stream=True` selalu lewat HTTP/1.1 dan body dibaca dengan iter_content().
+        :return: Objek respons dengan antarmuka requests.Response.
+        :raises requests.exceptions.RequestException: Jika request gagal di level jaringan.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        stream = kwargs.get('stream', False)
+        start_time = time.perf_counter()
+        try:
+            if self.http2 and not stream:
+                import httpx
+                try:
+                    response = _Http2Response(self._http2_client.request(method, url, timeout=timeout, **kwargs))
+                except httpx.HTTPError as e:
+                    raise requests.exceptions.ConnectionError(str(e))
+            else:
+                response = self._session.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(time.perf_counter() - start_time, error=True)
+            raise
+        # Body respons streaming dibaca sendiri oleh pemanggil, jadi ukurannya tidak dicatat di sini
+        self._record(time.perf_counter() - start_time, None if stream else response)
+        return response
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict berisi jumlah request, error, byte di jaringan vs setelah dekode, dan latensi rata-rata.
+        """
+        with self._stats_lock:
+            count = self.requests_count
+            return {
+                "requests": count,
+                "errors": self.errors_count,
+                "bytes_wire": self.bytes_wire,
+                "bytes_decoded": self.bytes_decoded,
+                "avg_latency_ms": (self.total_latency / count * 1000) if count else 0.0,
+                "http2": self.http2,
+            }
+
+# Klien untuk API Hyperliquid (dengan header browser) dan untuk Telegram Bot API
+api_client = HttpClient(headers=DEFAULT_HEADERS)
+telegram_client = HttpClient()
+
+def configure_clients(config) -> None:
+    """
+    Menerapkan pengaturan bagian [http] dari config.ini ke semua klien.
+
+    :param config: Objek ConfigParser.
+    """
+    pool_size = config.getint('http', 'pool_size', fallback=DEFAULT_POOL_SIZE)
+    timeout = (
+        config.getfloat('http', 'connect_timeout', fallback=DEFAULT_TIMEOUT[0]),
+        config.getfloat('http', 'read_timeout', fallback=DEFAULT_TIMEOUT[1]),
+    )
+    http2 = config.getboolean('http', 'http2', fallback=False)
+    api_client.configure(pool_size=pool_size, timeout=timeout, http2=http2)
+    telegram_client.configure(pool_size=pool_size, timeout=timeout, http2=http2)
@@ -0,0 +1,188 @@
+import requests
+import logging
+import time
+from .misc import get_json
+from .markprice import MarkPriceCache
+from .http_client import api_client
+from .codec import dumps, decode_response, extract_tracker_position, extract_full_position, extract_margin_summary
+from .metrics import API_LATENCY, API_RESPONSES, API_ERRORS
+from .singleflight import SingleFlight
+from .ratelimit import RateGovernor
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO)
+
+API_URL = "https://api.hyperliquid.xyz/info"
+
+# Weight per request /info sesuai dokumentasi rate limit Hyperliquid (1200 weight per menit per IP)
+INFO_WEIGHTS = {
+    "clearinghouseState": 2,
+    "allMids": 2,
+    "l2Book": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "metaAndAssetCtxs": 20,
+}
+
+# Semua request /info melewati satu governor: budget weight, retry 429/5xx, circuit breaker per endpoint
+api_governor = RateGovernor(weight_per_minute=1200, weights=INFO_WEIGHTS)
+
+# Perekam respons mentah (recorder.ResponseRecorder), diisi main.py jika [recorder] diaktifkan
+response_recorder = None
+
+def _send_info(endpoint: str, body: bytes):
+    start_time = time.perf_counter()
+    try:
+        response = api_client.post(API_URL, data=body)
+    except requests.exceptions.RequestException:
+        API_ERRORS.labels(endpoint).inc()
+        raise
+    finally:
+        API_LATENCY.labels(endpoint).observe(time.perf_counter() - start_time)
+    API_RESPONSES.labels(endpoint, response.status_code).inc()
+    return response
+
+def _post_info(payload: dict):
+    """
+    Mengirim payload ke endpoint /info lewat pool koneksi bersama dan api_governor.
+    
+    :param payload: Payload JSON request.
+    :return: Objek respons.
+    :raises requests.exceptions.RequestException: Error jaringan, atau CircuitOpenError jika endpoint sedang diistirahatkan.
+    """
+    endpoint = payload.get("type", "unknown")
+    body = dumps(payload)
+    response = api_governor.call(endpoint, lambda: _send_info(endpoint, body))
+    if response_recorder is not None and response.status_code == 200:
+        response_recorder.record(endpoint, payload.get("user"), response.content)
+    return response
+
+def get_meta_and_asset_ctxs() -> list | str:
+    """
+    Mengunduh seluruh universe `metaAndAssetCtxs` dari Hyperliquid API.
+    
+    :return: List [meta, assetCtxs] atau pesan kesalahan jika gagal.
+    """
+    payload = {"type": "metaAndAssetCtxs"}  # Tidak perlu get_json karena tidak ada user_address
+    
+    try:
+        logging.debug("Fetching metaAndAssetCtxs")
+        response = _post_info(payload)
+        response.raise_for_status()
+        return decode_response(response)
+
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching metaAndAssetCtxs: {e}")
+        return f"Error occurred while fetching mark price: {e}"
+    except ValueError as e:
+        logging.error(f"Invalid metaAndAssetCtxs response: {e}")
+        return f"Error occurred while fetching mark price: {e}"
+
+# Cache bersama untuk mark price; semua notifikasi posisi ditutup membaca dari sini
+mark_price_cache = MarkPriceCache(get_meta_and_asset_ctxs)
+
+def get_markprice(symbol: str) -> str:
+    """
+    Mendapatkan harga mark (mark price) dari cache snapshot metaAndAssetCtxs.
+    
+    :param symbol: Simbol trading (misalnya, BTC, ETH).
+    :return: Harga mark atau pesan kesalahan jika gagal.
+    """
+    return mark_price_cache.get(symbol)
+
+# Request clearinghouseState yang sama (tipe, alamat) digabung dan hasilnya dipakai ulang sebentar
+clearinghouse_flight = SingleFlight()
+
+def _fetch_clearinghouse_state(payload: dict) -> dict:
+    """
+    Mengambil clearinghouseState mentah lewat single-flight; get_position dan
+    get_leaderboard_base_info hanyalah tampilan berbeda atas snapshot ini.
+
+    :param payload: Payload dari get_json.
+    :return: Dict clearinghouseState yang sudah didekode (jangan diubah, dipakai bersama).
+    :raises requests.exceptions.RequestException: Jika request gagal.
+    :raises ValueError: Jika respons bukan JSON yang valid.
+    """
+    def fetch():
+        response = _post_info(payload)
+        response.raise_for_status()
+        data = decode_response(response)
+        # Format lazy: payload mentah hanya diformat jika level DEBUG aktif
+        logging.debug("Raw API response for %s: %s", payload["user"], data)
+        return data
+
+    return clearinghouse_flight.do((payload["type"], payload["user"]), fetch)
+
+def forget_clearinghouse_state(user_address: str) -> None:
+    """
+    Membuang snapshot clearinghouseState alamat dari cache single-flight
+    (misalnya setelah fill baru, agar rekonsiliasi tidak menerima snapshot sebelum fill).
+    """
+    payload = get_json(user_address)
+    clearinghouse_flight.forget((payload["type"], payload["user"]))
+
+def get_position(user_address: str) -> list | str:
+    """
+    Mendapatkan posisi trading dari Hyperliquid API.
+    
+    :param user_address: Alamat pengguna.
+    :return: List posisi trading atau pesan kesalahan jika gagal.
+    """
+    payload = get_json(user_address)
+    
+    try:
+        logging.debug("Fetching positions for %s", user_address)
+        data = _fetch_clearinghouse_state(payload)
+
+        position_data = [extract_full_position(p.get("position") or {}) for p in data.get("assetPositions", [])]
+
+        logging.debug("Found %d positions for %s", len(position_data), user_address)
+        return position_data
+
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching positions for {user_address}: {e}")
+        return f"Error occurred while fetching positions: {e}"
+    except ValueError as e:
+        logging.error(f"Data conversion error for {user_address}: {e}")
+        return f"Error in data conversion: {e}"
+
+def parse_clearinghouse_state(user_address: str, data: dict) -> dict:
+    """
+    Mengubah respons `clearinghouseState` (REST atau websocket) menjadi informasi trader.
+    
+    :param user_address: Alamat pengguna.
+    :param data: Objek clearinghouseState mentah.
+    :return: Dict informasi trader.
+    """
+    leaderboard_info = extract_margin_summary(data)
+    leaderboard_info["user_address"] = user_address
+    leaderboard_info["profile_url"] = f"https://hyperdash.info/trader/{user_address}"
+    # Hanya field yang dipakai tracker yang diekstrak (skema terkompilasi di codec.py)
+    leaderboard_info["positions"] = [extract_tracker_position(p.get("position") or {}) for p in data.get("assetPositions", [])]
+    return leaderboard_info
+
+def get_leaderboard_base_info(user_address: str) -> dict | str:
+    """
+    Mendapatkan informasi dasar tentang trader dari Hyperliquid API.
+    
+    :param user_address: Alamat pengguna.
+    :return: Dict informasi trader atau pesan kesalahan jika gagal.
+    """
+    payload = get_json(user_address)
+    
+    try:
+        logging.info("Fetching leaderboard data for %s", user_address)
+        data = _fetch_clearinghouse_state(payload)
+
+        leaderboard_info = parse_clearinghouse_state(user_address, data)
+
+        logging.info("Successfully processed leaderboard info for %s", user_address)
+        return leaderboard_info
+
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching leaderboard info for {user_address}: {e}")
+        return f"Error occurred while fetching leaderboard info: {e}"
+    except ValueError as e:
+        logging.error(f"Invalid clearinghouseState response for {user_address}: {e}")
+        return f"Error occurred while fetching leaderboard info: {e}"
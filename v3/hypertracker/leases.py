@@ -0,0 +1,183 @@
+import logging
+import math
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from .sharding import shard_for
+
+DEFAULT_LEASE_PATH = 'cluster_leases.db'
+DEFAULT_PARTITIONS = 64
+DEFAULT_LEASE_TTL = 30.0
+
+class LeaseTable:
+    """
+    Pembagian kerja antar node lewat tabel lease bersama (file SQLite di storage bersama).
+
+    Alamat dipetakan ke partisi dengan hash stabil. Setiap node memperbarui
+    heartbeat dan lease partisinya secara berkala, mengambil partisi yang
+    lease-nya kedaluwarsa sampai jatah adilnya, dan melepas kelebihan agar
+    node baru mendapat bagian. Lease hanya dianggap sah secara lokal sampai
+    sebelum kedaluwarsa, sehingga satu partisi tidak pernah di-poll dua node.
+
+    File memakai rollback journal (bukan WAL): WAL membutuhkan shared memory
+    lokal dan tidak bekerja di filesystem jaringan. Storage bersama harus
+    mendukung byte-range lock POSIX yang benar (misalnya NFSv4 dengan lock
+    aktif); tanpa itu dua node bisa memegang partisi yang sama.
+
+    Kedaluwarsa dibandingkan dengan jam masing-masing node (SQLite tidak punya
+    jam server), jadi jam semua node harus tersinkron (NTP). Selisih jam harus
+    jauh di bawah margin keamanan 20% dari `lease_ttl` yang disisakan oleh
+    lease lokal; selisih lebih besar bisa membuat dua node aktif bersamaan.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEASE_PATH, node_id: str = None,
+                 partitions: int = DEFAULT_PARTITIONS, lease_ttl: float = DEFAULT_LEASE_TTL):
+        """
+        :param path: Lokasi file SQLite bersama.
+        :param node_id: ID unik node (default hostname + acak).
+        :param partitions: Jumlah partisi alamat (harus sama di semua node).
+        :param lease_ttl: Lama lease dalam detik; node mati diambil alih dalam satu periode ini.
+        """
+        self.path = path
+        self.node_id = node_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.partitions = partitions
+        self.lease_ttl = lease_ttl
+        self.owned = frozenset()
+        self._valid_until = 0.0
+        self._lock = threading.Lock()
+        # Dipegang pemroses hasil saat memeriksa kepemilikan dan mengirim notifikasi; partisi
+        # hanya dilepas setelah pemrosesan yang sedang berjalan untuk partisi itu selesai
+        self.handoff_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=lease_ttl / 3)
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS leases (partition INTEGER PRIMARY KEY, node TEXT, expires_at REAL NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS nodes (node TEXT PRIMARY KEY, heartbeat REAL NOT NULL)")
+        self._conn.executemany("INSERT OR IGNORE INTO leases (partition, node, expires_at) VALUES (?, NULL, 0)",
+                               [(p,) for p in range(partitions)])
+
+    def renew(self, now: float = None, on_change=None) -> tuple:
+        """
+        Memperbarui heartbeat dan lease dalam satu transaksi.
+
+        :param now: Waktu UNIX sekarang (opsional).
+        :param on_change: Callback (acquired, lost) yang dipanggil sebelum partisi baru mulai dipakai.
+        :return: Tuple (partisi yang baru didapat, partisi yang dilepas/hilang).
+        """
+        now = now if now is not None else time.time()
+        expires_at = now + self.lease_ttl
+        with self._lock:
+            previous = self.owned if time.time() < self._valid_until else frozenset()
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("INSERT INTO nodes (node, heartbeat) VALUES (?, ?) "
+                                   "ON CONFLICT(node) DO UPDATE SET heartbeat = excluded.heartbeat", (self.node_id, now))
+                live_nodes = self._conn.execute("SELECT COUNT(*) FROM nodes WHERE heartbeat > ?",
+                                                (now - self.lease_ttl,)).fetchone()[0]
+                fair_share = math.ceil(self.partitions / max(1, live_nodes))
+
+                mine = [row[0] for row in self._conn.execute(
+                    "SELECT partition FROM leases WHERE node = ? AND expires_at > ? ORDER BY partition",
+                    (self.node_id, now))]
+                # Kelebihan jatah dilepas langsung (expires_at = 0) supaya node lain bisa segera mengambilnya
+                excess = mine[fair_share:]
+                mine = mine[:fair_share]
+                if excess:
+                    # Berhenti memakai partisi ini sebelum lease-nya dilepas
+                    with self.handoff_lock:
+                        self.owned = self.owned - frozenset(excess)
+                    self._conn.executemany("UPDATE leases SET node = NULL, expires_at = 0 WHERE partition = ? AND node = ?",
+                                           [(p, self.node_id) for p in excess])
+                if len(mine) < fair_share:
+                    free = [row[0] for row in self._conn.execute(
+                        "SELECT partition FROM leases WHERE expires_at <= ? ORDER BY partition LIMIT ?",
+                        (now, fair_share - len(mine)))]
+                    mine.extend(free)
+                self._conn.executemany("UPDATE leases SET node = ?, expires_at = ? WHERE partition = ?",
+                                       [(self.node_id, expires_at, p) for p in mine])
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                try:
+                    self._conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                logging.error(f"Gagal memperbarui lease {self.path}: {e}")
+                return frozenset(), frozenset()
+
+            owned = frozenset(mine)
+            acquired, lost = owned - previous, previous - owned
+            with self.handoff_lock:
+                self.owned = self.owned - lost
+            # Sisakan margin agar lease lokal berakhir sebelum node lain boleh mengambilnya
+            self._valid_until = now + self.lease_ttl * 0.8
+            if (acquired or lost) and on_change is not None:
+                try:
+                    on_change(acquired, lost)
+                except Exception as e:
+                    logging.error(f"Error di callback lease: {e}")
+            self.owned = owned
+        return acquired, lost
+
+    def is_valid(self) -> bool:
+        """
+        :return: True jika lease lokal masih sah (belum melewati margin kedaluwarsa).
+        """
+        return time.time() < self._valid_until
+
+    def owns(self, user_address: str) -> bool:
+        """
+        :return: True jika node ini memegang lease sah untuk partisi alamat tersebut.
+        """
+        return time.time() < self._valid_until and shard_for(user_address, self.partitions) in self.owned
+
+    def filter(self, addresses) -> list:
+        """
+        :return: Alamat yang menjadi tanggung jawab node ini.
+        """
+        if time.time() >= self._valid_until:
+            return []
+        owned = self.owned
+        return [a for a in addresses if shard_for(a, self.partitions) in owned]
+
+    def start(self, on_change=None) -> None:
+        """
+        Memperbarui lease di thread daemon setiap sepertiga TTL.
+
+        :param on_change: Callback (acquired, lost) saat kepemilikan partisi berubah.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+
+        def run():
+            while self._running:
+                self.renew(on_change=on_change)
+                time.sleep(self.lease_ttl / 3)
+
+        self._thread = threading.Thread(target=run, name="lease-renewer", daemon=True)
+        self._thread.start()
+
+    def release_all(self) -> None:
+        """
+        Melepas semua lease dan heartbeat node ini (dipanggil saat shutdown bersih).
+        """
+        self._running = False
+        with self._lock:
+            self._conn.execute("UPDATE leases SET node = NULL, expires_at = 0 WHERE node = ?", (self.node_id,))
+            self._conn.execute("DELETE FROM nodes WHERE node = ?", (self.node_id,))
+            self.owned = frozenset()
+            self._valid_until = 0.0
+
+    def stats(self) -> dict:
+        """
+        :return: Dict ID node, jumlah partisi yang dipegang, dan sisa masa lease lokal.
+        """
+        return {
+            "node": self.node_id,
+            "partitions": len(self.owned),
+            "valid_for": max(0.0, self._valid_until - time.time()),
+        }
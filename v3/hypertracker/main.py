@@ -0,0 +1,670 @@
+import atexit
+import time
+import datetime
+import logging
+import threading
+import os
+from contextlib import nullcontext
+from . import hyperliquid
+from .message import dispatcher, process_telegram_updates, load_config, DEFAULT_CONFIG_PATH
+from .hyperliquid import (get_leaderboard_base_info, get_markprice, mark_price_cache, clearinghouse_flight, api_governor,
+                         forget_clearinghouse_state)
+from .poller import poll_addresses, DEFAULT_CONCURRENCY
+from .scheduler import AdaptiveScheduler, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL, DEFAULT_BASE_INTERVAL, DEFAULT_BUDGET_PER_MINUTE
+from .positions import modify_data, diff_positions, OPENED, CLOSED
+from .alerts import (render_new_position_message, render_closed_position_message,
+                    render_position_changed_message, render_current_positions)
+from .state_store import StateStore, DEFAULT_STATE_PATH
+from .position_store import PositionStateStore
+from .outage import OutageTracker, DEFAULT_RECOVERY_AFTER, DEFAULT_FAILURE_RATIO, DEFAULT_MIN_ADDRESSES
+from .digest import DigestBuffer, DEFAULT_FLUSH_WINDOW
+from . import codec
+from .http_client import configure_clients, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from .metrics import (start_http_server, ALERTS, CYCLE_DURATION, CYCLE_ADDRESSES, ADDRESSES_PROCESSED, STARTUP_DURATION,
+                     TELEGRAM_QUEUE, MARKPRICE_CACHE, MARKPRICE_HIT_RATIO, COALESCED_REQUESTS, RECORDER_RECORDS, STATE_BYTES_PER_ADDRESS, DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT)
+from .shared import address_registry
+from . import shared
+
+# Modul ini aman diimpor: konfigurasi, thread background, dan loop pemantauan baru
+# dijalankan oleh run(). Dependensi berat (NumPy, websocket, multiprocessing, lease
+# SQLite) hanya diimpor oleh mode yang memakainya.
+
+config = None
+POLL_CONCURRENCY = DEFAULT_CONCURRENCY
+MONITOR_MODE = 'poll'
+STATE_CHECKPOINT_INTERVAL = 5.0
+scheduler = None
+shard_manager = None
+state_store = None
+lease_table = None
+digest = None
+outage_tracker = None
+
+# Posisi terakhir per alamat; alamat yang belum punya state berarti siklus pertama
+previous_positions = PositionStateStore()
+shared.position_states = previous_positions
+dirty_addresses = set()
+state_lock = threading.Lock()
+# Menyerialkan perubahan state per alamat (pemrosesan hasil poll, penghapusan alamat, perubahan lease)
+# agar pengecekan keanggotaan, agregat eksposur, dan state selalu diperbarui bersama
+handle_lock = threading.Lock()
+offset = None
+
+# Waktu run() dimulai, untuk mengukur lama startup sampai siklus pertama selesai
+_started_at = None
+
+def record_first_cycle() -> None:
+    global _started_at
+    if _started_at is None:
+        return
+    startup = time.perf_counter() - _started_at
+    _started_at = None
+    STARTUP_DURATION.set(startup)
+    logging.info(f"Siklus pertama selesai {startup * 1000:.0f}ms setelah start")
+
+def start_sharding(shard_count: int, recorder_settings: dict = None) -> None:
+    """
+    Membuat dan menjalankan worker mode sharded (dipanggil sebelum thread lain dijalankan).
+
+    :param shard_count: Jumlah worker.
+    :param recorder_settings: Pengaturan ResponseRecorder untuk worker (None = tidak merekam).
+    """
+    global shard_manager
+    from .sharding import ShardManager
+    shard_manager = ShardManager(shard_count, {
+        'api_url': hyperliquid.API_URL,
+        'concurrency': POLL_CONCURRENCY,
+        'http': {
+            'pool_size': config.getint('http', 'pool_size', fallback=DEFAULT_POOL_SIZE),
+            'timeout': (
+                config.getfloat('http', 'connect_timeout', fallback=DEFAULT_TIMEOUT[0]),
+                config.getfloat('http', 'read_timeout', fallback=DEFAULT_TIMEOUT[1]),
+            ),
+            'http2': config.getboolean('http', 'http2', fallback=False),
+        },
+        'scheduler': {
+            'min_interval': scheduler.min_interval,
+            'max_interval': scheduler.max_interval,
+            'base_interval': scheduler.base_interval,
+            # Anggaran request global dibagi rata ke semua worker
+            'budget_per_minute': scheduler.budget.rate * 60 / shard_count,
+        },
+        # Budget weight API dibagi antara worker dan proses utama (cache mark price, perintah Telegram)
+        'ratelimit': {
+            'weight_per_minute': api_governor.bucket.rate * 60 / (shard_count + 1),
+            'max_retries': api_governor.max_retries,
+            'failure_threshold': api_governor.failure_threshold,
+            'reset_timeout': api_governor.reset_timeout,
+        },
+        'recorder': recorder_settings,
+    })
+    shard_manager.start()
+    api_governor.configure(api_governor.bucket.rate * 60 / (shard_count + 1))
+
+def on_lease_change(acquired, lost):
+    """
+    Memuat state partisi yang baru diambil alih dari state store bersama dan
+    membuang state partisi yang dilepas agar tidak basi saat diambil lagi.
+    """
+    from .sharding import shard_for
+    addresses = address_registry.snapshot()
+    with handle_lock:
+        previous_positions.discard_many([address for address in addresses if shard_for(address, lease_table.partitions) in lost])
+        gained = [address for address in addresses if shard_for(address, lease_table.partitions) in acquired]
+        restored = state_store.load_into(previous_positions, gained) if gained else 0
+        shared.exposure_tracker.rebuild(previous_positions)
+    logging.info(f"Lease berubah: +{len(acquired)} / -{len(lost)} partisi, state {restored} alamat dipulihkan")
+
+def restore_state() -> int:
+    """
+    Memuat state terakhir untuk alamat yang masih ada di registry (mode non-cluster).
+    Alamat yang dihapus selagi bot mati tidak ikut dipulihkan.
+
+    :return: Jumlah alamat yang dipulihkan.
+    """
+    with handle_lock:
+        restored = state_store.load_into(previous_positions, address_registry.snapshot())
+        shared.exposure_tracker.rebuild(previous_positions)
+    return restored
+
+def start_cluster() -> None:
+    """
+    Mode cluster: beberapa host berbagi partisi alamat lewat tabel lease di storage bersama.
+    """
+    global lease_table
+    from .leases import LeaseTable, DEFAULT_LEASE_PATH, DEFAULT_PARTITIONS, DEFAULT_LEASE_TTL
+    lease_table = LeaseTable(
+        config.get('cluster', 'path', fallback=DEFAULT_LEASE_PATH),
+        node_id=config.get('cluster', 'node_id', fallback=None),
+        partitions=config.getint('cluster', 'partitions', fallback=DEFAULT_PARTITIONS),
+        lease_ttl=config.getfloat('cluster', 'lease_ttl', fallback=DEFAULT_LEASE_TTL),
+    )
+    # Renew pertama memuat state partisi yang didapat lewat on_lease_change; partisi node lain tidak pernah dimuat
+    lease_table.renew(on_change=on_lease_change)
+    lease_table.start(on_lease_change)
+    logging.info(f"Node cluster {lease_table.node_id} memegang {len(lease_table.owned)} partisi")
+
+def start_discovery() -> None:
+    """
+    Menjalankan sinkronisasi berkala daftar alamat dengan trader teratas leaderboard (thread daemon).
+    """
+    from .discovery import LeaderboardDiscovery, LEADERBOARD_URL, DEFAULT_TOP_N, DEFAULT_METRIC, DEFAULT_INTERVAL, DEFAULT_DISCOVERY_STATE_PATH
+    discovery = LeaderboardDiscovery(
+        address_registry,
+        url=config.get('discovery', 'url', fallback=LEADERBOARD_URL),
+        top_n=config.getint('discovery', 'top_n', fallback=DEFAULT_TOP_N),
+        metric=config.get('discovery', 'metric', fallback=DEFAULT_METRIC),
+        min_account_value=config.getfloat('discovery', 'min_account_value', fallback=0.0),
+        state_path=config.get('discovery', 'state_path', fallback=DEFAULT_DISCOVERY_STATE_PATH),
+        # Alamat yang dipin admin tidak dihapus walaupun keluar dari peringkat
+        protected=lambda: set(shared.pinned_addresses),
+    )
+    interval = config.getfloat('discovery', 'interval', fallback=DEFAULT_INTERVAL)
+
+    def discovery_loop():
+        while True:
+            try:
+                result = discovery.sync()
+                if result['added'] or result['removed']:
+                    dispatcher.enqueue(
+                        f"🔎 Leaderboard discovery ({discovery.metric}, top {discovery.top_n}): "
+                        f"+{len(result['added'])} / -{len(result['removed'])} alamat"
+                    )
+            except Exception as e:
+                logging.error(f"Leaderboard discovery gagal: {e}")
+            time.sleep(interval)
+
+    threading.Thread(target=discovery_loop, name="leaderboard-discovery", daemon=True).start()
+
+_tracked_key = None
+_tracked = ()
+
+def tracked_addresses():
+    """
+    :return: Alamat yang dipantau oleh proses ini (semua alamat, atau hanya partisi milik node ini di mode cluster).
+    """
+    global _tracked_key, _tracked
+    addresses = address_registry.snapshot()
+    if lease_table is None:
+        return addresses
+    # Hasil filter di-cache selama daftar alamat dan lease tidak berubah, agar pembaca bisa membandingkan identitas
+    key = (address_registry.version, lease_table.owned, lease_table.is_valid())
+    if key != _tracked_key:
+        _tracked_key, _tracked = key, tuple(lease_table.filter(addresses))
+    return _tracked
+
+def evict_addresses(addresses):
+    """
+    Hook penghapusan registry: membuang state alamat dari memori, antrian checkpoint, dan state store.
+    """
+    with handle_lock:
+        for address in addresses:
+            shared.exposure_tracker.update(previous_positions.get(address), None)
+        previous_positions.discard_many(addresses)
+        with state_lock:
+            dirty_addresses.difference_update(addresses)
+    if state_store is not None:
+        state_store.delete(addresses)
+    logging.info(f"State {len(addresses)} alamat yang dihapus dibuang | {previous_positions.stats()['bytes_per_address']:.0f} B/alamat")
+
+def notify(user_address, text):
+    """
+    :param text: Teks notifikasi; tanpa header alamat jika mode digest aktif (lihat with_header()).
+    """
+    if digest is not None:
+        digest.add(user_address, text)
+    else:
+        dispatcher.enqueue(text)
+
+def with_header() -> bool:
+    # Mode digest menulis header alamat sekali per kelompok notifikasi
+    return digest is None
+
+def flush_notifications():
+    if digest is not None:
+        digest.flush()
+    outage_tracker.flush()
+
+def send_new_position_message(symbol, position, user_address):
+    ALERTS.labels(OPENED).inc()
+    notify(user_address, render_new_position_message(symbol, position, user_address, with_header()))
+
+def send_closed_position_message(symbol, position, user_address):
+    ALERTS.labels(CLOSED).inc()
+    notify(user_address, render_closed_position_message(symbol, position, user_address, get_markprice(symbol), with_header()))
+
+def send_position_changed_message(event, user_address):
+    ALERTS.labels(event.kind).inc()
+    notify(user_address, render_position_changed_message(event, user_address, with_header()))
+
+def send_current_positions(positions, user_address):
+    ALERTS.labels('current').inc()
+    notify(user_address, render_current_positions(positions, user_address, with_header()))
+
+def telegram_polling():
+    global offset
+    while True:
+        try:
+            offset = process_telegram_updates(offset)
+            time.sleep(1)
+        except Exception as e:
+            logging.error(f"Error di thread Telegram polling: {e}")
+            time.sleep(10)
+
+def report_fetch_error(user_address, error):
+    logging.error(f"Error untuk alamat {user_address}: {error}")
+    outage_tracker.record_error(user_address, error)
+
+def handle_positions(user_address, positions, events=None):
+    """
+    Mengirim notifikasi untuk posisi terbaru satu alamat dan menyimpannya sebagai state.
+
+    :param user_address: Alamat pengguna.
+    :param positions: Dict coin -> Position siklus ini.
+    :param events: Event yang sudah dihitung (misalnya dari diff PositionTable); jika None dihitung di sini.
+    :return: List event yang dilaporkan (kosong pada siklus pertama).
+    """
+    outage_tracker.record_success()
+    # Di mode cluster partisi tidak dilepas selama notifikasi dan state alamat ini sedang diproses
+    handoff = lease_table.handoff_lock if lease_table is not None else nullcontext()
+    with handle_lock, handoff:
+        if user_address not in address_registry:
+            # Dihapus saat siklus berjalan; jangan hidupkan lagi state yang sudah dibuang
+            return []
+        if lease_table is not None and not lease_table.owns(user_address):
+            # Partisi dilepas atau lease habis saat siklus berjalan; node pemilik baru yang melaporkannya
+            return []
+
+        previous = previous_positions.get(user_address)
+        if previous is None:
+            send_current_positions(positions, user_address)
+            events = []
+        else:
+            if events is None:
+                events = diff_positions(previous, positions)
+            for event in events:
+                if event.kind == OPENED:
+                    send_new_position_message(event.coin, event.current, user_address)
+                elif event.kind == CLOSED:
+                    send_closed_position_message(event.coin, event.previous, user_address)
+                else:
+                    send_position_changed_message(event, user_address)
+
+        # Agregat eksposur hanya menerapkan posisi yang berubah (O(perubahan))
+        shared.exposure_tracker.update(previous, positions)
+        previous_positions[user_address] = positions
+        with state_lock:
+            dirty_addresses.add(user_address)
+    return events
+
+def checkpoint_state():
+    """
+    Menyimpan state alamat yang berubah sejak checkpoint terakhir ke disk.
+    Jika penyimpanan gagal, alamat dikembalikan ke antrian dirty untuk checkpoint berikutnya.
+    """
+    global dirty_addresses
+    with state_lock:
+        addresses, dirty_addresses = dirty_addresses, set()
+    if not state_store.save({address: previous_positions[address] for address in addresses if address in previous_positions}):
+        with state_lock:
+            dirty_addresses |= addresses
+
+def process_address(user_address, leaderboard_info):
+    """
+    Membandingkan posisi terbaru dengan siklus sebelumnya dan mengirim notifikasi.
+
+    :param user_address: Alamat pengguna.
+    :param leaderboard_info: Hasil get_leaderboard_base_info (dict atau pesan error).
+    """
+    if isinstance(leaderboard_info, str):
+        report_fetch_error(user_address, leaderboard_info)
+        return
+    positions = modify_data(leaderboard_info)
+    events = handle_positions(user_address, positions)
+    ADDRESSES_PROCESSED.labels('stream').inc()
+    record_first_cycle()
+    # Push websocket datang jauh lebih sering dari siklus polling; history hanya mencatat perubahan posisi
+    if shared.history_store is not None and events:
+        shared.history_store.record({user_address: positions})
+
+def process_cycle(results, previous_table):
+    """
+    Memproses hasil polling satu siklus lewat tabel kolumnar lintas alamat.
+
+    :param results: Dict alamat -> hasil get_leaderboard_base_info.
+    :param previous_table: PositionTable siklus sebelumnya (atau None).
+    :return: Tuple (PositionTable siklus ini, set alamat yang posisinya berubah).
+    """
+    from .position_table import PositionTable
+    table = PositionTable.from_snapshots(results, previous_table)
+    events_by_address = table.events(previous_table) if previous_table is not None else {}
+    positions_by_address = table.to_positions()
+    active_addresses = set()
+
+    for user_address, leaderboard_info in results.items():
+        if isinstance(leaderboard_info, str):
+            report_fetch_error(user_address, leaderboard_info)
+            continue
+        if user_address not in positions_by_address:
+            continue
+        # Alamat yang state-nya tidak berasal dari tabel sebelumnya memakai diff per alamat
+        events = events_by_address.get(user_address, []) if previous_table is not None and previous_table.covers(user_address) else None
+        if handle_positions(user_address, positions_by_address[user_address], events):
+            active_addresses.add(user_address)
+
+    if shared.history_store is not None:
+        shared.history_store.record({
+            user_address: positions_by_address[user_address]
+            for user_address, leaderboard_info in results.items()
+            if not isinstance(leaderboard_info, str) and user_address in positions_by_address
+        })
+    return table, active_addresses
+
+def monitor_positions(max_cycles: int = None):
+    """
+    Mode polling: setiap alamat di-poll saat deadline-nya tiba sesuai jadwal adaptif.
+
+    :param max_cycles: Berhenti setelah sekian siklus polling (None = berjalan terus).
+    """
+    cycles = 0
+    previous_table = None
+    synced_addresses = None
+    synced_pinned = None
+    polled = 0
+    fetch_total = 0.0
+    last_report = time.monotonic()
+    while True:
+        try:
+            current_addresses = tracked_addresses()
+            pinned = frozenset(shared.pinned_addresses)
+
+            # Snapshot registry immutable: jadwal hanya disinkronkan jika daftar alamat atau pin berubah
+            if current_addresses is not synced_addresses or pinned != synced_pinned:
+                scheduler.sync(current_addresses)
+                synced_addresses, synced_pinned = current_addresses, pinned
+            due_addresses = scheduler.pop_due()
+            if due_addresses:
+                cycle_start = time.perf_counter()
+                results, fetch_time = poll_addresses(due_addresses, get_leaderboard_base_info, POLL_CONCURRENCY)
+                previous_table, active_addresses = process_cycle(results, previous_table)
+                for address in due_addresses:
+                    scheduler.complete(address, address in active_addresses)
+                checkpoint_state()
+                CYCLE_DURATION.observe(time.perf_counter() - cycle_start)
+                CYCLE_ADDRESSES.set(len(due_addresses))
+                ADDRESSES_PROCESSED.labels('poll').inc(len(due_addresses))
+                polled += len(due_addresses)
+                fetch_total += fetch_time
+                cycles += 1
+                record_first_cycle()
+            flush_notifications()
+            if max_cycles is not None and cycles >= max_cycles:
+                return
+
+            if time.monotonic() - last_report >= 60:
+                stats = scheduler.stats()
+                current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                logging.info(
+                    f"✅ Bot is still running | Time: {current_time} | Polled: {polled} "
+                    f"| Fetch: {fetch_total * 1000:.2f}ms | Addresses: {stats['addresses']} "
+                    f"| Interval: {stats['min_interval']:.0f}-{stats['max_interval']:.0f}s (avg {stats['avg_interval']:.0f}s) "
+                    f"| Pinned: {stats['pinned']} | State: {previous_positions.stats()['bytes_per_address']:.0f} B/alamat "
+                    f"| Telegram queue: {dispatcher.queue_depth()}"
+                )
+                polled = 0
+                fetch_total = 0.0
+                last_report = time.monotonic()
+
+            # Tidur sampai deadline terdekat (dibatasi agar perubahan daftar alamat dan pin cepat terlihat)
+            time.sleep(min(max(scheduler.time_until_next(), 0.05), 1.0))
+
+        except Exception as e:
+            logging.error(f"Global error occurred: {e}")
+            error_message = f"Global error occurred:\n{e}\n\nRetrying after 60s"
+            dispatcher.enqueue(error_message)
+            time.sleep(60)
+
+def stream_positions():
+    """
+    Mode streaming: notifikasi dipicu oleh push websocket, bukan polling 60 detik.
+    """
+    def checkpoint_loop():
+        while True:
+            time.sleep(STATE_CHECKPOINT_INTERVAL)
+            try:
+                checkpoint_state()
+                flush_notifications()
+            except Exception as e:
+                logging.error(f"Gagal checkpoint state: {e}")
+
+    threading.Thread(target=checkpoint_loop, name="state-checkpoint", daemon=True).start()
+
+    import asyncio
+    from .stream import PositionStream, DEFAULT_ADDRESSES_PER_CONNECTION
+
+    addresses_per_connection = config.getint('monitor', 'addresses_per_connection', fallback=DEFAULT_ADDRESSES_PER_CONNECTION)
+    stream = PositionStream(tracked_addresses, process_address, get_leaderboard_base_info,
+                            addresses_per_connection=addresses_per_connection, concurrency=POLL_CONCURRENCY,
+                            invalidate_snapshot=forget_clearinghouse_state)
+    asyncio.run(stream.run())
+
+def sharded_positions():
+    """
+    Mode sharded: worker mem-poll dan men-diff shard masing-masing; proses ini
+    hanya mengirim notifikasi, menyimpan state, dan menyeimbangkan ulang shard.
+    """
+    assigned = None
+    pinned = None
+    last_report = time.monotonic()
+    processed = 0
+    while True:
+        try:
+            current_addresses = tracked_addresses()
+
+            if current_addresses is not assigned:
+                shard_manager.update(current_addresses, previous_positions)
+                assigned = current_addresses
+            if shared.pinned_addresses != pinned:
+                pinned = set(shared.pinned_addresses)
+                shard_manager.set_pinned(pinned)
+
+            tracked = set(current_addresses)
+            for shard_id, batch, fetch_time, cycle_time in shard_manager.get_results(timeout=1.0):
+                snapshot = {}
+                for user_address, positions, events, error in batch:
+                    if user_address not in tracked:
+                        continue
+                    if error is not None:
+                        report_fetch_error(user_address, error)
+                        continue
+                    handle_positions(user_address, positions, events)
+                    snapshot[user_address] = positions
+                if shared.history_store is not None and snapshot:
+                    shared.history_store.record(snapshot)
+                CYCLE_DURATION.observe(cycle_time)
+                CYCLE_ADDRESSES.set(len(batch))
+                ADDRESSES_PROCESSED.labels('sharded').inc(len(batch))
+                processed += len(batch)
+                record_first_cycle()
+
+            checkpoint_state()
+            flush_notifications()
+            shard_manager.check_workers(previous_positions)
+
+            if time.monotonic() - last_report >= 60:
+                current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                logging.info(
+                    f"✅ Bot is still running | Time: {current_time} | Processed: {processed} "
+                    f"| Shards: {shard_manager.shard_sizes()} | Restarts: {shard_manager.restarts} "
+                    f"| State: {previous_positions.stats()['bytes_per_address']:.0f} B/alamat "
+                    f"| Telegram queue: {dispatcher.queue_depth()}"
+                )
+                processed = 0
+                last_report = time.monotonic()
+
+        except Exception as e:
+            logging.error(f"Global error occurred: {e}")
+            error_message = f"Global error occurred:\n{e}\n\nRetrying after 60s"
+            dispatcher.enqueue(error_message)
+            time.sleep(60)
+
+def run(config_path: str = DEFAULT_CONFIG_PATH, max_cycles: int = None) -> None:
+    """
+    Memuat konfigurasi, menjalankan semua komponen background, lalu masuk ke loop pemantauan.
+
+    :param config_path: Lokasi config.ini.
+    :param max_cycles: Khusus mode polling: berhenti setelah sekian siklus (untuk benchmark startup).
+    """
+    global config, POLL_CONCURRENCY, MONITOR_MODE, STATE_CHECKPOINT_INTERVAL, scheduler, state_store
+    global digest, outage_tracker, offset, _started_at
+    _started_at = time.perf_counter()
+
+    # Konfigurasi logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('bot.log'),
+            logging.StreamHandler()
+        ]
+    )
+    config = load_config(config_path)
+
+    # Muat daftar alamat (file utama + journal) saat startup
+    address_registry.compact_every = config.getint('registry', 'compact_every', fallback=address_registry.compact_every)
+    address_registry.load()
+
+    # Pool koneksi HTTP bersama untuk API Hyperliquid dan Telegram
+    configure_clients(config)
+    # Decoder JSON untuk respons API: orjson jika terpasang, selain itu stdlib json
+    codec.set_backend(config.get('http', 'json_backend', fallback='auto'))
+    # Jendela kesegaran snapshot clearinghouseState bersama (detik)
+    clearinghouse_flight.freshness = config.getfloat('http', 'freshness', fallback=clearinghouse_flight.freshness)
+    # Budget weight /info, retry 429/5xx dan circuit breaker per endpoint
+    api_governor.max_retries = config.getint('ratelimit', 'max_retries', fallback=api_governor.max_retries)
+    api_governor.failure_threshold = config.getint('ratelimit', 'failure_threshold', fallback=api_governor.failure_threshold)
+    api_governor.reset_timeout = config.getfloat('ratelimit', 'reset_timeout', fallback=api_governor.reset_timeout)
+    api_governor.configure(config.getfloat('ratelimit', 'weight_per_minute', fallback=1200))
+
+    # Jumlah request clearinghouseState yang berjalan bersamaan per siklus
+    POLL_CONCURRENCY = config.getint('monitor', 'concurrency', fallback=DEFAULT_CONCURRENCY)
+    # Mode pemantauan: "poll" (jadwal adaptif), "stream" (push websocket) atau "sharded" (multi-proses)
+    MONITOR_MODE = config.get('monitor', 'mode', fallback='poll').strip().lower()
+
+    # Jadwal polling per alamat: interval memendek setelah ada aktivitas dan memanjang saat wallet diam
+    scheduler = AdaptiveScheduler(
+        min_interval=config.getfloat('scheduler', 'min_interval', fallback=DEFAULT_MIN_INTERVAL),
+        max_interval=config.getfloat('scheduler', 'max_interval', fallback=DEFAULT_MAX_INTERVAL),
+        base_interval=config.getfloat('scheduler', 'base_interval', fallback=DEFAULT_BASE_INTERVAL),
+        budget_per_minute=config.getfloat('scheduler', 'budget_per_minute', fallback=DEFAULT_BUDGET_PER_MINUTE),
+        pinned=shared.pinned_addresses,
+    )
+
+    # Perekaman respons /info mentah untuk post-mortem dan replay (setiap worker sharded menulis segmennya sendiri)
+    recorder_settings = None
+    if config.getboolean('recorder', 'enabled', fallback=False):
+        from .recorder import (DEFAULT_RECORDING_PATH, DEFAULT_SEGMENT_BYTES, DEFAULT_SEGMENT_SECONDS,
+                              DEFAULT_BLOCK_RECORDS, DEFAULT_MAX_QUEUE)
+        recorder_settings = {
+            'path': config.get('recorder', 'path', fallback=DEFAULT_RECORDING_PATH),
+            'compression': config.get('recorder', 'compression', fallback='gzip'),
+            'segment_bytes': int(config.getfloat('recorder', 'segment_mb', fallback=DEFAULT_SEGMENT_BYTES / 2**20) * 2**20),
+            'segment_seconds': config.getfloat('recorder', 'segment_minutes', fallback=DEFAULT_SEGMENT_SECONDS / 60) * 60,
+            'block_records': config.getint('recorder', 'block_records', fallback=DEFAULT_BLOCK_RECORDS),
+            'max_queue': config.getint('recorder', 'max_queue', fallback=DEFAULT_MAX_QUEUE),
+        }
+
+    # Mode sharded: worker dijalankan sebelum thread lain (cache mark price, dispatcher, metrik) dibuat,
+    # sehingga dengan start method fork tidak ada thread atau lock yang ikut tersalin
+    if MONITOR_MODE == 'sharded':
+        start_sharding(config.getint('monitor', 'workers', fallback=os.cpu_count() or 1), recorder_settings)
+    if recorder_settings is not None:
+        from .recorder import ResponseRecorder
+        hyperliquid.response_recorder = ResponseRecorder(**recorder_settings)
+        hyperliquid.response_recorder.start()
+        # Sisa antrian ditulis saat proses berhenti normal
+        atexit.register(hyperliquid.response_recorder.stop)
+        RECORDER_RECORDS.labels('written').set_function(lambda: hyperliquid.response_recorder.recorded)
+        RECORDER_RECORDS.labels('dropped').set_function(lambda: hyperliquid.response_recorder.dropped)
+
+    # Cache mark price bersama untuk notifikasi posisi ditutup, diperbarui di background
+    mark_price_cache.ttl = config.getfloat('markprice', 'ttl', fallback=mark_price_cache.ttl)
+    mark_price_cache.max_staleness = config.getfloat('markprice', 'max_staleness', fallback=mark_price_cache.max_staleness)
+    mark_price_cache.start()
+
+    # Notifikasi dikirim lewat antrian dengan batas laju Telegram, bukan di dalam loop pemantauan
+    dispatcher.configure(
+        global_rate=config.getfloat('telegram', 'global_rate', fallback=None),
+        chat_rate=config.getfloat('telegram', 'chat_rate', fallback=None),
+        group_rate=config.getfloat('telegram', 'group_rate', fallback=None),
+    )
+    dispatcher.start()
+
+    # Endpoint metrik Prometheus lokal (latensi API, siklus, notifikasi, Telegram, cache mark price)
+    TELEGRAM_QUEUE.set_function(dispatcher.queue_depth)
+    MARKPRICE_CACHE.labels('hit').set_function(lambda: mark_price_cache.hits)
+    MARKPRICE_CACHE.labels('miss').set_function(lambda: mark_price_cache.misses)
+    MARKPRICE_HIT_RATIO.set_function(lambda: mark_price_cache.stats()['hit_rate'])
+    for result in ('executed', 'shared', 'cached'):
+        COALESCED_REQUESTS.labels(result).set_function(lambda result=result: getattr(clearinghouse_flight, result))
+    if config.getboolean('metrics', 'enabled', fallback=True):
+        try:
+            start_http_server(
+                config.getint('metrics', 'port', fallback=DEFAULT_METRICS_PORT),
+                config.get('metrics', 'host', fallback=DEFAULT_METRICS_HOST),
+            )
+        except OSError as e:
+            logging.error(f"Gagal menjalankan endpoint metrik: {e}")
+
+    # State dipulihkan dari snapshot terakhir agar restart tidak mengirim ulang "current positions";
+    # perubahan selama bot mati dilaporkan sebagai event biasa pada siklus pertama
+    # Di mode cluster file state dipakai bersama lewat filesystem jaringan, yang tidak mendukung WAL
+    cluster_enabled = config.getboolean('cluster', 'enabled', fallback=False)
+    state_store = StateStore(config.get('state', 'path', fallback=DEFAULT_STATE_PATH),
+                             journal_mode='DELETE' if cluster_enabled else 'WAL')
+    STATE_CHECKPOINT_INTERVAL = config.getfloat('state', 'checkpoint_interval', fallback=5.0)
+    # State alamat yang dihapus lewat /remove dibuang dari memori dan dari state store
+    address_registry.on_remove(evict_addresses)
+    STATE_BYTES_PER_ADDRESS.set_function(lambda: previous_positions.stats()['bytes_per_address'])
+
+    # Di mode cluster hanya state partisi milik node ini yang dimuat (lihat start_cluster)
+    if cluster_enabled:
+        start_cluster()
+    else:
+        restore_state()
+
+    # Riwayat posisi per siklus untuk query rentang waktu (misalnya perintah /pnl)
+    if config.getboolean('history', 'enabled', fallback=True):
+        from .history import HistoryStore, DEFAULT_HISTORY_PATH
+        shared.history_store = HistoryStore(config.get('history', 'path', fallback=DEFAULT_HISTORY_PATH))
+
+    # Mode digest: notifikasi satu siklus dikelompokkan per alamat dan dikirim dalam sesedikit mungkin pesan
+    if config.getboolean('telegram', 'digest', fallback=True):
+        digest = DigestBuffer(dispatcher.enqueue, config.getfloat('telegram', 'digest_window', fallback=DEFAULT_FLUSH_WINDOW))
+    # Error fetch per alamat digabung menjadi satu notifikasi per gangguan API
+    outage_tracker = OutageTracker(
+        dispatcher.enqueue,
+        recovery_after=config.getfloat('ratelimit', 'recovery_after', fallback=DEFAULT_RECOVERY_AFTER),
+        failure_ratio=config.getfloat('ratelimit', 'outage_failure_ratio', fallback=DEFAULT_FAILURE_RATIO),
+        min_addresses=config.getint('ratelimit', 'outage_min_addresses', fallback=DEFAULT_MIN_ADDRESSES),
+    )
+
+    # Daftar alamat disinkronkan otomatis dengan trader teratas leaderboard
+    if config.getboolean('discovery', 'enabled', fallback=False):
+        start_discovery()
+
+    # Jalankan thread untuk polling Telegram
+    offset = None
+    telegram_thread = threading.Thread(target=telegram_polling, daemon=True)
+    telegram_thread.start()
+
+    # Jalankan loop utama untuk pemantauan posisi
+    if MONITOR_MODE == 'stream':
+        stream_positions()
+    elif MONITOR_MODE == 'sharded':
+        sharded_positions()
+    else:
+        monitor_positions(max_cycles)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,277 @@
+import requests
+from .http_client import telegram_client
+from .dispatcher import TelegramDispatcher, split_message
+from .metrics import TELEGRAM_LATENCY, TELEGRAM_FAILURES
+import configparser
+import logging
+import re
+import time
+from .alerts import render_exposure_message, render_crowded_message
+from .exposure import DEFAULT_TOP_COINS, DEFAULT_MIN_WALLETS
+from .shared import address_registry  # Impor dari shared.py
+from . import shared
+
+# Konfigurasi logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DEFAULT_CONFIG_PATH = 'config.ini'
+
+# Konfigurasi diisi oleh load_config(), bukan saat modul diimpor
+config = configparser.ConfigParser()
+telegram_bot_token = None
+telegram_chat_id = None
+admins = []
+
+def load_config(path: str = DEFAULT_CONFIG_PATH) -> configparser.ConfigParser:
+    """
+    Membaca dan memvalidasi config.ini, lalu mengisi token bot, chat ID, dan daftar admin.
+
+    :param path: Lokasi file konfigurasi.
+    :return: Objek ConfigParser.
+    :raises FileNotFoundError: Jika file tidak ditemukan.
+    :raises Exception: Jika bagian [telegram] tidak lengkap atau tidak valid.
+    """
+    global telegram_bot_token, telegram_chat_id, admins
+    if not config.read(path):
+        logging.error(f"File {path} tidak ditemukan.")
+        raise FileNotFoundError(f"File {path} tidak ditemukan.")
+
+    try:
+        telegram_bot_token = config['telegram']['bottoken']
+        chat_id = config['telegram']['chatid']
+        admins = [int(admin.strip()) for admin in config['telegram']['admins'].split(',')]
+    except KeyError as e:
+        logging.error(f"Konfigurasi tidak lengkap di {path}: {e}")
+        raise Exception(f"Pastikan file {path} memiliki bagian [telegram] dengan 'bottoken', 'chatid', dan 'admins'.")
+    except ValueError as e:
+        logging.error(f"Format 'admins' di {path} tidak valid: {e}")
+        raise Exception("Daftar 'admins' harus berupa angka yang dipisahkan koma (contoh: -123456789,123456).")
+
+    if not chat_id or not chat_id.lstrip('-').isdigit():
+        logging.error(f"telegram_chat_id tidak valid: {chat_id}")
+        raise ValueError(f"chatid di {path} harus berupa angka (bisa negatif) dan tidak boleh kosong.")
+    telegram_chat_id = str(chat_id)
+    dispatcher.default_chat_id = telegram_chat_id
+    return config
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+def telegram_api_send(message: str, chat_id: str = None) -> tuple:
+    """
+    Mengirim satu pesan ke Telegram Bot API dan melaporkan batas laju.
+    
+    :param message: Pesan yang akan dikirim.
+    :param chat_id: ID chat tujuan (default dari config).
+    :return: Tuple (berhasil, retry_after); retry_after berisi detik tunggu jika Telegram membalas 429.
+    """
+    chat_id = chat_id or telegram_chat_id
+    if not chat_id or not chat_id.lstrip('-').isdigit():
+        logging.error(f"chat_id tidak valid: {chat_id}")
+        TELEGRAM_FAILURES.labels('invalid_chat').inc()
+        return False, None
+
+    api_url = f"{TELEGRAM_API_BASE}/bot{telegram_bot_token}/sendMessage"
+    payload = {
+        'chat_id': chat_id,
+        'text': message,
+        'parse_mode': 'html',
+        'disable_web_page_preview': True
+    }
+    
+    start_time = time.perf_counter()
+    try:
+        logging.debug(f"Mengirim pesan ke chat {chat_id}: {message[:50]}...")
+        response = telegram_client.post(api_url, json=payload)
+        TELEGRAM_LATENCY.observe(time.perf_counter() - start_time)
+        if response.status_code == 429:
+            TELEGRAM_FAILURES.labels('rate_limited').inc()
+            try:
+                retry_after = float(response.json().get('parameters', {}).get('retry_after', 1))
+            except ValueError:
+                retry_after = 1.0
+            logging.warning(f"Telegram membatasi laju untuk chat {chat_id}, retry_after={retry_after}s")
+            return False, retry_after
+        response.raise_for_status()
+        logging.info(f"Pesan berhasil dikirim ke chat {chat_id}.")
+        return True, None
+    except requests.exceptions.HTTPError as e:
+        logging.error(f"Gagal mengirim pesan ke chat {chat_id}: {e}")
+        TELEGRAM_FAILURES.labels(f"http_{e.response.status_code if e.response is not None else 'error'}").inc()
+        return False, None
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Gagal mengirim pesan ke chat {chat_id}: {e}")
+        TELEGRAM_FAILURES.labels('network').inc()
+        return False, None
+
+def telegram_send_message(message: str, chat_id: str = None) -> bool:
+    """
+    Mengirim pesan ke Telegram secara sinkron.
+    
+    :param message: Pesan yang akan dikirim.
+    :param chat_id: ID chat tujuan (default dari config).
+    :return: True jika semua bagian pesan berhasil dikirim, False jika ada yang gagal.
+    """
+    ok = True
+    for part in split_message(message):
+        sent, _ = telegram_api_send(part, chat_id)
+        ok = ok and sent
+    return ok
+
+# Antrian pengiriman non-blocking untuk notifikasi dari loop pemantauan
+dispatcher = TelegramDispatcher(telegram_api_send, None)
+
+def process_telegram_updates(offset: int = None):
+    """
+    Memproses pesan masuk dari Telegram dan menangani perintah /add, /list, /remove, /pnl, /pin, /unpin, /exposure, /crowded.
+    
+    :param offset: Offset untuk getUpdates (opsional).
+    :return: Offset baru untuk update berikutnya.
+    """
+    api_url = f"{TELEGRAM_API_BASE}/bot{telegram_bot_token}/getUpdates"
+    params = {'timeout': 60, 'offset': offset} if offset else {'timeout': 60}
+    
+    try:
+        response = telegram_client.get(api_url, params=params, timeout=70)
+        response.raise_for_status()
+        data = response.json()
+
+        if not data.get('ok') or not data.get('result'):
+            return offset
+
+        for update in data['result']:
+            update_id = update['update_id']
+            message = update.get('message', {})
+            chat_id = message.get('chat', {}).get('id')
+            text = message.get('text', '')
+
+            if chat_id not in admins:
+                dispatcher.enqueue("Anda tidak memiliki izin untuk menggunakan perintah ini.", str(chat_id))
+                continue
+
+            if text.startswith('/add'):
+                parts = text.split(maxsplit=1)
+                if len(parts) < 2:
+                    dispatcher.enqueue("Format salah. Gunakan: /add <user_address> [user_address ...]", str(chat_id))
+                    continue
+                # Banyak alamat sekaligus, dipisah spasi, koma, atau baris baru
+                candidates = list(dict.fromkeys(a for a in re.split(r'[\s,]+', parts[1]) if a))
+                added, rejected = address_registry.add_many(candidates)
+                if len(candidates) == 1:
+                    if added:
+                        dispatcher.enqueue(f"Berhasil menambahkan {added[0][1]} (ID {added[0][0]})", str(chat_id))
+                    else:
+                        dispatcher.enqueue(f"Gagal menambahkan {candidates[0]}. Alamat tidak valid atau sudah ada.", str(chat_id))
+                    continue
+                reply = f"Berhasil menambahkan {len(added)} alamat, {len(rejected)} ditolak (tidak valid atau sudah ada)."
+                if added:
+                    reply += "\n" + "\n".join(f"{address_id}. {address}" for address_id, address in added[:20])
+                    if len(added) > 20:
+                        reply += f"\n... dan {len(added) - 20} lainnya"
+                dispatcher.enqueue(reply, str(chat_id))
+
+            elif text == '/list':
+                user_addresses = address_registry.items()
+                if not user_addresses:
+                    dispatcher.enqueue("Daftar user_address kosong.", str(chat_id))
+                else:
+                    message = "Daftar user_address:\n"
+                    for address_id, addr in user_addresses:
+                        message += f"{address_id}. {addr}\n"
+                    dispatcher.enqueue(message, str(chat_id))
+
+            elif text.startswith('/pnl'):
+                parts = text.split()
+                if len(parts) < 3:
+                    dispatcher.enqueue("Format salah. Gunakan: /pnl <user_address> <coin> [jam]", str(chat_id))
+                    continue
+                if shared.history_store is None:
+                    dispatcher.enqueue("Riwayat posisi tidak diaktifkan.", str(chat_id))
+                    continue
+                try:
+                    hours = float(parts[3]) if len(parts) > 3 else 24.0
+                except ValueError:
+                    dispatcher.enqueue("Jumlah jam harus berupa angka.", str(chat_id))
+                    continue
+                summary = shared.history_store.pnl_summary(parts[1], parts[2].upper(), hours)
+                if summary is None:
+                    dispatcher.enqueue(f"Tidak ada riwayat {parts[2].upper()} untuk {parts[1]} dalam {hours:g} jam terakhir.", str(chat_id))
+                else:
+                    dispatcher.enqueue(
+                        f"<b>{parts[2].upper()}</b> PnL {hours:g} jam terakhir\n"
+                        f"Awal: {summary['first']:.2f} | Akhir: {summary['last']:.2f}\n"
+                        f"Perubahan: {summary['change']:+.2f}\n"
+                        f"Min: {summary['min']:.2f} | Max: {summary['max']:.2f}\n"
+                        f"Sampel: {summary['samples']}",
+                        str(chat_id)
+                    )
+
+            elif text.startswith('/exposure'):
+                # Agregat dipelihara inkremental, jadi perintah ini tidak menghitung ulang semua posisi
+                parts = text.split()
+                argument = parts[1] if len(parts) > 1 else None
+                if argument is not None and not argument.isdigit():
+                    exposure = shared.exposure_tracker.get(argument.upper())
+                    if exposure is None:
+                        dispatcher.enqueue(f"Tidak ada posisi {argument.upper()} di alamat yang dipantau.", str(chat_id))
+                    else:
+                        dispatcher.enqueue(render_exposure_message([exposure], exposure.wallets), str(chat_id))
+                    continue
+                top = int(argument) if argument is not None else DEFAULT_TOP_COINS
+                dispatcher.enqueue(
+                    # Jumlah alamat yang punya state di node ini (di mode cluster hanya partisi miliknya)
+                    render_exposure_message(shared.exposure_tracker.top_exposure(top), len(shared.position_states or ())),
+                    str(chat_id)
+                )
+
+            elif text.startswith('/crowded'):
+                parts = text.split()
+                if len(parts) > 1 and not parts[1].isdigit():
+                    dispatcher.enqueue("Format salah. Gunakan: /crowded [minimal_alamat]", str(chat_id))
+                    continue
+                min_wallets = int(parts[1]) if len(parts) > 1 else DEFAULT_MIN_WALLETS
+                dispatcher.enqueue(
+                    render_crowded_message(shared.exposure_tracker.crowded(min_wallets=min_wallets), min_wallets),
+                    str(chat_id)
+                )
+
+            elif text.startswith('/pin') or text.startswith('/unpin'):
+                parts = text.split(maxsplit=1)
+                command = parts[0]
+                if len(parts) < 2:
+                    dispatcher.enqueue(f"Format salah. Gunakan: {command} <user_address>", str(chat_id))
+                    continue
+                user_address = parts[1].strip()
+                tracked = user_address in address_registry
+                if command == '/pin':
+                    if not tracked:
+                        dispatcher.enqueue(f"{user_address} tidak ada di daftar pemantauan.", str(chat_id))
+                        continue
+                    shared.pinned_addresses.add(user_address)
+                    dispatcher.enqueue(f"{user_address} dipin sebagai prioritas tinggi.", str(chat_id))
+                else:
+                    shared.pinned_addresses.discard(user_address)
+                    dispatcher.enqueue(f"Pin {user_address} dilepas.", str(chat_id))
+
+            elif text.startswith('/remove'):
+                parts = text.split()
+                if len(parts) < 2 or not all(part.isdigit() for part in parts[1:]):
+                    dispatcher.enqueue("Format salah. Gunakan: /remove <id> [id ...] (lihat /list)", str(chat_id))
+                    continue
+                address_ids = [int(part) for part in parts[1:]]
+                removed = address_registry.remove_many(address_ids)
+                for _, address in removed:
+                    shared.pinned_addresses.discard(address)
+                if removed:
+                    dispatcher.enqueue(
+                        "Berhasil menghapus:\n" + "\n".join(f"{address_id}. {address}" for address_id, address in removed),
+                        str(chat_id)
+                    )
+                missing = sorted(set(address_ids) - {address_id for address_id, _ in removed})
+                if missing:
+                    dispatcher.enqueue(f"ID tidak ditemukan: {', '.join(map(str, missing))}", str(chat_id))
+
+        return update_id + 1
+
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Gagal memproses update Telegram: {e}")
+        return offset
@@ -0,0 +1,274 @@
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_METRICS_HOST = '127.0.0.1'
+DEFAULT_METRICS_PORT = 9108
+# Batas bucket histogram latensi (detik)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """
+    Dasar metrik berlabel; nilai per kombinasi label disimpan sebagai objek anak
+    yang di-cache, sehingga hot path cukup memanggil `labels(...)` lalu `inc`/`observe`.
+    """
+
+    kind = 'untyped'
+    # Sufiks nama yang diekspos (HELP, TYPE, dan sampel memakai nama yang sama)
+    suffix = ''
+
+    def __init__(self, name: str, documentation: str, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def collect(self) -> list:
+        name = self.name + self.suffix
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            lines.extend(child.samples(name, self.labelnames, key))
+        return lines
+
+def _read(name, value, function):
+    if function is None:
+        return value
+    try:
+        return function()
+    except Exception as e:
+        logging.debug(f"Gagal membaca metrik {name}: {e}")
+        return None
+
+class _CounterChild:
+    __slots__ = ('value', 'function', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set_function(self, function) -> None:
+        """
+        :param function: Fungsi tanpa argumen yang mengembalikan hitungan kumulatif milik objek lain (hanya naik).
+        """
+        self.function = function
+
+    def samples(self, name, labelnames, key):
+        value = _read(name, self.value, self.function)
+        if value is None:
+            return []
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """
+    Penghitung yang hanya naik; diekspos dengan sufiks `_total` (nama tanpa sufiks saat didefinisikan).
+    """
+
+    kind = 'counter'
+    suffix = '_total'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def set_function(self, function) -> None:
+        self._default().set_function(function)
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function) -> None:
+        """
+        :param function: Fungsi tanpa argumen yang dipanggil saat metrik dibaca.
+        """
+        self.function = function
+
+    def samples(self, name, labelnames, key):
+        value = _read(name, self.value, self.function)
+        if value is None:
+            return []
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(value)}"]
+
+class Gauge(_Metric):
+    """
+    Nilai yang bisa naik turun; bisa di-set langsung atau dihitung saat dibaca.
+    """
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def set_function(self, function) -> None:
+        self._default().set_function(function)
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name, labelnames, key):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {count}")
+        return lines
+
+class Histogram(_Metric):
+    """
+    Distribusi nilai (misalnya latensi dalam detik) dengan bucket kumulatif.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+class Registry:
+    """
+    Kumpulan metrik yang dirender bersama dalam format teks Prometheus.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """
+        :return: Semua metrik dalam format eksposisi teks Prometheus 0.0.4.
+        """
+        lines = []
+        for metric in list(self._metrics):
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_http_server(port: int = DEFAULT_METRICS_PORT, host: str = DEFAULT_METRICS_HOST, registry: Registry = None):
+    """
+    Menyajikan /metrics di thread daemon.
+
+    :param port: Port HTTP.
+    :param host: Alamat bind (default hanya lokal).
+    :param registry: Registry yang disajikan (default REGISTRY).
+    :return: Objek server (panggil shutdown() untuk berhenti).
+    """
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    httpd.daemon_threads = True
+    httpd.registry = registry if registry is not None else REGISTRY
+    threading.Thread(target=httpd.serve_forever, name="metrics-http", daemon=True).start()
+    logging.info(f"Endpoint metrik tersedia di http://{host}:{httpd.server_address[1]}/metrics")
+    return httpd
+
+# Metrik bot
+API_LATENCY = Histogram('hyperliquid_api_request_duration_seconds', 'Latensi request /info per tipe endpoint.', ('endpoint',))
+API_RESPONSES = Counter('hyperliquid_api_responses', 'Jumlah respons /info per tipe endpoint dan status HTTP.', ('endpoint', 'status'))
+API_ERRORS = Counter('hyperliquid_api_errors', 'Jumlah request /info yang gagal di level jaringan.', ('endpoint',))
+CYCLE_DURATION = Histogram('monitor_cycle_duration_seconds', 'Durasi satu siklus polling (fetch + proses).',
+                           buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+CYCLE_ADDRESSES = Gauge('monitor_cycle_addresses', 'Jumlah alamat yang diproses pada siklus terakhir.')
+ADDRESSES_PROCESSED = Counter('monitor_addresses_processed', 'Jumlah alamat yang sudah diproses.', ('mode',))
+ALERTS = Counter('alerts_generated', 'Jumlah notifikasi posisi per jenis.', ('kind',))
+TELEGRAM_LATENCY = Histogram('telegram_send_duration_seconds', 'Latensi sendMessage Telegram.')
+TELEGRAM_FAILURES = Counter('telegram_send_failures', 'Jumlah pengiriman Telegram yang gagal per alasan.', ('reason',))
+TELEGRAM_QUEUE = Gauge('telegram_queue_depth', 'Jumlah pesan di antrian dispatcher.')
+MARKPRICE_CACHE = Counter('markprice_cache_requests', 'Jumlah lookup cache mark price per hasil.', ('result',))
+MARKPRICE_HIT_RATIO = Gauge('markprice_cache_hit_ratio', 'Rasio hit cache mark price.')
+COALESCED_REQUESTS = Counter('hyperliquid_coalesced_requests', 'Jumlah request clearinghouseState per hasil single-flight.', ('result',))
+STARTUP_DURATION = Gauge('monitor_startup_seconds', 'Waktu dari start sampai siklus pemantauan pertama selesai.')
+RECORDER_RECORDS = Counter('recorder_records', 'Jumlah respons /info yang direkam per hasil.', ('result',))
+STATE_BYTES_PER_ADDRESS = Gauge('monitor_state_bytes_per_address', 'Perkiraan memori state posisi per alamat yang dipantau (byte).')
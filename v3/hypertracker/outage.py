@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from .alerts import render_outage_started_message, render_outage_recovered_message
+
+DEFAULT_RECOVERY_AFTER = 60.0
+# Siklus dianggap terganggu jika porsi request gagal >= rasio ini dan cukup banyak alamat yang gagal
+DEFAULT_FAILURE_RATIO = 0.5
+DEFAULT_MIN_ADDRESSES = 3
+
+class OutageTracker:
+    """
+    Menggabungkan error fetch per alamat menjadi satu notifikasi per gangguan.
+
+    Error dan request yang berhasil dihitung per siklus; `flush()` (dipanggil
+    sekali per siklus) menilai siklus itu lalu mengosongkan hitungannya.
+    Gangguan dimulai pada siklus dengan porsi request gagal >= `failure_ratio`
+    dan minimal `min_addresses` alamat gagal (atau semua request gagal), dan
+    selesai setelah siklus-siklus di bawah ambang itu berlangsung selama
+    `recovery_after` detik. Satu alamat yang selalu gagal (misalnya alamat
+    salah) hanya tercatat di log dan tidak menahan gangguan tetap aktif.
+    """
+
+    def __init__(self, notify, recovery_after: float = DEFAULT_RECOVERY_AFTER,
+                 failure_ratio: float = DEFAULT_FAILURE_RATIO, min_addresses: int = DEFAULT_MIN_ADDRESSES):
+        """
+        :param notify: Fungsi (teks) untuk mengirim notifikasi, misalnya dispatcher.enqueue.
+        :param recovery_after: Lama siklus sehat (detik) sebelum gangguan dianggap selesai.
+        :param failure_ratio: Porsi request gagal dalam satu siklus yang dianggap gangguan.
+        :param min_addresses: Jumlah minimum alamat gagal dalam satu siklus yang dianggap gangguan.
+        """
+        self.notify = notify
+        self.recovery_after = recovery_after
+        self.failure_ratio = failure_ratio
+        self.min_addresses = min_addresses
+        self.active = False
+        self.failures = 0
+        self._addresses = set()
+        self._started_at = 0.0
+        self._healthy_since = None
+        self._last_error = None
+        self._cycle_failed = set()
+        self._cycle_failures = 0
+        self._cycle_successes = 0
+        self._lock = threading.Lock()
+
+    def record_error(self, user_address: str, error) -> None:
+        with self._lock:
+            self._cycle_failures += 1
+            self._cycle_failed.add(user_address)
+            self._last_error = error
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._cycle_successes += 1
+
+    def _degraded(self) -> bool:
+        failures, successes = self._cycle_failures, self._cycle_successes
+        if not failures:
+            return False
+        if failures / (failures + successes) < self.failure_ratio:
+            return False
+        return len(self._cycle_failed) >= self.min_addresses or not successes
+
+    def flush(self) -> None:
+        """
+        Menilai siklus yang baru selesai lalu mengirim notifikasi awal gangguan atau pemulihan jika sudah waktunya.
+        """
+        with self._lock:
+            if not self._cycle_failures and not self._cycle_successes:
+                # Tidak ada request pada siklus ini (misalnya tidak ada alamat yang jatuh tempo)
+                return
+            now = time.monotonic()
+            degraded = self._degraded()
+            if degraded:
+                self.failures += self._cycle_failures
+                self._addresses.update(self._cycle_failed)
+            self._cycle_failed = set()
+            self._cycle_failures = self._cycle_successes = 0
+
+            message = None
+            if degraded:
+                self._healthy_since = None
+                if not self.active:
+                    self.active = True
+                    self._started_at = now
+                    message = render_outage_started_message(self.failures, len(self._addresses), self._last_error)
+            elif self.active:
+                if self._healthy_since is None:
+                    self._healthy_since = now
+                if now - self._healthy_since >= self.recovery_after:
+                    message = render_outage_recovered_message(self.failures, len(self._addresses), now - self._started_at)
+                    logging.info(f"API pulih setelah {self.failures} request gagal")
+                    self.active = False
+                    self._healthy_since = None
+            if not self.active:
+                self.failures = 0
+                self._addresses.clear()
+        if message is not None:
+            self.notify(message)
@@ -0,0 +1,232 @@
+import sys
+import threading
+import time
+from array import array
+from operator import attrgetter
+from .positions import Position
+
+# Kolom float per posisi (coin disimpan sebagai ID intern, update_time per alamat)
+FLOAT_FIELDS = ('size', 'leverage', 'entry_price', 'position_value', 'unrealized_pnl',
+                'liquidation_price', 'estimated_entry_size')
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DEFAULT_COMPACT_RATIO = 0.5
+MIN_COMPACT_ROWS = 4096
+_get_floats = attrgetter(*FLOAT_FIELDS)
+
+class PositionStateStore:
+    """
+    State posisi terakhir per alamat dalam kolom array bertipe.
+
+    Setiap alamat mendapat slot integer; posisinya disimpan sebagai rentang
+    baris (start, count) di kolom global `array('d')` dengan nama coin yang
+    di-intern menjadi ID integer. Snapshot dengan jumlah posisi yang sama
+    atau lebih sedikit ditulis di tempat; yang lebih banyak ditambahkan di
+    akhir, dan baris yang tidak terpakai dibuang saat compaction. Alamat yang
+    dihapus dikeluarkan lewat `discard_many()` sehingga memori tidak tumbuh
+    mengikuti semua alamat yang pernah dipantau.
+
+    Antarmukanya seperti dict alamat -> dict coin -> Position; Position
+    dibuat ulang hanya saat dibaca.
+    """
+
+    def __init__(self, compact_ratio: float = DEFAULT_COMPACT_RATIO):
+        """
+        :param compact_ratio: Compaction saat baris tak terpakai melebihi rasio ini dari total baris.
+        """
+        self.compact_ratio = compact_ratio
+        self._slots = {}            # alamat -> slot
+        self._addresses = []        # slot -> alamat (None jika slot kosong)
+        self._free = []
+        self._start = array('q')    # per slot: baris pertama
+        self._count = array('H')    # per slot: jumlah posisi
+        self._time = array('q')     # per slot: update_time (detik UNIX, 0 jika kosong)
+        self._coin_ids = {}
+        self._coins = []
+        self._coin = array('I')     # per baris: ID coin
+        self._columns = tuple(array('d') for _ in FLOAT_FIELDS)
+        self._garbage = 0
+        self._lock = threading.Lock()
+        self._time_memo = ('', 0)
+        self._format_memo = (0, '')
+        self.evicted = 0
+
+    def _parse_time(self, update_time: str) -> int:
+        # Semua posisi satu siklus memakai string waktu yang sama
+        if update_time == self._time_memo[0]:
+            return self._time_memo[1]
+        try:
+            value = int(time.mktime(time.strptime(update_time, TIME_FORMAT))) if update_time else 0
+        except ValueError:
+            value = 0
+        self._time_memo = (update_time, value)
+        return value
+
+    def _format_time(self, value: int) -> str:
+        if value == self._format_memo[0]:
+            return self._format_memo[1]
+        text = time.strftime(TIME_FORMAT, time.localtime(value)) if value else ''
+        self._format_memo = (value, text)
+        return text
+
+    def _intern(self, coin: str) -> int:
+        coin_id = self._coin_ids.get(coin)
+        if coin_id is None:
+            coin_id = self._coin_ids[coin] = len(self._coins)
+            self._coins.append(coin)
+        return coin_id
+
+    def __setitem__(self, user_address: str, positions: dict) -> None:
+        with self._lock:
+            slot = self._slots.get(user_address)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                    self._addresses[slot] = user_address
+                else:
+                    slot = len(self._addresses)
+                    self._addresses.append(user_address)
+                    self._start.append(0)
+                    self._count.append(0)
+                    self._time.append(0)
+                self._slots[user_address] = slot
+
+            count = len(positions)
+            old_count = self._count[slot]
+            update_time = 0
+            if count <= old_count:
+                start = self._start[slot]
+                for i, position in enumerate(positions.values()):
+                    row = start + i
+                    self._coin[row] = self._intern(position.coin)
+                    for column, value in zip(self._columns, _get_floats(position)):
+                        column[row] = value
+                    update_time = position.update_time
+                self._garbage += old_count - count
+            else:
+                start = len(self._coin)
+                for position in positions.values():
+                    self._coin.append(self._intern(position.coin))
+                    for column, value in zip(self._columns, _get_floats(position)):
+                        column.append(value)
+                    update_time = position.update_time
+                self._garbage += old_count
+            self._start[slot] = start
+            self._count[slot] = count
+            if update_time:
+                self._time[slot] = self._parse_time(update_time)
+
+            if self._garbage > MIN_COMPACT_ROWS and self._garbage > self.compact_ratio * len(self._coin):
+                self._compact()
+
+    def get(self, user_address: str, default=None):
+        """
+        :return: Dict coin -> Position untuk alamat, atau `default` jika tidak ada state.
+        """
+        with self._lock:
+            slot = self._slots.get(user_address)
+            if slot is None:
+                return default
+            start = self._start[slot]
+            rows = range(start, start + self._count[slot])
+            update_time = self._format_time(self._time[slot])
+            coins = self._coins
+            size, leverage, entry_price, position_value, unrealized_pnl, liquidation_price, estimated = self._columns
+            return {
+                coins[self._coin[row]]: Position(
+                    coins[self._coin[row]], size[row], leverage[row], entry_price[row], position_value[row],
+                    unrealized_pnl[row], liquidation_price[row], estimated[row], update_time
+                )
+                for row in rows
+            }
+
+    def __getitem__(self, user_address: str) -> dict:
+        positions = self.get(user_address)
+        if positions is None:
+            raise KeyError(user_address)
+        return positions
+
+    def __contains__(self, user_address) -> bool:
+        return user_address in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def keys(self) -> list:
+        return list(self._slots)
+
+    def update(self, states: dict) -> None:
+        for user_address, positions in states.items():
+            self[user_address] = positions
+
+    def discard_many(self, addresses) -> int:
+        """
+        Mengeluarkan state alamat (hook siklus hidup saat alamat dihapus atau partisi dilepas).
+
+        :return: Jumlah alamat yang dikeluarkan.
+        """
+        removed = 0
+        with self._lock:
+            for user_address in addresses:
+                slot = self._slots.pop(user_address, None)
+                if slot is None:
+                    continue
+                self._garbage += self._count[slot]
+                self._count[slot] = 0
+                self._time[slot] = 0
+                self._addresses[slot] = None
+                self._free.append(slot)
+                removed += 1
+            self.evicted += removed
+            if self._garbage > MIN_COMPACT_ROWS and self._garbage > self.compact_ratio * len(self._coin):
+                self._compact()
+        return removed
+
+    def pop(self, user_address: str, default=None):
+        positions = self.get(user_address, default)
+        self.discard_many([user_address])
+        return positions
+
+    def _compact(self) -> None:
+        coin = array('I')
+        columns = tuple(array('d') for _ in FLOAT_FIELDS)
+        for slot in self._slots.values():
+            start, count = self._start[slot], self._count[slot]
+            self._start[slot] = len(coin)
+            coin.extend(self._coin[start:start + count])
+            for new, old in zip(columns, self._columns):
+                new.extend(old[start:start + count])
+        self._coin, self._columns = coin, columns
+        self._garbage = 0
+
+    def compact(self) -> None:
+        """
+        Membuang baris yang tidak terpakai dari semua kolom.
+        """
+        with self._lock:
+            self._compact()
+
+    def nbytes(self) -> int:
+        """
+        :return: Perkiraan memori struktur store (kolom, index slot, tabel coin; string alamat milik registry tidak dihitung).
+        """
+        with self._lock:
+            arrays = (self._start, self._count, self._time, self._coin) + self._columns
+            total = sum(a.buffer_info()[1] * a.itemsize for a in arrays)
+            total += sys.getsizeof(self._slots) + sys.getsizeof(self._addresses) + sys.getsizeof(self._free)
+            total += sys.getsizeof(self._coin_ids) + sum(sys.getsizeof(c) for c in self._coins)
+            return total
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah alamat, baris posisi, baris tak terpakai, byte total, dan byte per alamat.
+        """
+        total = self.nbytes()
+        return {
+            "addresses": len(self._slots),
+            "rows": len(self._coin) - self._garbage,
+            "garbage_rows": self._garbage,
+            "coins": len(self._coins),
+            "bytes": total,
+            "bytes_per_address": total / len(self._slots) if self._slots else 0.0,
+            "evicted": self.evicted,
+        }
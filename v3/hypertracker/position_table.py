@@ -0,0 +1,240 @@
+import datetime
+import numpy as np
+from .positions import Position, PositionEvent, OPENED, CLOSED, INCREASED, REDUCED, FLIPPED, LEVERAGE_CHANGED
+
+# Kolom numerik mentah, urutannya sama dengan kolom matriks nilai
+NUMERIC_FIELDS = ('size', 'leverage', 'entry_price', 'position_value', 'unrealized_pnl', 'liquidation_price')
+
+_COIN_BITS = 20
+
+def _intern(table: dict, value: str) -> int:
+    value_id = table.get(value)
+    if value_id is None:
+        value_id = table[value] = len(table)
+    return value_id
+
+class PositionTable:
+    """
+    Tabel kolumnar berisi posisi semua alamat yang dipantau dalam satu siklus.
+
+    Setiap baris dikunci oleh (alamat, coin). Kolom turunan (estimasi ukuran
+    entry, sisi, notional, jarak likuidasi) dihitung sekali per siklus dengan
+    satu pass NumPy, dan diff terhadap tabel siklus sebelumnya dilakukan
+    sekaligus untuk alamat yang tercakup kedua tabel.
+
+    Diff massal hanya berlaku untuk alamat yang juga tercakup tabel siklus
+    sebelumnya, jadi manfaatnya ada pada sweep penuh (semua alamat di-poll
+    setiap siklus, misalnya bench atau interval tetap). Dengan jadwal adaptif
+    setiap siklus hanya mem-poll alamat yang jatuh tempo, sehingga sebagian
+    besar alamat jatuh ke diff per alamat (diff_positions) di main.py;
+    membawa baris seluruh watchlist ke setiap tabel justru membuat siklus
+    parsial O(watchlist) dan lebih lambat dari jalur per alamat.
+
+    ID intern alamat/coin diwarisi dari tabel sebelumnya agar kunci kedua
+    tabel bisa dibandingkan. Tabel intern alamat hanya berisi alamat tabel
+    ini, jadi alamat yang sudah tidak di-poll tidak menumpuk di memori.
+    """
+
+    def __init__(self, addresses: list, address_col: list, coin_col: list, values, update_time: str = '',
+                 previous: "PositionTable" = None):
+        """
+        :param addresses: Alamat yang tercakup siklus ini (termasuk yang tidak punya posisi).
+        :param address_col: Alamat per baris (berurutan per alamat).
+        :param coin_col: Coin per baris.
+        :param values: Matriks (jumlah baris x len(NUMERIC_FIELDS)).
+        :param update_time: Waktu update siklus.
+        :param previous: Tabel siklus sebelumnya yang ID intern-nya diwarisi (opsional).
+        """
+        self.addresses = addresses
+        self._address_set = frozenset(addresses)
+        self.update_time = update_time
+        self.address = address_col
+        self.coin = coin_col
+
+        # ID alamat baru tidak pernah memakai ulang ID lama, agar alamat baru tidak tertukar
+        # dengan alamat tabel sebelumnya yang tidak di-poll siklus ini
+        previous_ids = previous._address_ids if previous is not None else {}
+        next_id = previous._next_address_id if previous is not None else 0
+        self._address_ids = {}
+        for user_address in addresses:
+            address_id = previous_ids.get(user_address)
+            if address_id is None:
+                address_id, next_id = next_id, next_id + 1
+            self._address_ids[user_address] = address_id
+        self._next_address_id = next_id
+        # Jumlah coin terbatas, jadi tabel intern coin dipakai bersama sepanjang rantai tabel
+        self._coin_ids = previous._coin_ids if previous is not None else {}
+
+        self.address_ids = np.fromiter(self._address_ids.values(), dtype=np.int64, count=len(self._address_ids))
+        address_id_col = np.fromiter((self._address_ids[a] for a in address_col), dtype=np.int64, count=len(address_col))
+        coin_id_col = np.fromiter((_intern(self._coin_ids, c) for c in coin_col), dtype=np.int64, count=len(coin_col))
+        values = np.asarray(values, dtype=np.float64).reshape(len(coin_col), len(NUMERIC_FIELDS))
+        (self.size, self.leverage, self.entry_price, self.position_value,
+         self.unrealized_pnl, self.liquidation_price) = values.T
+        self.row_address_ids = address_id_col
+        self.keys = (address_id_col << _COIN_BITS) | coin_id_col
+        self._positions = None
+        self._compute_derived()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def covers(self, user_address: str) -> bool:
+        """
+        :return: True jika alamat tercakup tabel ini (walaupun tanpa posisi).
+        """
+        return user_address in self._address_set
+
+    def _compute_derived(self) -> None:
+        abs_size = np.abs(self.size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.estimated_entry_size = np.where(
+                self.leverage != 0, np.round(abs_size / self.leverage * self.entry_price, 2), 0.0
+            )
+            self.is_long = self.size > 0
+            self.notional = np.abs(self.position_value)
+            self.mark_price = np.where(abs_size > 0, self.notional / abs_size, 0.0)
+            # Jarak relatif harga mark ke harga likuidasi (NaN jika tidak ada harga likuidasi)
+            self.liquidation_distance = np.where(
+                (self.liquidation_price > 0) & (self.mark_price > 0),
+                np.abs(self.mark_price - self.liquidation_price) / self.mark_price,
+                np.nan,
+            )
+
+    @classmethod
+    def from_snapshots(cls, results: dict, previous: "PositionTable" = None, update_time: str = None) -> "PositionTable":
+        """
+        Membangun tabel dari hasil polling satu siklus.
+
+        Alamat yang gagal di-fetch siklus ini memakai baris dari tabel sebelumnya
+        agar tidak terbaca sebagai posisi yang ditutup.
+
+        :param results: Dict alamat -> hasil get_leaderboard_base_info (dict atau pesan error).
+        :param previous: Tabel siklus sebelumnya (opsional).
+        :param update_time: Waktu update; default waktu sekarang.
+        :return: PositionTable baru.
+        """
+        if update_time is None:
+            update_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        previous_rows = None
+        addresses, address_col, coin_col, values = [], [], [], []
+        for user_address, info in results.items():
+            if isinstance(info, str) or not info or 'positions' not in info:
+                if previous is None or not previous.covers(user_address):
+                    continue
+                if previous_rows is None:
+                    previous_rows = previous.rows_by_address()
+                rows = previous_rows.get(user_address)
+                if rows is None:
+                    continue
+                addresses.append(user_address)
+                for coin, row in rows:
+                    address_col.append(user_address)
+                    coin_col.append(coin)
+                    values.append(row)
+                continue
+
+            addresses.append(user_address)
+            for p in info['positions']:
+                address_col.append(user_address)
+                coin_col.append(p['coin'])
+                values.append((p['size'], p['leverage'], p['entry_price'], p['position_value'],
+                               p['unrealized_pnl'], p.get('liquidation_price', 0.0)))
+
+        return cls(addresses, address_col, coin_col, values, update_time, previous)
+
+    def rows_by_address(self) -> dict:
+        """
+        :return: Dict alamat -> list (coin, tuple nilai numerik) untuk semua alamat yang tercakup.
+        """
+        rows = {user_address: [] for user_address in self.addresses}
+        matrix = np.column_stack([getattr(self, name) for name in NUMERIC_FIELDS]).tolist() if len(self) else []
+        for user_address, coin, row in zip(self.address, self.coin, matrix):
+            rows[user_address].append((coin, tuple(row)))
+        return rows
+
+    def to_positions(self) -> dict:
+        """
+        Mengubah tabel menjadi record Position per alamat (hasil di-cache).
+
+        :return: Dict alamat -> dict coin -> Position.
+        """
+        if self._positions is not None:
+            return self._positions
+
+        positions = {user_address: {} for user_address in self.addresses}
+        columns = zip(
+            self.address, self.coin, self.size.tolist(), self.leverage.tolist(),
+            self.entry_price.tolist(), self.position_value.tolist(), self.unrealized_pnl.tolist(),
+            self.liquidation_price.tolist(), self.estimated_entry_size.tolist(),
+        )
+        for user_address, coin, size, leverage, entry_price, value, pnl, liq, entry_size in columns:
+            positions[user_address][coin] = Position(coin, size, leverage, entry_price, value, pnl, liq,
+                                                     entry_size, self.update_time)
+        self._positions = positions
+        return positions
+
+    def diff(self, previous: "PositionTable") -> dict:
+        """
+        Diff massal terhadap tabel siklus sebelumnya.
+
+        Hanya alamat yang tercakup di kedua tabel yang dibandingkan; alamat baru
+        (first run) dan alamat yang sudah dihapus tidak menghasilkan event.
+
+        :param previous: Tabel siklus sebelumnya.
+        :return: Dict jenis event -> array indeks baris (CLOSED mengacu ke baris `previous`).
+        """
+        _, cur_idx, prev_idx = np.intersect1d(self.keys, previous.keys, assume_unique=True, return_indices=True)
+        in_previous = np.zeros(len(self.keys), dtype=bool)
+        in_previous[cur_idx] = True
+        in_current = np.zeros(len(previous.keys), dtype=bool)
+        in_current[prev_idx] = True
+
+        opened = np.flatnonzero(~in_previous & np.isin(self.row_address_ids, previous.address_ids))
+        closed = np.flatnonzero(~in_current & np.isin(previous.row_address_ids, self.address_ids))
+
+        current_size, previous_size = self.size[cur_idx], previous.size[prev_idx]
+        flipped = (current_size > 0) != (previous_size > 0)
+        current_abs, previous_abs = np.abs(current_size), np.abs(previous_size)
+
+        return {
+            OPENED: opened,
+            CLOSED: closed,
+            FLIPPED: cur_idx[flipped],
+            INCREASED: cur_idx[~flipped & (current_abs > previous_abs)],
+            REDUCED: cur_idx[~flipped & (current_abs < previous_abs)],
+            LEVERAGE_CHANGED: cur_idx[~flipped & (self.leverage[cur_idx] != previous.leverage[prev_idx])],
+        }
+
+    def events(self, previous: "PositionTable") -> dict:
+        """
+        Mengubah hasil diff massal menjadi PositionEvent per alamat.
+
+        Urutan event per alamat sama dengan diff_positions: posisi baru/berubah
+        sesuai urutan baris, lalu posisi yang ditutup.
+
+        :param previous: Tabel siklus sebelumnya.
+        :return: Dict alamat -> list PositionEvent.
+        """
+        masks = self.diff(previous)
+        current_positions = self.to_positions()
+        previous_positions = previous.to_positions()
+
+        ordered = sorted(
+            (row, rank, kind)
+            for rank, kind in enumerate((OPENED, FLIPPED, INCREASED, REDUCED, LEVERAGE_CHANGED))
+            for row in masks[kind].tolist()
+        )
+        events = {}
+        for row, _, kind in ordered:
+            user_address, coin = self.address[row], self.coin[row]
+            events.setdefault(user_address, []).append(PositionEvent(
+                kind, coin, previous_positions[user_address].get(coin), current_positions[user_address][coin]
+            ))
+        for row in masks[CLOSED].tolist():
+            user_address, coin = previous.address[row], previous.coin[row]
+            events.setdefault(user_address, []).append(
+                PositionEvent(CLOSED, coin, previous_positions[user_address][coin], None)
+            )
+        return events
@@ -0,0 +1,136 @@
+import datetime
+import logging
+
+# Jenis event perubahan posisi
+OPENED = 'opened'
+CLOSED = 'closed'
+INCREASED = 'increased'
+REDUCED = 'reduced'
+FLIPPED = 'flipped'
+LEVERAGE_CHANGED = 'leverage_changed'
+
+REQUIRED_FIELDS = ('coin', 'size', 'leverage', 'entry_price', 'position_value', 'unrealized_pnl')
+
+class Position:
+    """
+    Satu posisi trading yang sudah diproses, dikunci berdasarkan coin.
+    """
+
+    __slots__ = ('coin', 'size', 'leverage', 'entry_price', 'position_value', 'unrealized_pnl',
+                 'liquidation_price', 'estimated_entry_size', 'update_time')
+
+    def __init__(self, coin: str, size: float, leverage: float, entry_price: float, position_value: float,
+                 unrealized_pnl: float, liquidation_price: float = 0.0, estimated_entry_size: float = None,
+                 update_time: str = ''):
+        self.coin = coin
+        self.size = size
+        self.leverage = leverage
+        self.entry_price = entry_price
+        self.position_value = position_value
+        self.unrealized_pnl = unrealized_pnl
+        self.liquidation_price = liquidation_price
+        if estimated_entry_size is None:
+            estimated_entry_size = round((abs(size) / leverage) * entry_price, 2) if leverage else 0
+        self.estimated_entry_size = estimated_entry_size
+        self.update_time = update_time
+
+    @property
+    def side(self) -> str:
+        """
+        :return: "LONG" jika size positif, selain itu "SHORT".
+        """
+        return 'LONG' if self.size > 0 else 'SHORT'
+
+    def to_tuple(self) -> tuple:
+        """
+        :return: Tuple nilai sesuai urutan __slots__ (untuk disimpan ke disk).
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_tuple(cls, values) -> "Position":
+        """
+        :param values: Tuple hasil to_tuple().
+        :return: Position baru.
+        """
+        return cls(*values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Position({self.coin} {self.side} size={self.size} lev={self.leverage}x entry={self.entry_price})"
+
+class PositionEvent:
+    """
+    Event perubahan posisi untuk satu coin antara dua siklus.
+    """
+
+    __slots__ = ('kind', 'coin', 'previous', 'current')
+
+    def __init__(self, kind: str, coin: str, previous: Position = None, current: Position = None):
+        self.kind = kind
+        self.coin = coin
+        self.previous = previous
+        self.current = current
+
+    def __repr__(self) -> str:
+        return f"PositionEvent({self.kind}, {self.coin})"
+
+def modify_data(data) -> dict:
+    """
+    Memproses data posisi trading dari API Hyperliquid menjadi record Position.
+
+    :param data: Dict hasil get_leaderboard_base_info.
+    :return: Dict coin -> Position (kosong jika data tidak valid).
+    """
+    if not data or 'positions' not in data:
+        logging.warning("Invalid data structure received from API.")
+        return {}
+
+    positions = data['positions']
+    if positions:
+        missing_cols = [col for col in REQUIRED_FIELDS if col not in positions[0]]
+        if missing_cols:
+            logging.error(f"Missing required columns: {missing_cols}")
+            return {}
+
+    update_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    result = {}
+    for p in positions:
+        result[p['coin']] = Position(
+            p['coin'], p['size'], p['leverage'], p['entry_price'], p['position_value'],
+            p['unrealized_pnl'], p.get('liquidation_price', 0.0), update_time=update_time
+        )
+    return result
+
+def diff_positions(previous: dict, current: dict) -> list:
+    """
+    Membandingkan posisi dua siklus dan menghasilkan event bertipe.
+
+    :param previous: Dict coin -> Position dari siklus sebelumnya.
+    :param current: Dict coin -> Position dari siklus saat ini.
+    :return: List PositionEvent (urutan: posisi baru/berubah sesuai urutan `current`, lalu yang ditutup).
+    """
+    events = []
+    for coin, position in current.items():
+        old = previous.get(coin)
+        if old is None:
+            events.append(PositionEvent(OPENED, coin, None, position))
+            continue
+        if (old.size > 0) != (position.size > 0):
+            events.append(PositionEvent(FLIPPED, coin, old, position))
+            continue
+        if abs(position.size) > abs(old.size):
+            events.append(PositionEvent(INCREASED, coin, old, position))
+        elif abs(position.size) < abs(old.size):
+            events.append(PositionEvent(REDUCED, coin, old, position))
+        if position.leverage != old.leverage:
+            events.append(PositionEvent(LEVERAGE_CHANGED, coin, old, position))
+
+    for coin, old in previous.items():
+        if coin not in current:
+            events.append(PositionEvent(CLOSED, coin, old, None))
+    return events
@@ -0,0 +1,265 @@
+import logging
+import random
+import threading
+import time
+import requests
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: `rate` token per detik dengan kapasitas burst `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        :param rate: Jumlah token yang diisi ulang per detik.
+        :param capacity: Jumlah token maksimum (default sama dengan `rate`, minimal 1).
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Mencoba mengambil token tanpa menunggu.
+
+        :param tokens: Jumlah token yang dibutuhkan.
+        :return: 0.0 jika berhasil, selain itu perkiraan waktu tunggu (detik) sampai token cukup.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        :return: Waktu tunggu (detik) sampai `tokens` tersedia, tanpa mengambil token.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, tokens: float = 1.0, timeout: float = None) -> bool:
+        """
+        Mengambil token, menunggu jika perlu.
+
+        :param tokens: Jumlah token yang dibutuhkan.
+        :param timeout: Batas waktu tunggu dalam detik (None = tanpa batas).
+        :return: True jika token didapat, False jika timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def available(self) -> float:
+        """
+        :return: Jumlah token yang tersedia saat ini.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Backoff eksponensial dengan full jitter.
+
+    :param attempt: Nomor percobaan ulang (0 untuk percobaan ulang pertama).
+    :param base: Jeda dasar (detik).
+    :param cap: Jeda maksimum (detik).
+    :return: Jeda acak antara 0 dan min(cap, base * 2^attempt).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Request tidak dikirim karena circuit breaker endpoint sedang terbuka.
+    """
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana: terbuka setelah `failure_threshold` kegagalan
+    berturut-turut, menolak request selama `reset_timeout` detik, lalu
+    membiarkan satu request percobaan (half-open) sebelum menutup kembali.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        :return: True jika request boleh dikirim.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info("Circuit breaker tertutup kembali.")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logging.warning(f"Circuit breaker terbuka setelah {self.failures} kegagalan, jeda {self.reset_timeout}s.")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class RateGovernor:
+    """
+    Pengatur laju di depan setiap request: token bucket berbobot sesuai
+    budget weight API, retry dengan backoff + jitter untuk 429/5xx/error
+    jaringan, jeda global saat 429, dan circuit breaker per endpoint.
+    """
+
+    def __init__(self, weight_per_minute: float = 1200.0, weights: dict = None, default_weight: float = 20.0,
+                 max_retries: int = 3, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        :param weight_per_minute: Budget weight per menit (Hyperliquid: 1200 per IP).
+        :param weights: Dict endpoint -> weight per request.
+        :param default_weight: Weight untuk endpoint yang tidak ada di `weights`.
+        :param max_retries: Jumlah percobaan ulang untuk 429/5xx/error jaringan.
+        :param failure_threshold: Kegagalan berturut-turut sebelum circuit breaker terbuka.
+        :param reset_timeout: Lama circuit breaker terbuka (detik).
+        """
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.max_retries = max_retries
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.configure(weight_per_minute)
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def configure(self, weight_per_minute: float) -> None:
+        rate = weight_per_minute / 60.0
+        # Burst dibatasi beberapa detik budget agar tidak menghabiskan jatah satu menit sekaligus
+        self.bucket = TokenBucket(rate, capacity=max(self.default_weight, rate * 5))
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(self.failure_threshold, self.reset_timeout))
+        return breaker
+
+    def breaker_states(self) -> dict:
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+
+    def _retry_after(self, response) -> float | None:
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def call(self, endpoint: str, function):
+        """
+        Menjalankan request lewat governor.
+
+        :param endpoint: Nama endpoint (misalnya tipe request /info).
+        :param function: Fungsi tanpa argumen yang mengirim request dan mengembalikan respons.
+        :return: Respons terakhir (bisa tetap 429/5xx jika semua percobaan gagal).
+        :raises CircuitOpenError: Jika circuit breaker endpoint sedang terbuka.
+        :raises requests.exceptions.RequestException: Jika error jaringan berlanjut setelah semua percobaan.
+        """
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit breaker {endpoint} terbuka, request dilewati")
+
+        weight = self.weights.get(endpoint, self.default_weight)
+        for attempt in range(self.max_retries + 1):
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            self.bucket.acquire(weight)
+
+            try:
+                response = function()
+            except requests.exceptions.RequestException:
+                if attempt >= self.max_retries:
+                    breaker.record_failure()
+                    raise
+                self.retries += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            status = response.status_code
+            if status != 429 and status < 500:
+                breaker.record_success()
+                return response
+
+            if status == 429:
+                # Server membatasi laju: tahan semua request, bukan hanya request ini
+                self.throttled += 1
+                delay = self._retry_after(response) or backoff_delay(attempt, base=1.0)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            else:
+                delay = backoff_delay(attempt)
+            if attempt >= self.max_retries:
+                breaker.record_failure()
+                return response
+            self.retries += 1
+            logging.warning(f"{endpoint} membalas {status}, mencoba ulang dalam {delay:.2f}s")
+            time.sleep(delay)
+        return response
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah 429, retry, request yang ditolak circuit breaker, dan status breaker per endpoint.
+        """
+        return {
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "breakers": self.breaker_states(),
+        }
@@ -0,0 +1,250 @@
+import datetime
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from .codec import dumps
+
+DEFAULT_RECORDING_PATH = 'recordings'
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_SECONDS = 3600.0
+DEFAULT_BLOCK_RECORDS = 256
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_QUEUE = 10000
+INDEX_SUFFIX = '.idx'
+
+_COMPRESSIONS = {'gzip': '.gz'}
+try:
+    import zstandard
+    _COMPRESSIONS['zstd'] = '.zst'
+except ImportError:
+    zstandard = None
+
+def _decompress_block(data: bytes, compression: str) -> bytes:
+    if compression == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def read_index(index_path: str) -> list:
+    """
+    :param index_path: Lokasi file .idx sebuah segmen.
+    :return: List entri blok {"offset", "length", "first_ts", "last_ts", "records", "users"}.
+    """
+    entries = []
+    with open(index_path, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Baris terakhir bisa terpotong jika proses mati saat menulis
+                continue
+    return entries
+
+def find_snapshots(segment_path: str, user_address: str = None, start_ts: float = None, end_ts: float = None) -> list:
+    """
+    Mencari record di satu segmen lewat index; hanya blok yang cocok yang didekompresi.
+
+    :param segment_path: Lokasi segmen (.jsonl.gz atau .jsonl.zst).
+    :param user_address: Hanya record alamat ini (opsional).
+    :param start_ts: Batas bawah waktu UNIX (opsional).
+    :param end_ts: Batas atas waktu UNIX (opsional).
+    :return: List record (dict) urut waktu.
+    """
+    compression = 'zstd' if segment_path.endswith('.zst') else 'gzip'
+    records = []
+    with open(segment_path, 'rb') as f:
+        for entry in read_index(segment_path + INDEX_SUFFIX):
+            if user_address is not None and user_address not in entry['users']:
+                continue
+            if start_ts is not None and entry['last_ts'] < start_ts:
+                continue
+            if end_ts is not None and entry['first_ts'] > end_ts:
+                continue
+            f.seek(entry['offset'])
+            for line in _decompress_block(f.read(entry['length']), compression).splitlines():
+                record = json.loads(line)
+                if user_address is not None and record.get('user') != user_address:
+                    continue
+                if start_ts is not None and record['ts'] < start_ts:
+                    continue
+                if end_ts is not None and record['ts'] > end_ts:
+                    continue
+                records.append(record)
+    return records
+
+class ResponseRecorder:
+    """
+    Perekam respons /info mentah ke log append-only terkompresi.
+
+    Pemanggil hanya memasukkan body respons ke antrian terbatas (tidak pernah
+    menunggu; record dibuang jika antrian penuh). Thread penulis mengelompokkan
+    record menjadi blok, mengompresi setiap blok sebagai member gzip / frame
+    zstd tersendiri, lalu menambahkannya ke segmen yang dirotasi menurut
+    ukuran dan umur. Setiap blok dicatat di file .idx (offset, rentang waktu,
+    alamat) agar snapshot tertentu bisa dicari tanpa mendekompresi seluruh
+    segmen. Segmen bisa langsung diputar dengan replay.py.
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORDING_PATH, compression: str = 'gzip', prefix: str = 'responses',
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+                 block_records: int = DEFAULT_BLOCK_RECORDS, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_queue: int = DEFAULT_MAX_QUEUE):
+        """
+        :param path: Direktori segmen.
+        :param compression: "gzip" atau "zstd" (gzip jika zstandard tidak terpasang).
+        :param prefix: Awalan nama file segmen.
+        :param segment_bytes: Ukuran terkompresi maksimum satu segmen sebelum rotasi.
+        :param segment_seconds: Umur maksimum satu segmen sebelum rotasi.
+        :param block_records: Jumlah record per blok terkompresi.
+        :param flush_interval: Blok yang belum penuh ditulis setelah sekian detik.
+        :param max_queue: Jumlah record maksimum yang menunggu ditulis.
+        """
+        if compression not in _COMPRESSIONS:
+            logging.warning(f"Kompresi '{compression}' tidak tersedia, memakai gzip.")
+            compression = 'gzip'
+        self.path = path
+        self.compression = compression
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.block_records = block_records
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._compressor = zstandard.ZstdCompressor(level=3) if compression == 'zstd' else None
+        self._thread = None
+        self._segment = None
+        self._index = None
+        self._segment_opened_at = 0.0
+        self.segment_path = None
+
+        self.recorded = 0
+        self.dropped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.segments = 0
+
+    def record(self, request_type: str, user_address: str, body: bytes) -> bool:
+        """
+        Memasukkan satu body respons ke antrian tanpa menunggu.
+
+        :param request_type: Tipe request /info (misalnya clearinghouseState).
+        :param user_address: Alamat untuk request per pengguna (None untuk request global).
+        :param body: Body respons mentah (JSON).
+        :return: True jika masuk antrian, False jika dibuang karena antrian penuh.
+        """
+        try:
+            self._queue.put_nowait((time.time(), request_type, user_address, body))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        """
+        Menjalankan thread penulis.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="response-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Menulis sisa antrian, menutup segmen, dan menghentikan thread penulis.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _encode(self, ts: float, request_type: str, user_address: str, body: bytes) -> bytes:
+        # Body disisipkan apa adanya; baris baru di luar string JSON hanyalah whitespace
+        return (b'{"ts":' + repr(ts).encode() + b',"type":' + dumps(request_type)
+                + b',"user":' + (dumps(user_address) if user_address else b'null')
+                + b',"response":' + body.replace(b'\n', b' ') + b'}\n')
+
+    def _run(self) -> None:
+        lines, users = [], set()
+        first_ts = last_ts = None
+        block_started = time.monotonic()
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = False
+            if item is None:
+                running = False
+            elif item:
+                ts, request_type, user_address, body = item
+                if body:
+                    if not lines:
+                        first_ts, block_started = ts, time.monotonic()
+                    lines.append(self._encode(ts, request_type, user_address, body))
+                    last_ts = ts
+                    if user_address:
+                        users.add(user_address)
+            if lines and (not running or len(lines) >= self.block_records
+                          or time.monotonic() - block_started >= self.flush_interval):
+                try:
+                    self._write_block(lines, users, first_ts, last_ts)
+                except OSError as e:
+                    logging.error(f"Gagal menulis rekaman ke {self.segment_path}: {e}")
+                lines, users = [], set()
+        self._close_segment()
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        name = f"{self.prefix}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.jsonl{_COMPRESSIONS[self.compression]}"
+        self.segment_path = os.path.join(self.path, name)
+        self._segment = open(self.segment_path, 'ab')
+        self._index = open(self.segment_path + INDEX_SUFFIX, 'a')
+        self._segment_opened_at = time.monotonic()
+        self.segments += 1
+        logging.info(f"Segmen rekaman baru: {self.segment_path}")
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+    def _write_block(self, lines: list, users: set, first_ts: float, last_ts: float) -> None:
+        data = b''.join(lines)
+        if self._compressor is not None:
+            compressed = self._compressor.compress(data)
+        else:
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+
+        if (self._segment is None or self._segment.tell() >= self.segment_bytes
+                or time.monotonic() - self._segment_opened_at >= self.segment_seconds):
+            self._open_segment()
+        offset = self._segment.tell()
+        self._segment.write(compressed)
+        self._segment.flush()
+        # Entri index ditulis setelah bloknya lengkap di disk
+        self._index.write(json.dumps({
+            "offset": offset, "length": len(compressed), "first_ts": first_ts, "last_ts": last_ts,
+            "records": len(lines), "users": sorted(users),
+        }, separators=(',', ':')) + '\n')
+        self._index.flush()
+        self.recorded += len(lines)
+        self.bytes_in += len(data)
+        self.bytes_out += len(compressed)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah record tertulis/dibuang, antrian, segmen, dan rasio kompresi.
+        """
+        return {
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "segments": self.segments,
+            "compression_ratio": self.bytes_in / self.bytes_out if self.bytes_out else 0.0,
+        }
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import threading
+
+DEFAULT_ADDRESSES_PATH = 'user_addresses.json'
+DEFAULT_JOURNAL_SUFFIX = '.journal'
+DEFAULT_COMPACT_EVERY = 1000
+
+def is_valid_address(user_address) -> bool:
+    """
+    :return: True jika berupa string alamat EVM (0x + 40 karakter).
+    """
+    return isinstance(user_address, str) and user_address.startswith("0x") and len(user_address) == 42
+
+class AddressRegistry:
+    """
+    Daftar alamat yang dipantau dengan ID stabil dan pencarian O(1).
+
+    Pembaca memakai `snapshot()` yang mengembalikan tuple immutable
+    (copy-on-write: tuple baru hanya dibuat saat ada perubahan). Setiap
+    perubahan ditambahkan ke file journal (append-only), dan file utama
+    ditulis ulang secara atomik hanya saat compaction.
+    """
+
+    def __init__(self, path: str = DEFAULT_ADDRESSES_PATH, journal_path: str = None,
+                 compact_every: int = DEFAULT_COMPACT_EVERY):
+        """
+        :param path: File utama (format baru, atau list JSON lama dari setup.py).
+        :param journal_path: File journal (default `path` + ".journal").
+        :param compact_every: Jumlah entri journal sebelum compaction otomatis.
+        """
+        self.path = path
+        self.journal_path = journal_path or path + DEFAULT_JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.version = 0
+        self._ids = {}          # alamat -> ID
+        self._addresses = {}    # ID -> alamat (urut penambahan)
+        self._next_id = 1
+        self._snapshot = ()
+        self._journal_entries = 0
+        self._lock = threading.Lock()
+        self._remove_callbacks = []
+
+    def load(self) -> "AddressRegistry":
+        """
+        Memuat file utama lalu memutar ulang journal, kemudian melakukan compaction.
+        """
+        with self._lock:
+            self._ids.clear()
+            self._addresses.clear()
+            self._next_id = 1
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = []
+
+            if isinstance(data, list):
+                # Format lama: list alamat biasa, ID diberikan sesuai urutan
+                for address in data:
+                    self._insert(address)
+            else:
+                for entry in data.get('addresses', []):
+                    self._insert(entry['address'], entry['id'])
+                self._next_id = max(self._next_id, data.get('next_id', 1))
+
+            replayed = 0
+            try:
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Baris terakhir bisa terpotong jika proses mati saat menulis
+                            logging.warning(f"Baris journal {self.journal_path} rusak, dilewati.")
+                            continue
+                        if entry.get('op') == 'add':
+                            self._insert(entry['address'], entry['id'])
+                        elif entry.get('op') == 'remove':
+                            self._delete(entry['address'])
+                        replayed += 1
+            except FileNotFoundError:
+                pass
+
+            self._publish()
+            if replayed:
+                self._compact()
+        logging.info(f"{len(self._ids)} alamat dimuat dari {self.path} ({replayed} entri journal)")
+        return self
+
+    def _insert(self, address: str, address_id: int = None) -> int | None:
+        if address in self._ids:
+            return None
+        if address_id is not None and address_id in self._addresses:
+            # ID sudah dipakai alamat lain (misalnya journal basi setelah file utama ditulis ulang): beri ID baru
+            logging.warning(f"ID {address_id} untuk {address} sudah dipakai {self._addresses[address_id]}, diberi ID baru.")
+            address_id = None
+        if address_id is None:
+            address_id = self._next_id
+        self._ids[address] = address_id
+        self._addresses[address_id] = address
+        self._next_id = max(self._next_id, address_id + 1)
+        return address_id
+
+    def _delete(self, address: str) -> int | None:
+        address_id = self._ids.pop(address, None)
+        if address_id is not None:
+            del self._addresses[address_id]
+        return address_id
+
+    def _publish(self) -> None:
+        self._snapshot = tuple(self._addresses.values())
+        self.version += 1
+
+    def _append_journal(self, entries: list) -> None:
+        with open(self.journal_path, 'a') as f:
+            f.write(''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += len(entries)
+        if self._journal_entries >= self.compact_every:
+            self._compact()
+
+    def _compact(self) -> None:
+        data = {
+            'next_id': self._next_id,
+            'addresses': [{'id': address_id, 'address': address} for address_id, address in self._addresses.items()],
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        open(self.journal_path, 'w').close()
+        self._journal_entries = 0
+
+    def compact(self) -> None:
+        """
+        Menulis ulang file utama secara atomik dan mengosongkan journal.
+        """
+        with self._lock:
+            self._compact()
+
+    def add_many(self, addresses) -> tuple:
+        """
+        Menambahkan banyak alamat sekaligus (satu tulisan journal, satu snapshot baru).
+
+        :param addresses: Iterable alamat.
+        :return: Tuple (list (ID, alamat) yang ditambahkan, list alamat yang ditolak karena tidak valid atau sudah ada).
+        """
+        addresses = list(addresses)
+        added, rejected = [], []
+        with self._lock:
+            for address in addresses:
+                if not is_valid_address(address) or address in self._ids:
+                    rejected.append(address)
+                    continue
+                added.append((self._insert(address), address))
+            if not added:
+                return added, rejected
+            try:
+                self._append_journal([{'op': 'add', 'id': address_id, 'address': address} for address_id, address in added])
+            except OSError as e:
+                logging.error(f"Gagal menulis journal {self.journal_path}: {e}")
+                for _, address in added:
+                    self._delete(address)
+                return [], list(addresses)
+            self._publish()
+        logging.info(f"Berhasil menambahkan {len(added)} alamat ({len(rejected)} ditolak)")
+        return added, rejected
+
+    def add(self, address: str) -> int | None:
+        """
+        :return: ID alamat baru, atau None jika tidak valid/sudah ada.
+        """
+        added, _ = self.add_many([address])
+        return added[0][0] if added else None
+
+    def on_remove(self, callback) -> None:
+        """
+        Mendaftarkan hook yang dipanggil setelah alamat dihapus (misalnya untuk membuang state-nya).
+
+        :param callback: Fungsi (list alamat) yang dipanggil di luar lock registry.
+        """
+        self._remove_callbacks.append(callback)
+
+    def remove_many(self, address_ids) -> list:
+        """
+        Menghapus alamat berdasarkan ID stabil.
+
+        :param address_ids: Iterable ID.
+        :return: List (ID, alamat) yang berhasil dihapus.
+        """
+        removed = []
+        with self._lock:
+            for address_id in address_ids:
+                address = self._addresses.get(address_id)
+                if address is not None:
+                    self._delete(address)
+                    removed.append((address_id, address))
+            if not removed:
+                return removed
+            try:
+                self._append_journal([{'op': 'remove', 'id': address_id, 'address': address} for address_id, address in removed])
+            except OSError as e:
+                logging.error(f"Gagal menulis journal {self.journal_path}: {e}")
+                for address_id, address in removed:
+                    self._insert(address, address_id)
+                return []
+            self._publish()
+        logging.info(f"Berhasil menghapus {len(removed)} alamat")
+        addresses = [address for _, address in removed]
+        for callback in self._remove_callbacks:
+            try:
+                callback(addresses)
+            except Exception as e:
+                logging.error(f"Hook penghapusan alamat gagal: {e}")
+        return removed
+
+    def remove(self, address_id: int) -> str | None:
+        """
+        :return: Alamat yang dihapus, atau None jika ID tidak ada.
+        """
+        removed = self.remove_many([address_id])
+        return removed[0][1] if removed else None
+
+    def snapshot(self) -> tuple:
+        """
+        :return: Tuple alamat saat ini (tidak disalin; aman dibaca tanpa lock).
+        """
+        return self._snapshot
+
+    def items(self) -> list:
+        """
+        :return: List (ID, alamat) urut penambahan.
+        """
+        with self._lock:
+            return list(self._addresses.items())
+
+    def id_of(self, address: str) -> int | None:
+        return self._ids.get(address)
+
+    def __contains__(self, address) -> bool:
+        return address in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
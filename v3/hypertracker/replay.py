@@ -0,0 +1,191 @@
+import argparse
+import cProfile
+import gzip
+import io
+import logging
+import pstats
+import time
+from . import codec
+from .alerts import (render_new_position_message, render_closed_position_message,
+                    render_position_changed_message, render_current_positions)
+from .hyperliquid import parse_clearinghouse_state
+from .markprice import MarkPriceCache
+from .positions import modify_data, diff_positions, OPENED, CLOSED
+
+DEFAULT_OUTPUT_PATH = 'replay_alerts.txt'
+MESSAGE_SEPARATOR = "\n" + "=" * 40 + "\n"
+
+def open_recording(path: str):
+    """
+    Membuka file rekaman JSONL (biasa, .gz, atau .zst) sebagai stream biner.
+
+    File dengan beberapa member gzip / frame zstd (misalnya hasil recorder per blok)
+    dibaca berurutan seperti satu file.
+
+    :param path: Lokasi file.
+    :return: Objek file biner.
+    :raises RuntimeError: Jika file .zst tetapi paket zstandard tidak terpasang.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(f"{path}: membaca .zst membutuhkan 'pip install zstandard'")
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True))
+    return open(path, 'rb')
+
+def read_records(paths):
+    """
+    Membaca record rekaman dari satu atau beberapa file secara berurutan.
+
+    Setiap baris adalah objek JSON {"ts": waktu UNIX, "type": tipe request /info,
+    "user": alamat (untuk clearinghouseState), "response": respons mentah}.
+    Baris rusak (misalnya baris terakhir yang terpotong) dilewati.
+
+    :param paths: List lokasi file.
+    :return: Generator dict record.
+    """
+    for path in paths:
+        with open_recording(path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield codec.loads(line)
+                except ValueError:
+                    logging.warning(f"{path}:{line_number}: baris rekaman rusak, dilewati.")
+
+class Replayer:
+    """
+    Memutar ulang rekaman respons /info lewat pipeline yang sama dengan bot:
+    parse clearinghouseState, modify_data, diff, lalu render notifikasi.
+    Pesan yang seharusnya dikirim ke Telegram diteruskan ke `sink`.
+    """
+
+    def __init__(self, sink, speed: float = 0.0):
+        """
+        :param sink: Fungsi (teks) yang menerima setiap pesan hasil render.
+        :param speed: Pengali kecepatan terhadap waktu rekaman (0 = secepat mungkin).
+        """
+        self.sink = sink
+        self.speed = speed
+        self.previous_positions = {}
+        self._meta = None
+        self.mark_prices = MarkPriceCache(lambda: self._meta, ttl=float('inf'))
+        self.records = 0
+        self.snapshots = 0
+        self.events = 0
+        self.messages = 0
+        self.skipped = 0
+
+    def _emit(self, text: str) -> None:
+        self.messages += 1
+        self.sink(text)
+
+    def process(self, record: dict) -> None:
+        """
+        Memproses satu record rekaman.
+        """
+        self.records += 1
+        request_type = record.get('type', 'clearinghouseState')
+        response = record.get('response')
+        if request_type == 'metaAndAssetCtxs':
+            self._meta = response
+            self.mark_prices.refresh()
+            return
+        user_address = record.get('user')
+        if request_type != 'clearinghouseState' or not user_address or not isinstance(response, dict):
+            self.skipped += 1
+            return
+
+        self.snapshots += 1
+        positions = modify_data(parse_clearinghouse_state(user_address, response))
+        previous = self.previous_positions.get(user_address)
+        self.previous_positions[user_address] = positions
+        if previous is None:
+            # Snapshot pertama per alamat, sama seperti siklus pertama bot
+            self._emit(render_current_positions(positions, user_address))
+            return
+
+        for event in diff_positions(previous, positions):
+            self.events += 1
+            if event.kind == OPENED:
+                self._emit(render_new_position_message(event.coin, event.current, user_address))
+            elif event.kind == CLOSED:
+                self._emit(render_closed_position_message(event.coin, event.previous, user_address,
+                                                          self.mark_prices.get(event.coin)))
+            else:
+                self._emit(render_position_changed_message(event, user_address))
+
+    def run(self, records) -> dict:
+        """
+        Memutar semua record; dengan speed > 0 jeda antar record mengikuti selisih `ts` dibagi speed.
+
+        :param records: Iterable record.
+        :return: Dict statistik replay (lihat stats()).
+        """
+        start_time = time.perf_counter()
+        first_ts = None
+        for record in records:
+            if self.speed > 0:
+                ts = record.get('ts')
+                if ts is not None:
+                    if first_ts is None:
+                        first_ts = ts
+                    delay = (ts - first_ts) / self.speed - (time.perf_counter() - start_time)
+                    if delay > 0:
+                        time.sleep(delay)
+            self.process(record)
+        return self.stats(time.perf_counter() - start_time)
+
+    def stats(self, elapsed: float) -> dict:
+        """
+        :param elapsed: Lama replay (detik).
+        :return: Dict jumlah record, snapshot, event, pesan, dan laju per detik.
+        """
+        return {
+            "records": self.records,
+            "snapshots": self.snapshots,
+            "events": self.events,
+            "messages": self.messages,
+            "skipped": self.skipped,
+            "elapsed_s": elapsed,
+            "records_per_s": self.records / elapsed if elapsed > 0 else 0.0,
+            "events_per_s": self.events / elapsed if elapsed > 0 else 0.0,
+        }
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(prog="replay", description="Memutar ulang rekaman clearinghouseState lewat pipeline notifikasi")
+    parser.add_argument("paths", nargs="+", help="File rekaman JSONL (.jsonl, .jsonl.gz, .jsonl.zst), diputar berurutan")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH, help="File tujuan pesan hasil render ('-' untuk tidak disimpan)")
+    parser.add_argument("--speed", type=float, default=0.0, help="Pengali kecepatan terhadap waktu rekaman (0 = secepat mungkin)")
+    parser.add_argument("--profile", action="store_true", help="Tampilkan 20 fungsi terlama (cProfile)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output != '-' else None
+    sink = (lambda text: output.write(text + MESSAGE_SEPARATOR)) if output is not None else (lambda text: None)
+    replayer = Replayer(sink, args.speed)
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        stats = replayer.run(read_records(args.paths))
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if output is not None:
+            output.close()
+
+    print(f"{stats['records']} record ({stats['snapshots']} snapshot, {stats['skipped']} dilewati) dalam {stats['elapsed_s']:.2f}s")
+    print(f"{stats['events']} event, {stats['messages']} pesan | {stats['records_per_s']:.0f} record/s | {stats['events_per_s']:.0f} event/s")
+    if output is not None:
+        print(f"Pesan disimpan ke {args.output}")
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import time
+from .ratelimit import TokenBucket
+
+DEFAULT_MIN_INTERVAL = 15.0
+DEFAULT_MAX_INTERVAL = 300.0
+DEFAULT_BASE_INTERVAL = 60.0
+# Anggaran request clearinghouseState per menit untuk semua alamat
+DEFAULT_BUDGET_PER_MINUTE = 500.0
+# Faktor pengali interval setelah ada aktivitas / saat wallet diam
+ACTIVITY_FACTOR = 0.5
+IDLE_FACTOR = 1.5
+
+class AdaptiveScheduler:
+    """
+    Penjadwal polling per alamat berbasis deadline (priority queue).
+
+    Setiap alamat punya interval sendiri: dipendekkan setelah ada perubahan
+    posisi dan diperpanjang selama wallet diam, dalam batas
+    [min_interval, max_interval]. Deadline berikutnya dihitung dari deadline
+    yang direncanakan (bukan dari waktu selesai) sehingga periode tidak
+    bergeser. Anggaran request global dibatasi dengan token bucket; alamat
+    yang dipin selalu memakai min_interval dan didahulukan.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL,
+                 base_interval: float = DEFAULT_BASE_INTERVAL, budget_per_minute: float = DEFAULT_BUDGET_PER_MINUTE,
+                 pinned=None):
+        """
+        :param min_interval: Interval terpendek per alamat (detik).
+        :param max_interval: Interval terpanjang per alamat (detik).
+        :param base_interval: Interval awal untuk alamat baru (detik).
+        :param budget_per_minute: Jumlah request maksimum per menit untuk semua alamat.
+        :param pinned: Set alamat prioritas tinggi (dibaca setiap sinkronisasi).
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base_interval = min(max(base_interval, min_interval), max_interval)
+        self.budget = TokenBucket(budget_per_minute / 60.0, capacity=max(1.0, budget_per_minute / 4))
+        self.pinned = pinned if pinned is not None else set()
+        self._heap = []
+        self._counter = itertools.count()
+        self._entries = {}      # alamat -> (deadline, seq) entri heap yang masih berlaku
+        self._intervals = {}
+        self._in_flight = {}    # alamat -> deadline yang direncanakan saat diambil
+        self._pinned_seen = set()
+        self.deferred = 0
+
+    def _push(self, address: str, deadline: float) -> None:
+        # Alamat yang dipin mendapat prioritas lebih tinggi pada deadline yang sama
+        priority = 0 if address in self.pinned else 1
+        seq = next(self._counter)
+        self._entries[address] = (deadline, seq)
+        heapq.heappush(self._heap, (deadline, priority, seq, address))
+
+    def sync(self, addresses, now: float = None) -> None:
+        """
+        Menyamakan jadwal dengan daftar alamat terbaru dan status pin.
+
+        :param addresses: Iterable alamat yang dipantau.
+        :param now: Waktu monotonic sekarang (opsional).
+        """
+        now = now if now is not None else time.monotonic()
+        wanted = set(addresses)
+
+        for address in list(self._intervals):
+            if address not in wanted:
+                self._intervals.pop(address, None)
+                self._entries.pop(address, None)
+
+        for address in addresses:
+            if address not in self._intervals:
+                self._intervals[address] = self.base_interval
+                self._push(address, now)
+
+        pinned = set(self.pinned) & wanted
+        for address in pinned - self._pinned_seen:
+            # Pin baru: langsung dijadwalkan sekarang dengan interval minimum
+            self._intervals[address] = self.min_interval
+            if address not in self._in_flight:
+                self._push(address, now)
+        self._pinned_seen = pinned
+
+    def pop_due(self, now: float = None, limit: int = None) -> list:
+        """
+        Mengambil alamat yang deadline-nya sudah lewat, dibatasi anggaran request.
+
+        :param now: Waktu monotonic sekarang (opsional).
+        :param limit: Jumlah maksimum alamat (opsional).
+        :return: List alamat yang harus di-poll sekarang.
+        """
+        now = now if now is not None else time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            if limit is not None and len(due) >= limit:
+                break
+            deadline, _, seq, address = self._heap[0]
+            if self._entries.get(address) != (deadline, seq):
+                heapq.heappop(self._heap)
+                continue
+            if self.budget.try_acquire() > 0:
+                # Anggaran habis: sisa alamat menunggu token berikutnya
+                self.deferred += 1
+                break
+            heapq.heappop(self._heap)
+            del self._entries[address]
+            self._in_flight[address] = deadline
+            due.append(address)
+        return due
+
+    def complete(self, address: str, active: bool, now: float = None) -> None:
+        """
+        Menjadwalkan ulang alamat setelah di-poll.
+
+        :param address: Alamat yang selesai di-poll.
+        :param active: True jika ada perubahan posisi pada poll ini.
+        :param now: Waktu monotonic sekarang (opsional).
+        """
+        now = now if now is not None else time.monotonic()
+        planned = self._in_flight.pop(address, now)
+        if address not in self._intervals:
+            return
+
+        if address in self.pinned:
+            interval = self.min_interval
+        elif active:
+            interval = max(self.min_interval, self._intervals[address] * ACTIVITY_FACTOR)
+        else:
+            interval = min(self.max_interval, self._intervals[address] * IDLE_FACTOR)
+        self._intervals[address] = interval
+
+        next_deadline = planned + interval
+        self._push(address, next_deadline if next_deadline > now else now)
+
+    def time_until_next(self, now: float = None) -> float:
+        """
+        :return: Detik sampai deadline terdekat (0 jika sudah ada yang jatuh tempo).
+        """
+        now = now if now is not None else time.monotonic()
+        while self._heap:
+            deadline, _, seq, address = self._heap[0]
+            if self._entries.get(address) != (deadline, seq):
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, deadline - now, self.budget.wait_time() if deadline <= now else 0.0)
+        return self.max_interval
+
+    def interval(self, address: str) -> float | None:
+        return self._intervals.get(address)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah alamat, interval min/rata-rata/max, jumlah yang dipin, dan penundaan karena anggaran.
+        """
+        intervals = list(self._intervals.values())
+        return {
+            "addresses": len(intervals),
+            "min_interval": min(intervals) if intervals else 0.0,
+            "avg_interval": sum(intervals) / len(intervals) if intervals else 0.0,
+            "max_interval": max(intervals) if intervals else 0.0,
+            "pinned": len(self._pinned_seen),
+            "deferred": self.deferred,
+        }
@@ -0,0 +1,234 @@
+import logging
+import multiprocessing
+import queue
+import time
+import zlib
+
+DEFAULT_CONTROL_POLL = 0.5
+
+def shard_for(user_address: str, n_shards: int) -> int:
+    """
+    Menentukan shard sebuah alamat dengan hash stabil (sama di semua proses dan restart).
+
+    :param user_address: Alamat pengguna.
+    :param n_shards: Jumlah shard.
+    :return: Nomor shard 0..n_shards-1.
+    """
+    return zlib.crc32(user_address.lower().encode()) % n_shards
+
+def partition(addresses, n_shards: int) -> list:
+    """
+    :return: List berisi n_shards list alamat.
+    """
+    shards = [[] for _ in range(n_shards)]
+    for address in addresses:
+        shards[shard_for(address, n_shards)].append(address)
+    return shards
+
+def _worker_main(shard_id: int, control_queue, result_queue, settings: dict) -> None:
+    """
+    Loop proses worker: mem-poll dan men-diff alamat di shard-nya sendiri, lalu
+    mengirim hasil per siklus ke proses utama lewat result_queue.
+    """
+    from . import hyperliquid
+    from .http_client import api_client
+    from .hyperliquid import get_leaderboard_base_info, api_governor
+    from .poller import poll_addresses
+    from .positions import modify_data, diff_positions
+    from .scheduler import AdaptiveScheduler
+
+    logging.getLogger().setLevel(settings.get('log_level', logging.WARNING))
+    api_client.configure(**settings.get('http', {}))
+    ratelimit_settings = dict(settings.get('ratelimit', {}))
+    if 'weight_per_minute' in ratelimit_settings:
+        api_governor.configure(ratelimit_settings.pop('weight_per_minute'))
+    for name, value in ratelimit_settings.items():
+        setattr(api_governor, name, value)
+    if settings.get('api_url'):
+        hyperliquid.API_URL = settings['api_url']
+    if settings.get('recorder'):
+        from .recorder import ResponseRecorder
+        hyperliquid.response_recorder = ResponseRecorder(prefix=f"responses-shard{shard_id}", **settings['recorder'])
+        hyperliquid.response_recorder.start()
+    scheduler = AdaptiveScheduler(**settings.get('scheduler', {}))
+    concurrency = settings.get('concurrency', 16)
+    addresses = []
+    previous = {}
+
+    while True:
+        # Perubahan daftar alamat dari proses utama; blok sebentar hanya jika tidak ada yang jatuh tempo
+        timeout = min(scheduler.time_until_next(), DEFAULT_CONTROL_POLL) if addresses else DEFAULT_CONTROL_POLL
+        try:
+            command = control_queue.get(timeout=max(timeout, 0.01))
+            while True:
+                if command is None:
+                    return
+                kind, payload = command
+                if kind == 'assign':
+                    added, removed = payload
+                    for address in removed:
+                        previous.pop(address, None)
+                    previous.update({address: state for address, state in added.items() if state is not None})
+                    removed = set(removed)
+                    addresses = [a for a in addresses if a not in removed] + [a for a in added if a not in addresses]
+                elif kind == 'pin':
+                    scheduler.pinned.clear()
+                    scheduler.pinned.update(payload)
+                command = control_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        scheduler.sync(addresses)
+        due_addresses = scheduler.pop_due()
+        if not due_addresses:
+            continue
+
+        start_time = time.perf_counter()
+        results, fetch_time = poll_addresses(due_addresses, get_leaderboard_base_info, concurrency)
+        batch = []
+        for address in due_addresses:
+            info = results.get(address)
+            if address not in previous and address not in addresses:
+                # Alamat dihapus selagi request berjalan
+                continue
+            if isinstance(info, str) or info is None:
+                batch.append((address, None, None, info or "no result"))
+                scheduler.complete(address, False)
+                continue
+            positions = modify_data(info)
+            events = diff_positions(previous[address], positions) if address in previous else None
+            previous[address] = positions
+            batch.append((address, positions, events, None))
+            scheduler.complete(address, bool(events))
+        result_queue.put((shard_id, batch, fetch_time, time.perf_counter() - start_time))
+
+class ShardManager:
+    """
+    Membagi alamat ke N proses worker berdasarkan hash stabil.
+
+    Worker mem-poll, mem-parse, dan men-diff shard-nya sendiri (di luar GIL
+    proses utama) dan mengirim event ke proses utama, satu-satunya pemilik
+    dispatcher Telegram. Perubahan daftar alamat hanya dikirim ke shard
+    yang terdampak.
+    """
+
+    def __init__(self, n_shards: int, settings: dict = None, start_method: str = None):
+        """
+        :param n_shards: Jumlah proses worker.
+        :param settings: Pengaturan worker (api_url, concurrency, http, scheduler, ratelimit, recorder, log_level).
+        :param start_method: Metode multiprocessing (None = default platform). Worker hanya menerima
+                             settings yang bisa di-pickle dan mengimpor modulnya sendiri, sehingga juga
+                             berjalan dengan "spawn"/"forkserver" tanpa mewarisi thread proses utama.
+        """
+        self.n_shards = max(1, n_shards)
+        self.settings = dict(settings or {})
+        self._context = multiprocessing.get_context(start_method)
+        self.result_queue = self._context.Queue()
+        self._controls = [None] * self.n_shards
+        self._processes = [None] * self.n_shards
+        self._assigned = [set() for _ in range(self.n_shards)]
+        # Pin terakhir per shard, dikirim ulang ke worker yang dijalankan ulang
+        self._pinned = [set() for _ in range(self.n_shards)]
+        self.restarts = 0
+
+    def _spawn(self, shard_id: int) -> None:
+        control = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main, args=(shard_id, control, self.result_queue, self.settings),
+            name=f"shard-{shard_id}", daemon=True,
+        )
+        process.start()
+        self._controls[shard_id] = control
+        self._processes[shard_id] = process
+
+    def start(self) -> None:
+        """
+        Menjalankan semua proses worker (sebaiknya sebelum thread lain dibuat).
+        """
+        for shard_id in range(self.n_shards):
+            self._spawn(shard_id)
+
+    def update(self, addresses, states: dict = None) -> list:
+        """
+        Menyamakan penugasan shard dengan daftar alamat terbaru.
+
+        :param addresses: Daftar alamat yang dipantau.
+        :param states: Dict alamat -> dict coin -> Position untuk alamat baru (agar worker tidak mulai dari nol).
+        :return: List nomor shard yang berubah.
+        """
+        states = states or {}
+        wanted = partition(addresses, self.n_shards)
+        changed = []
+        for shard_id, shard_addresses in enumerate(wanted):
+            shard_set = set(shard_addresses)
+            added = [a for a in shard_addresses if a not in self._assigned[shard_id]]
+            removed = [a for a in self._assigned[shard_id] if a not in shard_set]
+            if not added and not removed:
+                continue
+            self._controls[shard_id].put(('assign', ({a: states.get(a) for a in added}, removed)))
+            self._assigned[shard_id] = shard_set
+            changed.append(shard_id)
+        if changed:
+            logging.info(f"Shard diperbarui: {changed} ({len(addresses)} alamat di {self.n_shards} shard)")
+        return changed
+
+    def set_pinned(self, pinned) -> None:
+        """
+        :param pinned: Set alamat yang dipin; diteruskan ke worker pemiliknya.
+        """
+        by_shard = [set() for _ in range(self.n_shards)]
+        for address in pinned:
+            by_shard[shard_for(address, self.n_shards)].add(address)
+        self._pinned = by_shard
+        for shard_id, control in enumerate(self._controls):
+            control.put(('pin', by_shard[shard_id]))
+
+    def check_workers(self, states: dict = None) -> list:
+        """
+        Menjalankan ulang worker yang mati lalu menugaskan ulang alamat dan pin terakhirnya.
+
+        :param states: Dict alamat -> dict coin -> Position terbaru dari proses utama.
+        :return: List nomor shard yang dijalankan ulang.
+        """
+        states = states or {}
+        restarted = []
+        for shard_id, process in enumerate(self._processes):
+            if process is not None and not process.is_alive():
+                logging.error(f"Worker shard {shard_id} berhenti (exit code {process.exitcode}), menjalankan ulang.")
+                self._spawn(shard_id)
+                self._controls[shard_id].put(('assign', ({a: states.get(a) for a in self._assigned[shard_id]}, [])))
+                self._controls[shard_id].put(('pin', self._pinned[shard_id]))
+                self.restarts += 1
+                restarted.append(shard_id)
+        return restarted
+
+    def get_results(self, timeout: float = 1.0) -> list:
+        """
+        Mengambil semua batch hasil worker yang tersedia.
+
+        :param timeout: Waktu tunggu maksimum untuk batch pertama (detik).
+        :return: List tuple (shard_id, batch, fetch_time, cycle_time); batch berisi
+                 (alamat, positions, events, error).
+        """
+        try:
+            results = [self.result_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                results.append(self.result_queue.get_nowait())
+            except queue.Empty:
+                return results
+
+    def shard_sizes(self) -> list:
+        return [len(assigned) for assigned in self._assigned]
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for control in self._controls:
+            if control is not None:
+                control.put(None)
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
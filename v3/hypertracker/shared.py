@@ -0,0 +1,18 @@
+# shared.py
+from .registry import AddressRegistry
+from .exposure import ExposureTracker
+
+# Daftar alamat yang dipantau (dimuat oleh main.py saat startup)
+address_registry = AddressRegistry()
+
+# Penyimpanan riwayat posisi (diisi oleh main.py jika diaktifkan)
+history_store = None
+
+# Alamat prioritas tinggi yang dipin lewat perintah /pin (selalu di-poll dengan interval minimum)
+pinned_addresses = set()
+
+# Eksposur long/short lintas alamat per coin (diperbarui oleh main.py setiap snapshot)
+exposure_tracker = ExposureTracker()
+
+# State posisi terakhir per alamat milik node ini (PositionStateStore, diisi oleh main.py)
+position_states = None
@@ -0,0 +1,113 @@
+import threading
+import time
+
+DEFAULT_FRESHNESS = 2.0
+DEFAULT_MAX_ENTRIES = 10000
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'finished_at')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = 0.0
+
+class SingleFlight:
+    """
+    Menggabungkan request yang sama (per key) yang berjalan bersamaan.
+
+    Pemanggil pertama menjalankan fungsi; pemanggil lain dengan key yang
+    sama menunggu hasil yang sama. Hasil yang berhasil dipakai ulang selama
+    `freshness` detik; exception diteruskan ke semua penunggu tetapi tidak
+    di-cache.
+    """
+
+    def __init__(self, freshness: float = DEFAULT_FRESHNESS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        :param freshness: Lama hasil dianggap segar (detik); 0 = hanya menggabungkan request yang sedang berjalan.
+        :param max_entries: Batas jumlah hasil yang disimpan sebelum entri kedaluwarsa dibersihkan.
+        """
+        self.freshness = freshness
+        self.max_entries = max_entries
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+        self.cached = 0
+
+    def do(self, key, function):
+        """
+        :param key: Key request, misalnya (tipe request, alamat).
+        :param function: Fungsi tanpa argumen yang mengambil data.
+        :return: Hasil function (milik sendiri, dari request yang sedang berjalan, atau dari cache).
+        :raises Exception: Exception dari function diteruskan ke semua pemanggil yang menunggu.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                if not call.event.is_set():
+                    self.shared += 1
+                    leader = False
+                elif call.error is None and time.monotonic() - call.finished_at < self.freshness:
+                    self.cached += 1
+                    return call.result
+                else:
+                    call = None
+            if call is None:
+                if len(self._calls) >= self.max_entries:
+                    self._evict()
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if isinstance(call.error, Exception):
+                raise call.error
+            if call.error is not None:
+                # Leader dihentikan (KeyboardInterrupt/SystemExit); jangan teruskan sinyal itu ke thread lain
+                raise RuntimeError(f"Request {key!r} dibatalkan: {call.error!r}")
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+        finally:
+            # Selalu dipublikasikan agar penunggu tidak tertahan selamanya
+            call.finished_at = time.monotonic()
+            with self._lock:
+                if call.error is not None or self.freshness <= 0:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+            call.event.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key, call in list(self._calls.items()):
+            if call.event.is_set() and now - call.finished_at >= self.freshness:
+                del self._calls[key]
+
+    def forget(self, key) -> None:
+        """
+        Membuang hasil yang di-cache untuk key tertentu, termasuk request yang sedang
+        berjalan (yang mungkin dimulai sebelum data berubah): request berikutnya pasti ke server.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        :return: Dict jumlah request yang dijalankan, yang ikut request berjalan, dan yang dilayani cache.
+        """
+        total = self.executed + self.shared + self.cached
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+            "cached": self.cached,
+            "coalesced_ratio": (self.shared + self.cached) / total if total else 0.0,
+        }
@@ -0,0 +1,111 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from .positions import Position
+
+DEFAULT_STATE_PATH = 'tracker_state.db'
+
+class StateStore:
+    """
+    Snapshot state tracker (posisi terakhir per alamat) di SQLite.
+
+    Setiap checkpoint ditulis dalam satu transaksi sehingga file selalu
+    berisi snapshot siklus yang utuh, dan bisa dipulihkan saat startup
+    agar restart tidak mengirim ulang semua "current positions".
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH, journal_mode: str = 'WAL'):
+        """
+        :param path: Lokasi file SQLite.
+        :param journal_mode: "WAL" untuk disk lokal; "DELETE" jika file dipakai bersama lewat filesystem jaringan (mode cluster).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tracker_state ("
+            "address TEXT PRIMARY KEY, positions TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def load(self, addresses=None) -> dict:
+        """
+        Memuat state yang tersimpan.
+
+        :param addresses: Batasi ke alamat tertentu (opsional).
+        :return: Dict alamat -> dict coin -> Position.
+        """
+        states = {}
+        self.load_into(states, addresses)
+        return states
+
+    def load_into(self, target, addresses=None) -> int:
+        """
+        Memuat state baris per baris langsung ke `target` (misalnya PositionStateStore),
+        tanpa membangun salinan seluruh state di memori terlebih dahulu.
+
+        :param target: Objek mapping alamat -> dict coin -> Position.
+        :param addresses: Batasi ke alamat tertentu (opsional).
+        :return: Jumlah alamat yang dimuat.
+        """
+        start_time = time.perf_counter()
+        wanted = set(addresses) if addresses is not None else None
+        count = 0
+        with self._lock:
+            for address, blob in self._conn.execute("SELECT address, positions FROM tracker_state"):
+                if wanted is not None and address not in wanted:
+                    continue
+                target[address] = {values[0]: Position.from_tuple(values) for values in json.loads(blob)}
+                count += 1
+        logging.info(f"State {count} alamat dipulihkan dari {self.path} dalam {(time.perf_counter() - start_time) * 1000:.2f}ms")
+        return count
+
+    def save(self, states: dict) -> bool:
+        """
+        Menyimpan state beberapa alamat secara atomik (satu transaksi).
+
+        :param states: Dict alamat -> dict coin -> Position.
+        :return: True jika tersimpan (atau tidak ada yang disimpan), False jika transaksi gagal.
+        """
+        if not states:
+            return True
+        now = time.time()
+        rows = [
+            (address, json.dumps([p.to_tuple() for p in positions.values()], separators=(',', ':')), now)
+            for address, positions in states.items()
+        ]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO tracker_state (address, positions, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(address) DO UPDATE SET positions = excluded.positions, updated_at = excluded.updated_at",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except sqlite3.Error as e:
+                # BEGIN bisa gagal (misalnya database terkunci) sehingga belum ada transaksi untuk di-rollback
+                if self._conn.in_transaction:
+                    try:
+                        self._conn.execute("ROLLBACK")
+                    except sqlite3.Error as rollback_error:
+                        logging.error(f"Gagal rollback state di {self.path}: {rollback_error}")
+                logging.error(f"Gagal menyimpan state ke {self.path}: {e}")
+                return False
+
+    def delete(self, addresses) -> None:
+        """
+        Menghapus state alamat yang tidak lagi dipantau.
+
+        :param addresses: Iterable alamat.
+        """
+        with self._lock:
+            self._conn.executemany("DELETE FROM tracker_state WHERE address = ?", [(a,) for a in addresses])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from .hyperliquid import parse_clearinghouse_state
+from .codec import loads
+from .poller import poll_addresses, DEFAULT_CONCURRENCY
+
+WS_URL = "wss://api.hyperliquid.xyz/ws"
+
+# Jumlah alamat yang dilayani satu koneksi websocket
+DEFAULT_ADDRESSES_PER_CONNECTION = 50
+# Interval ping aplikasi; server menutup koneksi yang diam selama 60 detik
+PING_INTERVAL = 50.0
+# Batas backoff reconnect (detik)
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+# Interval pengecekan perubahan daftar alamat (detik)
+WATCHLIST_REFRESH_INTERVAL = 5.0
+# Jumlah batch rekonsiliasi REST yang berjalan bersamaan
+DEFAULT_RECONCILE_CONCURRENCY = 4
+
+def _subscription_messages(method: str, user_address: str) -> list:
+    """
+    Membuat pesan subscribe/unsubscribe untuk channel state dan fills satu alamat.
+
+    :param method: "subscribe" atau "unsubscribe".
+    :param user_address: Alamat pengguna.
+    :return: List string JSON siap kirim.
+    """
+    return [
+        json.dumps({"method": method, "subscription": {"type": "webData2", "user": user_address}}),
+        json.dumps({"method": method, "subscription": {"type": "userFills", "user": user_address}}),
+    ]
+
+class _StreamConnection:
+    """
+    Satu koneksi websocket yang membawa subscription untuk sekumpulan alamat.
+    """
+
+    def __init__(self, stream, connection_id: int):
+        self.stream = stream
+        self.connection_id = connection_id
+        self.addresses = set()
+        self.ws = None
+        self.task = None
+
+    async def add(self, addresses: list) -> list:
+        """
+        Berlangganan sekumpulan alamat tanpa menunggu rekonsiliasi.
+
+        :param addresses: Alamat baru untuk koneksi ini.
+        :return: Alamat yang sudah di-subscribe di koneksi aktif dan perlu direkonsiliasi
+                 (koneksi yang belum terhubung merekonsiliasi semuanya sendiri setelah terhubung).
+        """
+        self.addresses.update(addresses)
+        if self.ws is None:
+            return []
+        for user_address in addresses:
+            for message in _subscription_messages("subscribe", user_address):
+                await self.ws.send(message)
+        return list(addresses)
+
+    async def remove(self, addresses: list) -> None:
+        self.addresses.difference_update(addresses)
+        if self.ws is not None:
+            for user_address in addresses:
+                for message in _subscription_messages("unsubscribe", user_address):
+                    await self.ws.send(message)
+
+    async def run(self) -> None:
+        import websockets
+
+        backoff = BACKOFF_MIN
+        while True:
+            try:
+                async with websockets.connect(self.stream.url, ping_interval=None, max_size=None) as ws:
+                    for user_address in list(self.addresses):
+                        for message in _subscription_messages("subscribe", user_address):
+                            await ws.send(message)
+                    self.ws = ws
+                    logging.info(f"Websocket #{self.connection_id} terhubung ({len(self.addresses)} alamat)")
+
+                    # Snapshot REST menutup celah event yang terlewat selama koneksi terputus
+                    await self.stream.reconcile(list(self.addresses))
+                    backoff = BACKOFF_MIN
+
+                    pinger = asyncio.create_task(self._ping(ws))
+                    try:
+                        async for raw in ws:
+                            await self.stream.handle_message(raw)
+                    finally:
+                        pinger.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Websocket #{self.connection_id} terputus: {e}")
+            finally:
+                self.ws = None
+
+            # Backoff eksponensial dengan jitter sebelum reconnect
+            delay = backoff * random.uniform(0.5, 1.5)
+            logging.info(f"Websocket #{self.connection_id} reconnect dalam {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, BACKOFF_MAX)
+
+    async def _ping(self, ws) -> None:
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            await ws.send(json.dumps({"method": "ping"}))
+
+class PositionStream:
+    """
+    Mode streaming: berlangganan channel websocket per alamat dan meneruskan
+    setiap push `clearinghouseState` ke jalur diff/notifikasi yang sama dengan mode polling.
+
+    Banyak subscription dimultipleks ke sedikit koneksi, setiap koneksi
+    reconnect + resubscribe dengan backoff, dan setelah setiap koneksi
+    (ulang) dilakukan rekonsiliasi dengan snapshot REST.
+    """
+
+    def __init__(self, get_addresses, on_snapshot, fetch_snapshot, url: str = WS_URL,
+                 addresses_per_connection: int = DEFAULT_ADDRESSES_PER_CONNECTION,
+                 concurrency: int = DEFAULT_CONCURRENCY, invalidate_snapshot=None,
+                 reconcile_concurrency: int = DEFAULT_RECONCILE_CONCURRENCY):
+        """
+        :param get_addresses: Fungsi tanpa argumen yang mengembalikan daftar alamat yang dipantau.
+        :param on_snapshot: Callback (user_address, leaderboard_info) untuk jalur diff/notifikasi.
+        :param fetch_snapshot: Fungsi REST (misalnya get_leaderboard_base_info) untuk rekonsiliasi.
+        :param url: URL websocket.
+        :param addresses_per_connection: Jumlah alamat maksimum per koneksi.
+        :param concurrency: Concurrency request REST saat rekonsiliasi.
+        :param invalidate_snapshot: Fungsi (user_address) yang membuang snapshot REST yang di-cache sebelum rekonsiliasi karena fill (opsional).
+        :param reconcile_concurrency: Jumlah batch rekonsiliasi yang berjalan bersamaan (per koneksi, reconnect, atau fill).
+        """
+        self.get_addresses = get_addresses
+        self.on_snapshot = on_snapshot
+        self.fetch_snapshot = fetch_snapshot
+        self.url = url
+        self.addresses_per_connection = max(1, int(addresses_per_connection))
+        self.concurrency = concurrency
+        self.invalidate_snapshot = invalidate_snapshot
+        self._reconcile_slots = asyncio.Semaphore(max(1, int(reconcile_concurrency)))
+        self.connections = []
+        self._owner = {}
+        self._pending = set()
+        # Satu worker agar snapshot diproses berurutan dan state diff tidak perlu lock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-diff")
+
+    async def _dispatch(self, user_address: str, leaderboard_info) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.on_snapshot, user_address, leaderboard_info)
+
+    async def handle_message(self, raw: str) -> None:
+        """
+        Memproses satu pesan dari websocket.
+
+        :param raw: Pesan JSON mentah.
+        """
+        try:
+            message = loads(raw)
+        except ValueError:
+            logging.warning(f"Pesan websocket tidak valid: {raw[:100]}")
+            return
+
+        channel = message.get("channel")
+        data = message.get("data") or {}
+        user_address = data.get("user")
+
+        if channel == "webData2" and user_address in self._owner:
+            state = data.get("clearinghouseState")
+            if state is not None:
+                await self._dispatch(user_address, parse_clearinghouse_state(user_address, state))
+        elif channel == "userFills" and user_address in self._owner and not data.get("isSnapshot"):
+            # Fill baru: ambil snapshot segera tanpa menunggu push state berikutnya;
+            # snapshot yang di-cache bisa berasal dari sebelum fill, jadi dibuang dulu
+            if self.invalidate_snapshot is not None:
+                self.invalidate_snapshot(user_address)
+            task = asyncio.create_task(self.reconcile([user_address]))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        elif channel == "error":
+            logging.error(f"Error dari websocket: {data}")
+
+    async def reconcile(self, addresses: list) -> None:
+        """
+        Mengambil snapshot REST untuk alamat dan meneruskannya ke jalur diff.
+
+        :param addresses: Daftar alamat yang perlu direkonsiliasi.
+        """
+        if not addresses:
+            return
+        # Banyak koneksi yang reconnect bersamaan tidak menumpuk thread poller tanpa batas
+        async with self._reconcile_slots:
+            results, _ = await asyncio.to_thread(poll_addresses, addresses, self.fetch_snapshot, self.concurrency)
+        for user_address, leaderboard_info in results.items():
+            if user_address in self._owner:
+                await self._dispatch(user_address, leaderboard_info)
+
+    async def _sync_watchlist(self) -> None:
+        """
+        Menyamakan subscription dengan daftar alamat terbaru; hanya selisihnya yang diubah.
+
+        Semua alamat baru di-subscribe lebih dulu, lalu direkonsiliasi bersamaan
+        per koneksi sehingga satu batch besar tidak menunggu snapshot REST satu per satu.
+        """
+        wanted = list(dict.fromkeys(self.get_addresses()))
+        wanted_set = set(wanted)
+
+        removed = {}
+        for user_address in [a for a in self._owner if a not in wanted_set]:
+            removed.setdefault(self._owner.pop(user_address), []).append(user_address)
+        for connection, addresses in removed.items():
+            await connection.remove(addresses)
+
+        added = {}
+        for user_address in wanted:
+            if user_address in self._owner:
+                continue
+            connection = next((c for c in self.connections
+                               if len(c.addresses) + len(added.get(c, ())) < self.addresses_per_connection), None)
+            if connection is None:
+                connection = _StreamConnection(self, len(self.connections))
+                self.connections.append(connection)
+            self._owner[user_address] = connection
+            added.setdefault(connection, []).append(user_address)
+        subscribed = [await connection.add(addresses) for connection, addresses in added.items()]
+        await asyncio.gather(*(self.reconcile(addresses) for addresses in subscribed if addresses))
+
+        for connection in self.connections:
+            if connection.task is None and connection.addresses:
+                connection.task = asyncio.create_task(connection.run())
+            elif connection.task is not None and not connection.addresses:
+                # Koneksi tanpa alamat ditutup; slotnya dipakai lagi saat ada alamat baru
+                connection.task.cancel()
+                connection.task = None
+
+    async def close(self) -> None:
+        """
+        Menutup semua koneksi websocket dan membatalkan rekonsiliasi yang masih berjalan.
+        """
+        tasks = [c.task for c in self.connections if c.task is not None] + list(self._pending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for connection in self.connections:
+            connection.task = None
+
+    async def run(self) -> None:
+        """
+        Menjalankan mode streaming sampai dibatalkan.
+        """
+        try:
+            import websockets  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Mode streaming membutuhkan paket 'websockets' (pip install websockets).")
+
+        try:
+            while True:
+                try:
+                    await self._sync_watchlist()
+                except Exception as e:
+                    logging.error(f"Gagal menyinkronkan subscription websocket: {e}")
+                await asyncio.sleep(WATCHLIST_REFRESH_INTERVAL)
+        finally:
+            await self.close()
@@ -0,0 +1,436 @@
+import asyncio
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COINS = ["BTC", "ETH", "SOL", "HYPE", "ARB", "OP", "DOGE", "AVAX", "LINK", "SUI",
+         "APT", "TIA", "SEI", "INJ", "WIF", "PEPE", "BNB", "XRP", "LTC", "NEAR"]
+
+def _coin_name(index: int) -> str:
+    return COINS[index] if index < len(COINS) else f"COIN{index}"
+
+def make_clearinghouse_state(user_address: str, n_positions: int, seed: int = 0) -> dict:
+    """
+    Membuat respons `clearinghouseState` sintetis dengan format API asli (angka sebagai string).
+
+    :param user_address: Alamat pengguna (ikut menentukan isi agar tiap alamat berbeda).
+    :param n_positions: Jumlah posisi.
+    :param seed: Seed tambahan, misalnya nomor siklus.
+    :return: Dict clearinghouseState.
+    """
+    rng = random.Random(f"{user_address}:{seed}")
+    asset_positions = []
+    total_notional = 0.0
+    for i in range(n_positions):
+        size = rng.uniform(-100, 100) or 1.0
+        entry_price = rng.uniform(1, 50000)
+        leverage = rng.randint(1, 50)
+        position_value = abs(size) * entry_price
+        total_notional += position_value
+        asset_positions.append({
+            "type": "oneWay",
+            "position": {
+                "coin": _coin_name(i),
+                "szi": f"{size:.5f}",
+                "leverage": {"type": "cross", "value": leverage},
+                "entryPx": f"{entry_price:.2f}",
+                "positionValue": f"{position_value:.2f}",
+                "unrealizedPnl": f"{rng.uniform(-1000, 1000):.2f}",
+                "returnOnEquity": f"{rng.uniform(-1, 1):.6f}",
+                "liquidationPx": f"{rng.uniform(1, 50000):.2f}",
+                "marginUsed": f"{position_value / leverage:.2f}",
+                "maxLeverage": 50,
+                "cumFunding": {"allTime": f"{rng.uniform(-100, 100):.2f}", "sinceOpen": "0.0", "sinceChange": "0.0"},
+            },
+        })
+    account_value = total_notional / 5 + 1000
+    return {
+        "marginSummary": {
+            "accountValue": f"{account_value:.2f}",
+            "totalNtlPos": f"{total_notional:.2f}",
+            "totalRawUsd": f"{account_value:.2f}",
+            "totalMarginUsed": f"{total_notional / 10:.2f}",
+        },
+        "crossMarginSummary": {},
+        "withdrawable": f"{account_value / 2:.2f}",
+        "assetPositions": asset_positions,
+        "time": 1700000000000,
+    }
+
+def make_meta_and_asset_ctxs(n_coins: int, seed: int = 0) -> list:
+    """
+    Membuat respons `metaAndAssetCtxs` sintetis.
+
+    :param n_coins: Jumlah coin di universe.
+    :param seed: Seed acak agar hasil bisa diulang.
+    :return: List [meta, assetCtxs].
+    """
+    rng = random.Random(seed)
+    universe = [{"name": _coin_name(i), "szDecimals": 2, "maxLeverage": 50} for i in range(n_coins)]
+    ctxs = []
+    for _ in range(n_coins):
+        price = rng.uniform(1, 50000)
+        ctxs.append({
+            "markPx": f"{price:.2f}",
+            "midPx": f"{price:.2f}",
+            "oraclePx": f"{price:.2f}",
+            "funding": f"{rng.uniform(-0.001, 0.001):.8f}",
+            "openInterest": f"{rng.uniform(0, 1e6):.2f}",
+            "dayNtlVlm": f"{rng.uniform(0, 1e8):.2f}",
+        })
+    return [{"universe": universe}, ctxs]
+
+def make_leaderboard(n_rows: int, seed: int = 0) -> dict:
+    """
+    Membuat dataset leaderboard sintetis dengan format stats-data Hyperliquid.
+
+    :param n_rows: Jumlah trader.
+    :param seed: Seed acak agar hasil bisa diulang.
+    :return: Dict {"leaderboardRows": [...]}.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        account_value = rng.lognormvariate(10, 2)
+        rows.append({
+            "ethAddress": f"0x{rng.getrandbits(160):040x}",
+            "accountValue": f"{account_value:.2f}",
+            "windowPerformances": [
+                [window, {
+                    "pnl": f"{rng.gauss(0, account_value * scale):.2f}",
+                    "roi": f"{rng.gauss(0, scale):.6f}",
+                    "vlm": f"{rng.uniform(0, account_value * 50 * scale):.2f}",
+                }]
+                for window, scale in (("day", 0.02), ("week", 0.05), ("month", 0.1), ("allTime", 0.5))
+            ],
+            "prize": 0,
+            "displayName": None if i % 3 else f"trader{i}",
+        })
+    return {"leaderboardRows": rows}
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Header dan body dikirim dalam satu write agar tidak terkena Nagle + delayed ACK
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.server.mock.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.server.mock.gzip_body(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+    def do_GET(self):
+        server = self.server.mock
+        if self.path != "/leaderboard":
+            self._reply(404, b'{"error":"not found"}')
+            return
+        server.count("leaderboard")
+        body, etag = server.leaderboard()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            self.wfile.flush()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+    def do_POST(self):
+        server = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path == "/info":
+            server.enter()
+            try:
+                if server.latency:
+                    time.sleep(server.latency)
+            finally:
+                server.leave()
+        elif server.latency:
+            time.sleep(server.latency)
+
+        if self.path == "/info":
+            try:
+                payload = json.loads(raw or b"{}")
+            except ValueError:
+                self._reply(400, b'{"error":"invalid json"}')
+                return
+            server.count("info")
+            request_type = payload.get("type")
+            if request_type == "clearinghouseState" and payload.get("user") in server.failing_users:
+                self._reply(422, b'{"error":"Failed to deserialize the JSON body into the target type"}')
+                return
+            if request_type == "clearinghouseState":
+                body = server.clearinghouse_body(payload.get("user", ""))
+            elif request_type == "metaAndAssetCtxs":
+                body = server.meta_body
+            else:
+                self._reply(422, b'{"error":"unknown type"}')
+                return
+            self._reply(200, body)
+        elif self.path.startswith("/bot") and self.path.endswith("/sendMessage"):
+            server.count("telegram")
+            try:
+                payload = json.loads(raw or b"{}")
+            except ValueError:
+                self._reply(400, b'{"ok":false,"error_code":400,"description":"Bad Request"}')
+                return
+            retry_after = server.telegram_response(payload)
+            if retry_after is not None:
+                self._reply(429, json.dumps({
+                    "ok": False, "error_code": 429, "description": f"Too Many Requests: retry after {retry_after}",
+                    "parameters": {"retry_after": retry_after},
+                }).encode())
+                return
+            self._reply(200, b'{"ok":true,"result":{"message_id":1}}')
+        else:
+            self._reply(404, b'{"error":"not found"}')
+
+class MockServer:
+    """
+    Server lokal pengganti Hyperliquid /info, leaderboard stats-data, dan Telegram sendMessage untuk benchmark offline.
+
+    Payload dibuat deterministik dari alamat dan `cycle`, lalu di-cache
+    sebagai bytes sehingga waktu server tidak ikut terukur; naikkan `cycle`
+    untuk mensimulasikan perubahan posisi antar siklus.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 n_positions: int = 5, n_coins: int = 200, leaderboard_rows: int = 1000, compress: bool = False):
+        """
+        :param host: Alamat bind.
+        :param port: Port (0 = pilih otomatis).
+        :param latency: Jeda tambahan per request (detik) untuk mensimulasikan jaringan.
+        :param n_positions: Jumlah posisi per alamat pada clearinghouseState.
+        :param n_coins: Jumlah coin pada metaAndAssetCtxs.
+        :param leaderboard_rows: Jumlah trader pada GET /leaderboard (berubah setiap `cycle`).
+        :param compress: True untuk mengirim body gzip jika klien mengiklankannya, seperti API asli.
+        """
+        self.latency = latency
+        self.compress = compress
+        self.n_positions = n_positions
+        self.cycle = 0
+        self.meta_body = json.dumps(make_meta_and_asset_ctxs(n_coins)).encode()
+        self.leaderboard_rows = leaderboard_rows
+        self.requests = {"info": 0, "telegram": 0, "leaderboard": 0}
+        # Alamat yang clearinghouseState-nya dijawab 422, dan jumlah request /info yang berjalan bersamaan
+        self.failing_users = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # sendMessage: jumlah respons 429 berikutnya beserta retry_after-nya, dan log (waktu, chat_id, teks, status)
+        self.telegram_rate_limits = 0
+        self.telegram_retry_after = 1
+        self.telegram_log = []
+        self._bodies = {}
+        self._gzipped = {}
+        self._leaderboard = None
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind: str) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def telegram_response(self, payload: dict):
+        """
+        Mencatat satu request sendMessage.
+
+        :return: retry_after jika request ini dijawab 429, selain itu None.
+        """
+        with self._lock:
+            limited = self.telegram_rate_limits > 0
+            if limited:
+                self.telegram_rate_limits -= 1
+            self.telegram_log.append((time.monotonic(), str(payload.get("chat_id")), payload.get("text", ""),
+                                      429 if limited else 200))
+            return self.telegram_retry_after if limited else None
+
+    def telegram_messages(self, chat_id: str = None) -> list:
+        """
+        :return: List (waktu monotonic, teks) pesan yang diterima (status 200), opsional hanya untuk satu chat.
+        """
+        with self._lock:
+            return [(at, text) for at, chat, text, status in self.telegram_log
+                    if status == 200 and (chat_id is None or chat == str(chat_id))]
+
+    def clearinghouse_body(self, user_address: str) -> bytes:
+        key = (user_address, self.cycle)
+        body = self._bodies.get(key)
+        if body is None:
+            body = json.dumps(make_clearinghouse_state(user_address, self.n_positions, self.cycle)).encode()
+            self._bodies[key] = body
+        return body
+
+    def gzip_body(self, body: bytes) -> bytes:
+        compressed = self._gzipped.get(body)
+        if compressed is None:
+            compressed = self._gzipped[body] = gzip.compress(body)
+        return compressed
+
+    def leaderboard(self) -> tuple:
+        """
+        :return: Tuple (body JSON leaderboard siklus ini, ETag).
+        """
+        with self._lock:
+            if self._leaderboard is None or self._leaderboard[0] != self.cycle:
+                body = json.dumps(make_leaderboard(self.leaderboard_rows, self.cycle)).encode()
+                self._leaderboard = (self.cycle, body, f'"lb-{self.cycle}"')
+            return self._leaderboard[1], self._leaderboard[2]
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+class MockWebSocketServer:
+    """
+    Server websocket lokal pengganti api.hyperliquid.xyz/ws untuk test mode streaming.
+
+    Mencatat subscription aktif per koneksi, dan bisa mengirim push
+    `webData2` / `userFills` ke koneksi yang berlangganan atau memutus semua
+    koneksi untuk mensimulasikan gangguan jaringan. Berjalan di event loop
+    pemanggil (butuh paket websockets).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, n_positions: int = 5):
+        """
+        :param host: Alamat bind.
+        :param port: Port (0 = pilih otomatis).
+        :param n_positions: Jumlah posisi per alamat pada push clearinghouseState.
+        """
+        self.host = host
+        self.port = port
+        self.n_positions = n_positions
+        self.connects = 0
+        self.log = []               # (method, tipe channel, alamat) sesuai urutan diterima
+        self._subscriptions = {}    # koneksi -> set (tipe channel, alamat)
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribed(self) -> set:
+        """
+        :return: Gabungan (tipe channel, alamat) yang sedang aktif di semua koneksi.
+        """
+        return set().union(*self._subscriptions.values())
+
+    async def _handler(self, ws) -> None:
+        self.connects += 1
+        subscriptions = self._subscriptions[ws] = set()
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                method = message.get("method")
+                if method == "ping":
+                    await ws.send(json.dumps({"channel": "pong"}))
+                    continue
+                subscription = message.get("subscription") or {}
+                key = (subscription.get("type"), subscription.get("user"))
+                self.log.append((method,) + key)
+                if method == "subscribe":
+                    subscriptions.add(key)
+                elif method == "unsubscribe":
+                    subscriptions.discard(key)
+                await ws.send(json.dumps({"channel": "subscriptionResponse", "data": message}))
+        except Exception:
+            pass
+        finally:
+            del self._subscriptions[ws]
+
+    async def _push(self, channel: str, user_address: str, data: dict) -> int:
+        sent = 0
+        for ws, subscriptions in list(self._subscriptions.items()):
+            if (channel, user_address) in subscriptions:
+                await ws.send(json.dumps({"channel": channel, "data": data}))
+                sent += 1
+        return sent
+
+    async def push_state(self, user_address: str, seed: int = 0) -> int:
+        """
+        Mengirim push webData2 berisi clearinghouseState sintetis.
+
+        :return: Jumlah koneksi yang menerima push.
+        """
+        state = make_clearinghouse_state(user_address, self.n_positions, seed)
+        return await self._push("webData2", user_address, {"user": user_address, "clearinghouseState": state})
+
+    async def push_fill(self, user_address: str, coin: str = "BTC") -> int:
+        """
+        Mengirim push userFills (bukan snapshot) untuk satu fill.
+
+        :return: Jumlah koneksi yang menerima push.
+        """
+        fill = {"coin": coin, "px": "50000.0", "sz": "0.1", "side": "B", "time": int(time.time() * 1000)}
+        return await self._push("userFills", user_address, {"user": user_address, "isSnapshot": False, "fills": [fill]})
+
+    async def drop_connections(self) -> None:
+        """
+        Memutus semua koneksi dari sisi server.
+        """
+        await asyncio.gather(*(ws.close() for ws in list(self._subscriptions)), return_exceptions=True)
+
+    async def start(self) -> "MockWebSocketServer":
+        from websockets.asyncio.server import serve
+        self._server = await serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "MockWebSocketServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
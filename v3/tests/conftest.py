@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Paket hypertracker dan mock_server.py diimpor dari direktori v3, sama seperti saat cli.py dijalankan dari sana
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
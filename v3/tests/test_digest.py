@@ -0,0 +1,27 @@
+from hypertracker.alerts import render_address_header, render_current_positions, render_new_position_message
+from hypertracker.digest import DigestBuffer, pack_digest
+from hypertracker.positions import Position
+
+A, B = "0x" + "a" * 40, "0x" + "b" * 40
+BTC = Position("BTC", 1.0, 10.0, 50000.0, 50000.0, 12.5)
+
+def test_renderer_header_flag():
+    full = render_new_position_message("BTC", BTC, A)
+    block = render_new_position_message("BTC", BTC, A, with_header=False)
+    assert full == render_address_header(A) + block
+    assert render_current_positions({}, A, with_header=False) == "💎 <b>No positions found</b>"
+
+def test_digest_writes_each_header_once():
+    sent = []
+    digest = DigestBuffer(sent.append)
+    for user_address in (A, A, B):
+        digest.add(user_address, render_new_position_message("BTC", BTC, user_address, with_header=False))
+    assert digest.flush() == 1
+    assert sent[0].count(render_address_header(A)) == 1 and sent[0].count(render_address_header(B)) == 1
+    assert sent[0].startswith(render_address_header(A) + "❇️")
+
+def test_header_repeated_when_address_continues_in_next_message():
+    block = render_new_position_message("BTC", BTC, A, with_header=False)
+    messages = pack_digest([(A, [block] * 3)], limit=len(render_address_header(A) + block) + 10)
+    assert len(messages) == 3
+    assert all(message == render_address_header(A) + block for message in messages)
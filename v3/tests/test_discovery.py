@@ -0,0 +1,66 @@
+import json
+import pytest
+from hypertracker.discovery import LeaderboardDiscovery, iter_leaderboard_rows, top_addresses, metric_getter
+from hypertracker.registry import AddressRegistry
+from mock_server import MockServer, make_leaderboard
+
+def chunked(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def row(index: int, month_pnl: float, account_value: float = 1000.0, name=None) -> dict:
+    return {
+        "ethAddress": f"0x{index:040X}",
+        "accountValue": f"{account_value:.2f}",
+        "windowPerformances": [["day", {"pnl": "0", "roi": "0", "vlm": "0"}],
+                               ["month", {"pnl": f"{month_pnl:.2f}", "roi": "0.1", "vlm": "5"}]],
+        "displayName": name,
+    }
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64 * 1024])
+def test_rows_survive_any_chunk_boundary(size):
+    rows = [row(i, i * 10.0, name="trader ☃ é" if i % 2 else None) for i in range(5)]
+    # Marker, string multibyte dan whitespace antar elemen terbelah di batas potongan mana pun
+    data = json.dumps({"other": [1, 2], "leaderboardRows": rows}, indent=2, ensure_ascii=False).encode()
+    assert list(iter_leaderboard_rows(chunked(data, size))) == rows
+
+def test_empty_array_yields_nothing():
+    assert list(iter_leaderboard_rows([b'{"leaderboardRows"', b': [ ]}'])) == []
+
+def test_truncated_or_missing_array_raises():
+    data = json.dumps({"leaderboardRows": [row(i, 1.0) for i in range(3)]}).encode()
+    with pytest.raises(ValueError, match="terpotong"):
+        list(iter_leaderboard_rows(chunked(data[:-20], 16)))
+    with pytest.raises(ValueError, match="tidak ditemukan"):
+        list(iter_leaderboard_rows(chunked(b'{"rows": []}', 4)))
+
+def test_top_addresses_orders_and_filters():
+    rows = [row(1, 50.0), row(2, 300.0, account_value=10.0), row(3, 200.0), row(4, -5.0),
+            {"ethAddress": "not-an-address", "accountValue": "1"}, {"ethAddress": f"0x{5:040x}"}]
+    assert top_addresses(rows, 2, "month_pnl") == [(300.0, f"0x{2:040x}"), (200.0, f"0x{3:040x}")]
+    assert top_addresses(rows, 2, "month_pnl", min_account_value=100) == [(200.0, f"0x{3:040x}"), (50.0, f"0x{1:040x}")]
+    with pytest.raises(ValueError):
+        metric_getter("year_pnl")
+
+def test_sync_uses_etag_and_keeps_manual_addresses(tmp_path):
+    registry = AddressRegistry(str(tmp_path / "addresses.json")).load()
+    manual = f"0x{0xabc:040x}"
+    registry.add(manual)
+    with MockServer(leaderboard_rows=200) as server:
+        discovery = LeaderboardDiscovery(registry, f"{server.url}/leaderboard", 10, "month_pnl",
+                                         state_path=str(tmp_path / "discovery.json"))
+        first = discovery.sync()
+        expected = top_addresses(make_leaderboard(200, 0)["leaderboardRows"], 10, "month_pnl")
+        assert first["changed"] and first["added"] == [address for _, address in expected]
+
+        # Leaderboard sama: server menjawab 304 dan registry tidak disentuh
+        assert discovery.sync() == {"changed": False, "added": [], "removed": []}
+
+        server.cycle = 1
+        second = discovery.sync()
+        current = {address for _, address in top_addresses(make_leaderboard(200, 1)["leaderboardRows"], 10, "month_pnl")}
+        assert set(registry.snapshot()) == current | {manual}
+        assert set(second["removed"]) == set(first["added"]) - current
+        assert server.requests["leaderboard"] == 3
+
+    # Validator tersimpan sehingga proses baru tetap mengirim If-None-Match
+    assert json.load(open(tmp_path / "discovery.json"))["etag"] == '"lb-1"'
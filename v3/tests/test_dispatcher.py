@@ -0,0 +1,112 @@
+import time
+import pytest
+from hypertracker import message, shared
+from hypertracker.registry import AddressRegistry
+from hypertracker.dispatcher import TelegramDispatcher, split_message, MAX_MESSAGE_LENGTH
+from mock_server import MockServer
+
+@pytest.fixture
+def server(monkeypatch):
+    with MockServer() as server:
+        monkeypatch.setattr(message, "TELEGRAM_API_BASE", server.url)
+        monkeypatch.setattr(message, "telegram_bot_token", "TEST")
+        yield server
+
+def deliver(dispatcher, timeout: float = 15.0) -> None:
+    dispatcher.start()
+    dispatcher.stop(timeout)
+
+def test_429_retry_after_pauses_and_resends(server):
+    server.telegram_rate_limits = 1
+    server.telegram_retry_after = 1
+    dispatcher = TelegramDispatcher(message.telegram_api_send, "1")
+    dispatcher.enqueue("first")
+    dispatcher.enqueue("second")
+    deliver(dispatcher)
+
+    attempts = [(at, text, status) for at, _, text, status in server.telegram_log]
+    assert [(text, status) for _, text, status in attempts] == [("first", 429), ("first", 200), ("second", 200)]
+    # Pesan yang sama dikirim ulang setelah retry_after, tidak lebih cepat
+    assert attempts[1][0] - attempts[0][0] >= 0.95
+    assert dispatcher.stats()["rate_limited"] == 1 and dispatcher.sent == 2 and dispatcher.failed == 0
+
+def test_per_chat_pacing(server):
+    dispatcher = TelegramDispatcher(message.telegram_api_send, "1", chat_rate=10.0)
+    for i in range(8):
+        dispatcher.enqueue(f"msg {i}")
+    deliver(dispatcher)
+
+    sent = server.telegram_messages("1")
+    assert [text for _, text in sent] == [f"msg {i}" for i in range(8)]
+    # Burst 3 pesan, lalu satu pesan per 1/chat_rate detik
+    gaps = [b - a for (a, _), (b, _) in zip(sent[3:], sent[4:])]
+    assert min(gaps) >= 0.08
+    assert sent[-1][0] - sent[0][0] >= 0.4
+
+def test_group_chat_uses_group_rate(server):
+    dispatcher = TelegramDispatcher(message.telegram_api_send, "-100123", chat_rate=100.0, group_rate=5.0)
+    for i in range(5):
+        dispatcher.enqueue(f"group {i}")
+    deliver(dispatcher)
+
+    sent = server.telegram_messages("-100123")
+    assert len(sent) == 5
+    assert sent[-1][0] - sent[0][0] >= 0.35
+
+def test_long_message_is_split_below_limit(server):
+    paragraph = "\n".join(f"line {i} " + "x" * 80 for i in range(30))
+    text = "\n\n".join([paragraph] * 5) + "\n\n" + "y" * 5000
+    dispatcher = TelegramDispatcher(message.telegram_api_send, "1", chat_rate=100.0)
+    dispatcher.enqueue(text)
+    deliver(dispatcher)
+
+    parts = [part for _, part in server.telegram_messages("1")]
+    assert len(parts) > 2
+    assert all(len(part) <= MAX_MESSAGE_LENGTH for part in parts)
+    assert "".join(parts).replace("\n", "") == text.replace("\n", "")
+    # Paragraf utuh tidak dipotong di tengah baris
+    assert all(part.endswith("x" * 80) for part in parts[:-2])
+
+def test_split_message():
+    assert split_message("short") == ["short"]
+    assert split_message("") == [""]
+    assert split_message("a" * 10, limit=4) == ["aaaa", "aaaa", "aa"]
+    assert split_message("aa\nbb\n\ncc", limit=6) == ["aa\nbb", "cc"]
+
+class FakeUpdates:
+    """
+    Pengganti telegram_client.get untuk getUpdates dengan daftar (chat_id, teks).
+    """
+
+    def __init__(self, messages):
+        self.result = [{"update_id": i, "message": {"chat": {"id": chat_id}, "text": text}}
+                       for i, (chat_id, text) in enumerate(messages, 1)]
+
+    def get(self, url, params=None, timeout=None):
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"ok": True, "result": self.result}
+
+def test_command_replies_go_through_dispatcher(tmp_path, monkeypatch):
+    address = f"0x{1:040x}"
+    commands = [(42, f"/add {address}"), (42, "/list"), (42, f"/pin {address}"), (42, f"/unpin {address}"),
+                (42, "/exposure"), (42, "/crowded"), (42, "/pnl"), (42, "/remove 1"), (7, "/list")]
+    dispatcher = TelegramDispatcher(lambda *args: pytest.fail("balasan perintah tidak boleh dikirim sinkron"), "1")
+    monkeypatch.setattr(message, "dispatcher", dispatcher)
+    monkeypatch.setattr(message, "telegram_api_send", lambda *args: pytest.fail("balasan perintah tidak boleh dikirim sinkron"))
+    monkeypatch.setattr(message, "telegram_client", FakeUpdates(commands))
+    monkeypatch.setattr(message, "admins", [42])
+    monkeypatch.setattr(message, "address_registry", AddressRegistry(str(tmp_path / "addresses.json")))
+    monkeypatch.setattr(shared, "pinned_addresses", set())
+
+    # Loop perintah hanya mengantre balasan, pengiriman dilakukan thread dispatcher
+    assert message.process_telegram_updates() == len(commands) + 1
+    replies = [(chat_id, text) for text, chat_id, _, _ in dispatcher._queue]
+    assert len(replies) == len(commands)
+    assert replies[0] == ("42", f"Berhasil menambahkan {address} (ID 1)")
+    assert replies[2] == ("42", f"{address} dipin sebagai prioritas tinggi.")
+    assert replies[7][1].startswith("Berhasil menghapus:") and replies[8][0] == "7"
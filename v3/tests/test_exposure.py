@@ -0,0 +1,125 @@
+import random
+import threading
+import pytest
+from hypertracker import main
+from hypertracker import shared
+from hypertracker.exposure import ExposureTracker, compute_exposure
+from hypertracker.position_store import PositionStateStore
+from hypertracker.positions import Position
+from hypertracker.registry import AddressRegistry
+
+COINS = ('BTC', 'ETH', 'SOL', 'HYPE', 'DOGE', 'ARB')
+
+def random_positions(rng, previous=None) -> dict:
+    """
+    Snapshot acak: sebagian posisi lama dipertahankan apa adanya, sisanya dibuka, ditutup, atau diubah.
+    """
+    positions = {}
+    for coin in COINS:
+        old = (previous or {}).get(coin)
+        roll = rng.random()
+        if old is not None and roll < 0.4:
+            positions[coin] = old
+        elif roll < 0.7:
+            size = rng.choice((-1, 1)) * rng.uniform(0.1, 100)
+            entry_price = rng.uniform(1, 50000)
+            positions[coin] = Position(coin, size, float(rng.randint(1, 50)), entry_price,
+                                       abs(size) * entry_price, rng.uniform(-1000, 1000))
+    return positions
+
+def test_random_deltas_evictions_and_rebuilds_stay_consistent():
+    rng = random.Random(7)
+    addresses = [f"0x{i:040x}" for i in range(200)]
+    states = PositionStateStore()
+    tracker = ExposureTracker()
+
+    for step in range(3000):
+        address = rng.choice(addresses)
+        roll = rng.random()
+        if roll < 0.8:
+            previous = states.get(address)
+            current = random_positions(rng, previous)
+            tracker.update(previous, current)
+            states[address] = current
+        elif roll < 0.97:
+            tracker.update(states.get(address), None)
+            states.discard_many([address])
+        else:
+            tracker.rebuild(states)
+        if step % 250 == 0:
+            assert tracker.verify(states) == []
+    assert tracker.verify(states) == []
+    assert tracker.applied > 0
+
+def test_verify_reports_drift():
+    states = {"0x" + "1" * 40: {"BTC": Position("BTC", 1.0, 10.0, 50000.0, 50000.0, 0.0)}}
+    tracker = ExposureTracker()
+    tracker.update(None, states["0x" + "1" * 40])
+    tracker.update(None, {"ETH": Position("ETH", -2.0, 5.0, 3000.0, 6000.0, 0.0)})
+    assert tracker.verify(states) == ["ETH"]
+    tracker.rebuild(states)
+    assert tracker.verify(states) == []
+
+@pytest.fixture
+def isolated_main(tmp_path, monkeypatch):
+    """
+    main.py dengan registry, state, dan tracker baru; notifikasi hanya dihitung.
+    """
+    registry = AddressRegistry(str(tmp_path / "addresses.json"))
+    registry.on_remove(main.evict_addresses)
+    states = PositionStateStore()
+    tracker = ExposureTracker()
+    sent = []
+    monkeypatch.setattr(main, "address_registry", registry)
+    monkeypatch.setattr(main, "previous_positions", states)
+    monkeypatch.setattr(main, "dirty_addresses", set())
+    monkeypatch.setattr(main, "state_store", None)
+    monkeypatch.setattr(main, "lease_table", None)
+    monkeypatch.setattr(main, "notify", lambda user_address, text: sent.append(user_address))
+    monkeypatch.setattr(main, "get_markprice", lambda coin: 1.0)
+    monkeypatch.setattr(main, "outage_tracker", main.OutageTracker(lambda text: None))
+    monkeypatch.setattr(shared, "exposure_tracker", tracker)
+    monkeypatch.setattr(shared, "position_states", states)
+    return registry, states, tracker
+
+def test_handle_positions_and_eviction_race(isolated_main):
+    registry, states, tracker = isolated_main
+    addresses = [f"0x{i:040x}" for i in range(60)]
+    registry.add_many(addresses)
+    stop = threading.Event()
+    errors = []
+
+    def poll_worker(seed):
+        rng = random.Random(seed)
+        try:
+            while not stop.is_set():
+                address = rng.choice(addresses)
+                main.handle_positions(address, random_positions(rng, states.get(address)))
+        except Exception as e:
+            errors.append(e)
+
+    def discovery_worker():
+        # Seperti discovery/Telegram: alamat dihapus lalu ditambahkan kembali dari thread lain
+        rng = random.Random(99)
+        try:
+            for _ in range(200):
+                batch = rng.sample(addresses, 5)
+                registry.remove_many([registry.id_of(a) for a in batch if a in registry])
+                registry.add_many(batch)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    threads = [threading.Thread(target=poll_worker, args=(seed,)) for seed in range(3)]
+    threads.append(threading.Thread(target=discovery_worker))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert not errors
+    assert tracker.verify(states) == []
+    # Tidak ada state untuk alamat yang sudah tidak dipantau
+    assert set(states.keys()) <= set(registry.snapshot())
+    assert compute_exposure(states).keys() == tracker.snapshot().keys()
@@ -0,0 +1,43 @@
+import time
+from hypertracker.history import HistoryStore
+from hypertracker.positions import Position
+
+ALICE = "0x" + "a" * 40
+BOB = "0x" + "b" * 40
+CAROL = "0x" + "c" * 40
+
+def position(coin: str, size: float, pnl: float = 0.0) -> Position:
+    return Position(coin, size, 10.0, 100.0, abs(size) * 100.0, pnl)
+
+def test_failed_batch_does_not_leave_stale_intern_ids(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    now = time.time()
+    store.record({ALICE: {"BTC": position("BTC", 1.0)}}, ts=now - 30)
+    store.flush()
+
+    # Nilai yang tidak bisa di-bind membuat transaksi gagal setelah BOB dan ETH di-intern
+    broken = position("ETH", 1.0)
+    broken.size = object()
+    store.record({BOB: {"ETH": broken}}, ts=now - 20)
+    store.flush()
+    assert store.written_rows == 1
+
+    store.record({CAROL: {"SOL": position("SOL", 2.0, 5.0)}, BOB: {"ETH": position("ETH", -1.0, 7.0)}}, ts=now - 10)
+    store.flush()
+    assert store.written_rows == 3
+
+    assert [row[5] for row in store.query(BOB, "ETH", now - 60)] == [7.0]
+    assert [row[5] for row in store.query(CAROL, "SOL", now - 60)] == [5.0]
+    assert store.query(CAROL, "ETH", now - 60) == []
+    assert len(store.query(ALICE, "BTC", now - 60)) == 1
+
+def test_pnl_summary(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    now = time.time()
+    for i, pnl in enumerate((10.0, -5.0, 25.0)):
+        store.record({ALICE: {"BTC": position("BTC", 1.0, pnl)}}, ts=now - 300 + i)
+    store.flush()
+    summary = store.pnl_summary(ALICE, "BTC", hours=1)
+    assert (summary["first"], summary["last"], summary["change"]) == (10.0, 25.0, 15.0)
+    assert (summary["min"], summary["max"], summary["samples"]) == (-5.0, 25.0, 3)
+    assert store.pnl_summary(ALICE, "ETH") is None
@@ -0,0 +1,78 @@
+import sqlite3
+import time
+import pytest
+from hypertracker.leases import LeaseTable
+
+PARTITIONS = 16
+TTL = 30.0
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "leases.db")
+
+def lease_rows(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT partition, node FROM leases"))
+
+def test_journal_mode_is_rollback(path):
+    LeaseTable(path, "a", PARTITIONS, TTL)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+def test_single_node_owns_all_partitions(path):
+    node = LeaseTable(path, "a", PARTITIONS, TTL)
+    acquired, lost = node.renew()
+    assert acquired == frozenset(range(PARTITIONS)) and not lost
+    assert node.owns("0x" + "1" * 40)
+
+def test_second_node_gets_fair_share(path):
+    now = time.time()
+    a = LeaseTable(path, "a", PARTITIONS, TTL)
+    b = LeaseTable(path, "b", PARTITIONS, TTL)
+    a.renew(now)
+    # Semua lease a masih sah; b hanya mendaftarkan heartbeat
+    assert b.renew(now + 1) == (frozenset(), frozenset())
+
+    _, released = a.renew(now + 2)
+    assert len(released) == PARTITIONS // 2
+    # Partisi yang dilepas langsung tidak dipakai lagi oleh a
+    assert not released & a.owned
+
+    acquired, _ = b.renew(now + 3)
+    assert acquired == released
+    assert a.owned.isdisjoint(b.owned)
+    assert a.owned | b.owned == frozenset(range(PARTITIONS))
+
+def test_crashed_node_is_taken_over_after_expiry(path):
+    now = time.time()
+    a = LeaseTable(path, "a", PARTITIONS, TTL)
+    b = LeaseTable(path, "b", PARTITIONS, TTL)
+    a.renew(now)
+    b.renew(now + 1)
+    a.renew(now + 2)
+    b.renew(now + 3)
+    a_partitions = a.owned
+
+    # a crash: koneksinya ditutup tanpa release_all, lease-nya tetap tercatat di file
+    a._conn.close()
+    changes = []
+    b.renew(now + TTL / 2, on_change=lambda acquired, lost: changes.append((acquired, lost)))
+    assert not changes, "lease a belum kedaluwarsa, tidak boleh diambil alih"
+
+    acquired, lost = b.renew(now + TTL + 3, on_change=lambda acquired, lost: changes.append((acquired, lost)))
+    assert acquired == a_partitions and not lost
+    assert changes == [(a_partitions, frozenset())]
+    assert b.owned == frozenset(range(PARTITIONS))
+    assert set(lease_rows(path).values()) == {"b"}
+
+def test_release_all_hands_over_immediately(path):
+    now = time.time()
+    a = LeaseTable(path, "a", PARTITIONS, TTL)
+    b = LeaseTable(path, "b", PARTITIONS, TTL)
+    a.renew(now)
+    b.renew(now + 1)
+    a.release_all()
+    assert not a.owns("0x" + "1" * 40)
+
+    acquired, _ = b.renew(now + 2)
+    assert acquired == frozenset(range(PARTITIONS))
@@ -0,0 +1,39 @@
+import threading
+import time
+from hypertracker.markprice import MarkPriceCache
+
+SNAPSHOT = ({"universe": [{"name": "BTC"}, {"name": "ETH"}]}, [{"markPx": "50000.0"}, {"markPx": "3000.0"}])
+
+def test_concurrent_stale_lookups_refresh_once():
+    calls = []
+
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return SNAPSHOT
+
+    cache = MarkPriceCache(fetch, ttl=60)
+    barrier = threading.Barrier(8)
+    prices = []
+
+    def lookup():
+        barrier.wait()
+        prices.append(cache.get("BTC"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert prices == ["50000.0"] * 8
+    assert cache.misses == 1 and cache.hits == 7
+
+def test_failed_refresh_is_retried_by_next_lookup():
+    responses = ["Error occurred while fetching mark price: 500", SNAPSHOT]
+    cache = MarkPriceCache(lambda: responses.pop(0), ttl=60)
+    assert cache.get("BTC") == "Error occurred while fetching mark price: cache is empty"
+    assert cache.get("ETH") == "3000.0"
+    assert cache.get("SOL") == "Symbol SOL not found in the response."
+    assert cache.misses == 2 and cache.hits == 1
@@ -0,0 +1,33 @@
+from hypertracker.metrics import Counter, Gauge, Histogram, Registry
+
+def test_counter_family_uses_total_name():
+    registry = Registry()
+    counter = Counter('alerts_generated', 'Jumlah notifikasi.', ('kind',), registry=registry)
+    counter.labels('opened').inc()
+    counter.labels('opened').inc(2)
+    assert registry.render().splitlines() == [
+        "# HELP alerts_generated_total Jumlah notifikasi.",
+        "# TYPE alerts_generated_total counter",
+        'alerts_generated_total{kind="opened"} 3.0',
+    ]
+
+def test_counter_read_from_function():
+    registry = Registry()
+    hits = {"value": 0}
+    counter = Counter('markprice_cache_requests', 'Lookup.', ('result',), registry=registry)
+    counter.labels('hit').set_function(lambda: hits["value"])
+    counter.labels('miss').set_function(lambda: 1 / 0)
+    hits["value"] = 5
+    lines = registry.render().splitlines()
+    assert "# TYPE markprice_cache_requests_total counter" in lines
+    assert 'markprice_cache_requests_total{result="hit"} 5' in lines
+    # Fungsi yang gagal tidak menghasilkan sampel
+    assert not any('result="miss"' in line for line in lines)
+
+def test_gauge_and_histogram_names_unchanged():
+    registry = Registry()
+    Gauge('telegram_queue_depth', 'Antrian.', registry=registry).set(4)
+    Histogram('cycle_seconds', 'Durasi.', buckets=(1.0,), registry=registry).observe(0.5)
+    lines = registry.render().splitlines()
+    assert "# TYPE telegram_queue_depth gauge" in lines and "telegram_queue_depth 4" in lines
+    assert 'cycle_seconds_bucket{le="1.0"} 1' in lines and "cycle_seconds_count 1" in lines
@@ -0,0 +1,79 @@
+import pytest
+from hypertracker import outage
+from hypertracker.outage import OutageTracker
+
+ADDRESSES = [f"0x{i:040x}" for i in range(20)]
+BAD = ADDRESSES[0]
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(outage, "time", clock)
+    return clock
+
+def cycle(tracker, clock, failing=()):
+    """
+    Satu siklus polling 60 detik: alamat di `failing` (dan BAD) gagal, sisanya berhasil.
+    """
+    for user_address in ADDRESSES:
+        if user_address == BAD or user_address in failing:
+            tracker.record_error(user_address, "422 Client Error")
+        else:
+            tracker.record_success()
+    tracker.flush()
+    clock.now += 60
+
+def test_permanently_failing_address_does_not_block_outages(clock):
+    sent = []
+    tracker = OutageTracker(sent.append, recovery_after=120)
+    for _ in range(5):
+        cycle(tracker, clock)
+    assert sent == [] and not tracker.active
+
+    for _ in range(3):
+        cycle(tracker, clock, failing=ADDRESSES)
+    assert len(sent) == 1 and "API errors" in sent[0] and "20 failed requests for 20 addresses" in sent[0]
+
+    # Pemulihan tetap terjadi walaupun BAD masih gagal setiap siklus
+    for _ in range(3):
+        cycle(tracker, clock)
+    assert len(sent) == 2 and "recovered" in sent[1] and "60 failed requests" in sent[1] and not tracker.active
+
+    cycle(tracker, clock, failing=ADDRESSES[:12])
+    assert len(sent) == 3 and "API errors" in sent[2] and "12 failed requests for 12 addresses" in sent[2]
+
+def test_bad_cycle_resets_recovery_timer(clock):
+    sent = []
+    tracker = OutageTracker(sent.append, recovery_after=120)
+    cycle(tracker, clock, failing=ADDRESSES)
+    cycle(tracker, clock)
+    cycle(tracker, clock, failing=ADDRESSES)
+    cycle(tracker, clock)
+    cycle(tracker, clock)
+    assert len(sent) == 1 and tracker.active
+    cycle(tracker, clock)
+    assert len(sent) == 2 and not tracker.active
+
+def test_thresholds(clock):
+    sent = []
+    tracker = OutageTracker(sent.append, failure_ratio=0.5, min_addresses=3)
+    # Rasio tinggi tetapi hanya dua alamat yang gagal
+    tracker.record_error(ADDRESSES[1], "500")
+    tracker.record_error(ADDRESSES[2], "500")
+    tracker.record_success()
+    tracker.flush()
+    # Siklus tanpa request tidak dinilai
+    tracker.flush()
+    assert sent == [] and not tracker.active
+
+    # Satu-satunya alamat yang dipantau gagal: semua request gagal
+    tracker.record_error(ADDRESSES[1], "timeout")
+    tracker.flush()
+    assert len(sent) == 1 and tracker.active
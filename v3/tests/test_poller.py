@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import pytest
+from hypertracker import hyperliquid
+from mock_server import MockServer
+from hypertracker.poller import poll_addresses
+
+ADDRESSES = [f"0x{i:040x}" for i in range(40)]
+
+@pytest.fixture
+def server(monkeypatch):
+    with MockServer(latency=0.05, n_positions=3) as server:
+        monkeypatch.setattr(hyperliquid, "API_URL", f"{server.url}/info")
+        # Budget weight tidak dibatasi dan tanpa cache single-flight, agar setiap alamat benar-benar di-request
+        monkeypatch.setattr(hyperliquid.api_governor, "bucket", hyperliquid.api_governor.bucket)
+        hyperliquid.api_governor.configure(float('inf'))
+        monkeypatch.setattr(hyperliquid.clearinghouse_flight, "freshness", 0)
+        yield server
+
+def test_concurrency_is_bounded(server):
+    results, elapsed = poll_addresses(ADDRESSES, hyperliquid.get_leaderboard_base_info, concurrency=4)
+    assert set(results) == set(ADDRESSES)
+    assert all(isinstance(info, dict) for info in results.values())
+    assert server.max_in_flight == 4
+    # Kira-kira ceil(40 / 4) x latensi server, bukan 40 x latensi
+    assert 10 * server.latency <= elapsed < 40 * server.latency
+
+def test_partial_failures_are_reported_per_address(server):
+    failing = set(ADDRESSES[::7])
+    server.failing_users = failing
+    results, _ = poll_addresses(ADDRESSES, hyperliquid.get_leaderboard_base_info, concurrency=8)
+
+    assert list(results) == ADDRESSES
+    for user_address, info in results.items():
+        if user_address in failing:
+            assert isinstance(info, str) and info.startswith("Error occurred while fetching leaderboard info")
+        else:
+            assert info["user_address"] == user_address and len(info["positions"]) == 3
+    assert hyperliquid.api_governor.breaker("clearinghouseState").state == "closed"
+
+def test_exceptions_from_fetch_become_error_strings():
+    def fetch(user_address):
+        if user_address.endswith("3"):
+            raise RuntimeError("boom")
+        return {"user_address": user_address}
+
+    results, _ = poll_addresses(ADDRESSES[:10], fetch, concurrency=3)
+    assert results[ADDRESSES[3]] == "Error occurred while fetching leaderboard info: boom"
+    assert all(results[a] == {"user_address": a} for a in ADDRESSES[:10] if a != ADDRESSES[3])
+
+def test_async_fetch_respects_bound():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    async def fetch(user_address):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return user_address
+
+    results, _ = poll_addresses(ADDRESSES, fetch, concurrency=5)
+    assert results == {a: a for a in ADDRESSES}
+    assert state["peak"] == 5
+
+def test_empty_cycle():
+    assert poll_addresses([], lambda a: a, concurrency=4)[0] == {}
@@ -0,0 +1,56 @@
+from hypertracker import position_store
+from hypertracker.position_store import PositionStateStore
+from hypertracker.positions import Position
+
+ADDRESSES = [f"0x{i:040x}" for i in range(6)]
+UPDATE_TIME = "2026-01-02 03:04:05"
+
+def snapshot(coins, size: float = 1.0, leverage: float = 5.0) -> dict:
+    return {
+        coin: Position(coin, size * (i + 1), leverage, 100.0 + i, 50.0 * (i + 1), -1.5, 80.0, update_time=UPDATE_TIME)
+        for i, coin in enumerate(coins)
+    }
+
+def test_round_trip_and_in_place_update():
+    store = PositionStateStore()
+    store.update({ADDRESSES[0]: snapshot(["BTC", "ETH"]), ADDRESSES[1]: snapshot(["SOL"])})
+    assert store[ADDRESSES[0]] == snapshot(["BTC", "ETH"])
+    assert store.get(ADDRESSES[2]) is None and ADDRESSES[1] in store and len(store) == 2
+
+    # Snapshot lebih kecil ditulis di tempat; baris sisanya menjadi garbage
+    store[ADDRESSES[0]] = snapshot(["ETH"], size=-2.0)
+    assert store[ADDRESSES[0]] == snapshot(["ETH"], size=-2.0)
+    assert store.stats()["rows"] == 2 and store.stats()["garbage_rows"] == 1
+
+    # Snapshot lebih besar ditambahkan di akhir kolom
+    store[ADDRESSES[1]] = snapshot(["SOL", "DOGE", "BTC"])
+    assert store[ADDRESSES[1]] == snapshot(["SOL", "DOGE", "BTC"])
+    assert store.stats()["coins"] == 4
+
+def test_discard_many_frees_slots_for_reuse():
+    store = PositionStateStore()
+    for address in ADDRESSES[:4]:
+        store[address] = snapshot(["BTC", "ETH"])
+    slot = store._slots[ADDRESSES[1]]
+
+    assert store.discard_many([ADDRESSES[1], ADDRESSES[3], ADDRESSES[5]]) == 2
+    assert store.keys() == [ADDRESSES[0], ADDRESSES[2]] and store.evicted == 2
+    assert store.get(ADDRESSES[1]) is None
+
+    # Alamat baru memakai slot yang dilepas, bukan menambah slot baru
+    store[ADDRESSES[4]] = snapshot(["SOL"])
+    store[ADDRESSES[5]] = snapshot(["SOL"])
+    assert len(store._addresses) == 4 and slot in (store._slots[ADDRESSES[4]], store._slots[ADDRESSES[5]])
+    assert store[ADDRESSES[4]] == snapshot(["SOL"]) and store[ADDRESSES[0]] == snapshot(["BTC", "ETH"])
+
+def test_compaction_keeps_live_rows(monkeypatch):
+    monkeypatch.setattr(position_store, "MIN_COMPACT_ROWS", 0)
+    store = PositionStateStore(compact_ratio=0.4)
+    store[ADDRESSES[0]] = snapshot(["BTC"])
+    store[ADDRESSES[1]] = snapshot(["ETH", "SOL"])
+    store[ADDRESSES[0]] = snapshot(["BTC", "ETH", "SOL"])
+    store.discard_many([ADDRESSES[1]])
+    # Garbage melewati rasio sehingga kolom dipadatkan ulang
+    assert store.stats()["garbage_rows"] == 0 and len(store._coin) == 3
+    assert store[ADDRESSES[0]] == snapshot(["BTC", "ETH", "SOL"])
+    assert store.pop(ADDRESSES[0]) == snapshot(["BTC", "ETH", "SOL"]) and len(store) == 0
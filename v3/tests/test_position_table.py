@@ -0,0 +1,86 @@
+import random
+from hypertracker.position_table import PositionTable
+from hypertracker.positions import diff_positions
+
+COINS = ('BTC', 'ETH', 'SOL', 'HYPE', 'DOGE')
+ADDRESSES = [f"0x{i:040x}" for i in range(40)]
+
+def snapshot(rng, previous=None) -> dict:
+    """
+    Hasil get_leaderboard_base_info sintetis; sebagian posisi siklus sebelumnya dipertahankan.
+    """
+    positions = []
+    for coin in COINS:
+        old = next((p for p in (previous or {}).get('positions', []) if p['coin'] == coin), None)
+        roll = rng.random()
+        if old is not None and roll < 0.5:
+            positions.append(old)
+        elif roll < 0.75:
+            size = rng.choice((-1, 1)) * rng.uniform(0.1, 100)
+            positions.append({'coin': coin, 'size': size, 'leverage': float(rng.randint(1, 20)), 'entry_price': 100.0,
+                              'position_value': abs(size) * 100.0, 'unrealized_pnl': 0.0, 'liquidation_price': 50.0})
+    return {'positions': positions}
+
+def kinds(events) -> list:
+    return [(e.kind, e.coin) for e in events]
+
+def run_cycles(rng, choose_due, cycles: int = 40):
+    """
+    Menjalankan siklus seperti process_cycle dan memeriksa diff massal terhadap diff per alamat.
+
+    :return: Jumlah alamat yang memakai diff massal.
+    """
+    latest, state = {}, {}
+    table = None
+    bulk = 0
+    for cycle in range(cycles):
+        results = {}
+        for user_address in choose_due(cycle):
+            if rng.random() < 0.1:
+                results[user_address] = "Error occurred while fetching leaderboard info: timeout"
+            else:
+                results[user_address] = latest[user_address] = snapshot(rng, latest.get(user_address))
+
+        new_table = PositionTable.from_snapshots(results, table)
+        events = new_table.events(table) if table is not None else {}
+        positions = new_table.to_positions()
+        for user_address, info in results.items():
+            if isinstance(info, str) or user_address not in positions:
+                continue
+            previous = state.get(user_address)
+            if previous is not None and table is not None and table.covers(user_address):
+                assert kinds(events.get(user_address, [])) == kinds(diff_positions(previous, positions[user_address]))
+                bulk += 1
+            state[user_address] = positions[user_address]
+        # Tabel intern alamat hanya berisi alamat tabel ini
+        assert set(new_table._address_ids) == set(new_table.addresses)
+        table = new_table
+    return bulk
+
+def test_full_sweeps_match_per_address_diff():
+    rng = random.Random(3)
+    assert run_cycles(rng, lambda cycle: ADDRESSES) > 1000
+
+def test_partial_cycles_only_diff_addresses_covered_by_previous_table():
+    rng = random.Random(4)
+    bulk = run_cycles(rng, lambda cycle: rng.sample(ADDRESSES, 8))
+    assert 0 < bulk < 40 * 8
+
+def test_failed_fetch_keeps_previous_rows():
+    rng = random.Random(5)
+    user_address = ADDRESSES[0]
+    first = PositionTable.from_snapshots({user_address: snapshot(rng)})
+    second = PositionTable.from_snapshots({user_address: "Error occurred while fetching leaderboard info: 500"}, first)
+    assert second.covers(user_address)
+    assert second.events(first) == {}
+    assert set(second.to_positions()[user_address]) == set(first.to_positions()[user_address])
+
+def test_new_address_does_not_reuse_dropped_address_id():
+    rng = random.Random(9)
+    a, b = ADDRESSES[:2]
+    first = PositionTable.from_snapshots({a: snapshot(rng)})
+    second = PositionTable.from_snapshots({b: snapshot(rng)}, first)
+    third = PositionTable.from_snapshots({a: snapshot(rng)}, second)
+    assert second._address_ids[b] != first._address_ids[a]
+    assert not third.covers(b) and third._address_ids[a] not in (first._address_ids[a], second._address_ids[b])
+    assert second.events(first) == {} and third.events(second) == {}
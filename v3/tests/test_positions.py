@@ -0,0 +1,41 @@
+from hypertracker.positions import (Position, diff_positions, modify_data,
+                                   OPENED, CLOSED, INCREASED, REDUCED, FLIPPED, LEVERAGE_CHANGED)
+
+def position(coin: str, size: float, leverage: float = 10.0) -> Position:
+    return Position(coin, size, leverage, 100.0, abs(size) * 100.0, 0.0)
+
+def kinds(events) -> list:
+    return [(event.kind, event.coin) for event in events]
+
+def test_new_and_closed_positions():
+    previous = {"BTC": position("BTC", 1.0)}
+    current = {"ETH": position("ETH", -2.0)}
+    events = diff_positions(previous, current)
+    # Posisi baru lebih dulu, posisi yang ditutup di akhir
+    assert kinds(events) == [(OPENED, "ETH"), (CLOSED, "BTC")]
+    assert events[0].previous is None and events[0].current is current["ETH"]
+    assert events[1].previous is previous["BTC"] and events[1].current is None
+
+def test_side_flip_is_a_single_event():
+    for old_size, new_size in ((1.0, -1.0), (-3.0, 0.5)):
+        # Perubahan leverage dan size ikut dalam flip, bukan event terpisah
+        events = diff_positions({"BTC": position("BTC", old_size, 5.0)}, {"BTC": position("BTC", new_size, 20.0)})
+        assert kinds(events) == [(FLIPPED, "BTC")]
+        assert events[0].previous.side != events[0].current.side
+
+def test_size_and_leverage_changes_on_same_side():
+    previous = {"BTC": position("BTC", -2.0), "ETH": position("ETH", 3.0), "SOL": position("SOL", 1.0)}
+    current = {"BTC": position("BTC", -5.0), "ETH": position("ETH", 1.0, 3.0), "SOL": position("SOL", 1.0)}
+    assert kinds(diff_positions(previous, current)) == [(INCREASED, "BTC"), (REDUCED, "ETH"), (LEVERAGE_CHANGED, "ETH")]
+
+def test_unchanged_snapshot_has_no_events():
+    snapshot = {"BTC": position("BTC", 1.0), "ETH": position("ETH", -1.0)}
+    assert diff_positions(snapshot, dict(snapshot)) == []
+    assert diff_positions({}, {}) == []
+
+def test_modify_data_rejects_incomplete_rows():
+    assert modify_data(None) == {}
+    assert modify_data({"positions": [{"coin": "BTC", "size": 1.0}]}) == {}
+    positions = modify_data({"positions": [{"coin": "BTC", "size": -1.0, "leverage": 4, "entry_price": 100.0,
+                                            "position_value": 100.0, "unrealized_pnl": 2.0}]})
+    assert positions["BTC"].side == "SHORT" and positions["BTC"].estimated_entry_size == 25.0 and positions["BTC"].update_time
@@ -0,0 +1,113 @@
+import pytest
+import requests
+from hypertracker import ratelimit
+from hypertracker.ratelimit import CircuitBreaker, CircuitOpenError, RateGovernor, TokenBucket, backoff_delay
+
+class Clock:
+    """
+    Pengganti modul time: sleep() memajukan waktu tanpa benar-benar menunggu.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        # Seperti sleep asli, waktu selalu maju sedikit walaupun jeda yang diminta nyaris nol
+        self.now += max(seconds, 1e-6)
+
+class Response:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+def responses(*statuses):
+    """
+    :return: Fungsi request yang membalas status berikutnya (atau melempar exception jika berupa exception).
+    """
+    pending = list(statuses)
+
+    def send():
+        status = pending.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        return status if isinstance(status, Response) else Response(status)
+    return send
+
+def test_token_bucket_budget(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    assert all(bucket.try_acquire() == 0.0 for _ in range(4))
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    assert bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+    assert bucket.acquire(tokens=2, timeout=0.1) is False
+
+def test_weight_budget_paces_requests(clock):
+    # 1200 weight per menit = 20 per detik, burst 5 detik; clearinghouseState berbobot 2
+    governor = RateGovernor(1200, weights={"clearinghouseState": 2})
+    for _ in range(50):
+        governor.call("clearinghouseState", responses(200))
+    assert clock.sleeps == []
+    for _ in range(10):
+        governor.call("clearinghouseState", responses(200))
+    assert sum(clock.sleeps) == pytest.approx(10 * 2 / 20, abs=1e-3)
+
+def test_backoff_retries_5xx_then_succeeds(clock):
+    governor = RateGovernor(float('inf'), max_retries=3)
+    response = governor.call("clearinghouseState", responses(502, 503, 200))
+    assert response.status_code == 200 and governor.retries == 2
+    assert governor.breaker("clearinghouseState").state == CircuitBreaker.CLOSED
+    # Full jitter: jeda acak antara 0 dan base * 2^attempt
+    assert 0 <= clock.sleeps[0] <= 0.5 and 0 <= clock.sleeps[1] <= 1.0
+    assert all(0 <= backoff_delay(10, cap=30.0) <= 30.0 for _ in range(100))
+
+def test_429_pauses_all_requests_for_retry_after(clock):
+    governor = RateGovernor(float('inf'))
+    response = governor.call("clearinghouseState", responses(Response(429, {"Retry-After": "3"}), 200))
+    assert response.status_code == 200 and governor.throttled == 1
+    assert sum(clock.sleeps) >= 3.0
+
+def test_network_error_raised_after_retries(clock):
+    governor = RateGovernor(float('inf'), max_retries=2)
+    error = requests.exceptions.ConnectionError("reset")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        governor.call("metaAndAssetCtxs", responses(error, error, error))
+    assert governor.retries == 2 and governor.breaker("metaAndAssetCtxs").failures == 1
+
+def test_4xx_is_returned_without_retry(clock):
+    governor = RateGovernor(float('inf'))
+    assert governor.call("clearinghouseState", responses(422)).status_code == 422
+    assert governor.retries == 0 and clock.sleeps == []
+
+def test_circuit_breaker_transitions(clock):
+    governor = RateGovernor(float('inf'), max_retries=0, failure_threshold=3, reset_timeout=30)
+    breaker = governor.breaker("clearinghouseState")
+    for _ in range(3):
+        governor.call("clearinghouseState", responses(500))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        governor.call("clearinghouseState", responses(200))
+    # Endpoint lain punya breaker sendiri
+    assert governor.call("metaAndAssetCtxs", responses(200)).status_code == 200
+
+    clock.now += 30
+    # Half-open: hanya satu request percobaan; gagal -> terbuka lagi
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now += 30
+    assert governor.call("clearinghouseState", responses(200)).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+    assert governor.stats()["rejected"] == 1
+    assert governor.stats()["breakers"] == {"clearinghouseState": "closed", "metaAndAssetCtxs": "closed"}
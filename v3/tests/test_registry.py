@@ -0,0 +1,69 @@
+import json
+from hypertracker.registry import AddressRegistry
+
+ADDRESSES = [f"0x{i:040x}" for i in range(10)]
+
+def open_registry(tmp_path, **kwargs) -> AddressRegistry:
+    return AddressRegistry(str(tmp_path / "addresses.json"), **kwargs).load()
+
+def test_journal_replay_restores_ids_after_crash(tmp_path):
+    registry = open_registry(tmp_path)
+    registry.add_many(ADDRESSES[:5])
+    registry.remove_many([registry.id_of(ADDRESSES[1])])
+    registry.add(ADDRESSES[5])
+    ids = dict(registry.items())
+    # Belum ada compaction: satu baris journal per alamat yang berubah, file utama belum ditulis
+    assert len(open(registry.journal_path).read().splitlines()) == 7
+    assert not (tmp_path / "addresses.json").exists()
+
+    reloaded = open_registry(tmp_path)
+    assert dict(reloaded.items()) == ids
+    assert reloaded.snapshot() == (ADDRESSES[0], ADDRESSES[2], ADDRESSES[3], ADDRESSES[4], ADDRESSES[5])
+    # Load memutar ulang journal lalu compaction
+    assert open(reloaded.journal_path).read() == ""
+    assert json.load(open(reloaded.path))['next_id'] == 7
+
+def test_ids_are_not_reused_after_remove(tmp_path):
+    registry = open_registry(tmp_path)
+    registry.add_many(ADDRESSES[:3])
+    registry.remove(registry.id_of(ADDRESSES[2]))
+    assert registry.add(ADDRESSES[3]) == 4
+    assert open_registry(tmp_path).id_of(ADDRESSES[3]) == 4
+
+def test_truncated_journal_line_is_skipped(tmp_path):
+    registry = open_registry(tmp_path)
+    registry.add_many(ADDRESSES[:2])
+    with open(registry.journal_path, "a") as f:
+        f.write('{"op":"add","id":3,"addr')
+    reloaded = open_registry(tmp_path)
+    assert reloaded.snapshot() == tuple(ADDRESSES[:2])
+
+def test_automatic_compaction(tmp_path):
+    registry = open_registry(tmp_path, compact_every=4)
+    for address in ADDRESSES[:3]:
+        registry.add(address)
+    assert len(open(registry.journal_path).read().splitlines()) == 3
+    registry.add(ADDRESSES[3])
+    assert open(registry.journal_path).read() == ""
+    assert [e['address'] for e in json.load(open(registry.path))['addresses']] == ADDRESSES[:4]
+
+def test_legacy_list_and_stale_journal_ids(tmp_path):
+    path = tmp_path / "addresses.json"
+    path.write_text(json.dumps(ADDRESSES[:2]))
+    # Journal basi dari daftar sebelumnya memakai ID yang kini dimiliki alamat lain
+    (tmp_path / "addresses.json.journal").write_text(json.dumps({"op": "add", "id": 1, "address": ADDRESSES[7]}) + "\n")
+    registry = AddressRegistry(str(path)).load()
+    assert registry.id_of(ADDRESSES[0]) == 1 and registry.id_of(ADDRESSES[1]) == 2
+    assert registry.id_of(ADDRESSES[7]) == 3
+
+def test_invalid_and_duplicate_addresses_rejected_and_remove_hook(tmp_path):
+    registry = open_registry(tmp_path)
+    removed = []
+    registry.on_remove(removed.append)
+    added, rejected = registry.add_many([ADDRESSES[0], ADDRESSES[0], "0x123", "bukan alamat"])
+    assert [a for _, a in added] == [ADDRESSES[0]]
+    assert rejected == [ADDRESSES[0], "0x123", "bukan alamat"]
+    version = registry.version
+    assert registry.remove(99) is None and registry.version == version
+    assert registry.remove(1) == ADDRESSES[0]
+    assert removed == [[ADDRESSES[0]]] and ADDRESSES[0] not in registry and len(registry) == 0
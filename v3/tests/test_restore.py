@@ -0,0 +1,58 @@
+import configparser
+import pytest
+from hypertracker import main, shared
+from hypertracker.exposure import ExposureTracker, compute_exposure
+from hypertracker.leases import LeaseTable
+from hypertracker.position_store import PositionStateStore
+from hypertracker.positions import Position
+from hypertracker.registry import AddressRegistry
+from hypertracker.sharding import shard_for
+from hypertracker.state_store import StateStore
+
+PARTITIONS = 16
+ADDRESSES = [f"0x{i:040x}" for i in range(60)]
+
+@pytest.fixture
+def node(tmp_path, monkeypatch):
+    """
+    main.py dengan state store berisi 60 alamat, tetapi 10 alamat sudah dihapus dari registry selagi bot mati.
+    """
+    store = StateStore(str(tmp_path / "state.db"), journal_mode='DELETE')
+    store.save({a: {"BTC": Position("BTC", 1.0, 10.0, 100.0, 100.0, 0.0)} for a in ADDRESSES})
+    registry = AddressRegistry(str(tmp_path / "addresses.json"))
+    registry.add_many(ADDRESSES[:50])
+    states = PositionStateStore()
+    tracker = ExposureTracker()
+    config = configparser.ConfigParser()
+    config['cluster'] = {'path': str(tmp_path / "leases.db"), 'node_id': 'a', 'partitions': str(PARTITIONS)}
+    monkeypatch.setattr(main, "config", config)
+    monkeypatch.setattr(main, "state_store", store)
+    monkeypatch.setattr(main, "address_registry", registry)
+    monkeypatch.setattr(main, "previous_positions", states)
+    monkeypatch.setattr(main, "lease_table", None)
+    monkeypatch.setattr(shared, "exposure_tracker", tracker)
+    yield states, tracker
+    if main.lease_table is not None:
+        main.lease_table.release_all()
+
+def test_restore_skips_addresses_removed_while_down(node):
+    states, tracker = node
+    assert main.restore_state() == 50
+    assert set(states.keys()) == set(ADDRESSES[:50])
+    assert tracker.verify(states) == []
+
+def test_cluster_node_loads_only_owned_partitions(node, tmp_path):
+    states, tracker = node
+    path = str(tmp_path / "leases.db")
+    other = LeaseTable(path, "b", PARTITIONS, 30.0)
+    other.renew()
+    # Heartbeat node a terdaftar, lalu b melepas kelebihan jatahnya
+    LeaseTable(path, "a", PARTITIONS, 30.0).renew()
+    other.renew()
+
+    main.start_cluster()
+    owned = main.lease_table.owned
+    assert len(owned) == PARTITIONS // 2
+    expected = {a for a in ADDRESSES[:50] if shard_for(a, PARTITIONS) in owned}
+    assert set(states.keys()) == expected
+    assert compute_exposure(states)["BTC"].wallets == len(expected) == tracker.get("BTC").wallets
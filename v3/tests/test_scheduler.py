@@ -0,0 +1,77 @@
+from hypertracker.scheduler import AdaptiveScheduler, ACTIVITY_FACTOR, IDLE_FACTOR
+
+ADDRESSES = [f"0x{i:040x}" for i in range(40)]
+NOW = 1000.0
+
+def scheduler(**kwargs) -> AdaptiveScheduler:
+    kwargs.setdefault('budget_per_minute', 1e9)
+    return AdaptiveScheduler(min_interval=15, max_interval=300, base_interval=60, **kwargs)
+
+def test_new_addresses_are_due_in_order_and_pinned_go_first():
+    pinned = {ADDRESSES[5]}
+    s = scheduler(pinned=pinned)
+    s.sync(ADDRESSES[:10], now=NOW)
+    due = s.pop_due(now=NOW)
+    assert due[0] == ADDRESSES[5]
+    assert due[1:] == [a for a in ADDRESSES[:10] if a not in pinned]
+    assert s.pop_due(now=NOW) == []
+
+def test_intervals_adapt_within_bounds():
+    s = scheduler()
+    a = ADDRESSES[0]
+    s.sync([a], now=NOW)
+    s.pop_due(now=NOW)
+    s.complete(a, active=False, now=NOW)
+    assert s.interval(a) == 60 * IDLE_FACTOR
+    now = NOW + s.interval(a)
+    for _ in range(20):
+        assert s.pop_due(now=now) == [a]
+        s.complete(a, active=False, now=now)
+        now += s.interval(a)
+    assert s.interval(a) == 300
+    s.pop_due(now=now)
+    s.complete(a, active=True, now=now)
+    assert s.interval(a) == 300 * ACTIVITY_FACTOR
+    for _ in range(10):
+        now += s.interval(a)
+        s.pop_due(now=now)
+        s.complete(a, active=True, now=now)
+    assert s.interval(a) == 15
+
+def test_next_deadline_is_anchored_to_planned_deadline():
+    s = scheduler()
+    a = ADDRESSES[0]
+    s.sync([a], now=NOW)
+    s.pop_due(now=NOW)
+    # Poll selesai 5 detik terlambat; deadline berikutnya tetap NOW + interval, bukan NOW + 5 + interval
+    s.complete(a, active=False, now=NOW + 5)
+    assert s.time_until_next(now=NOW + 5) == 90 - 5
+    assert s.pop_due(now=NOW + 89.9) == []
+    assert s.pop_due(now=NOW + 90) == [a]
+
+def test_budget_defers_due_addresses():
+    s = scheduler(budget_per_minute=60)
+    s.sync(ADDRESSES, now=NOW)
+    first = s.pop_due(now=NOW)
+    # Burst = seperempat anggaran per menit
+    assert len(first) == 15 and s.deferred == 1
+    assert s.time_until_next(now=NOW) > 0
+    assert s.pop_due(now=NOW) == []
+    assert s.stats()['addresses'] == 40
+
+def test_removed_and_newly_pinned_addresses():
+    pinned = set()
+    s = scheduler(pinned=pinned)
+    s.sync(ADDRESSES[:3], now=NOW)
+    for a in s.pop_due(now=NOW):
+        s.complete(a, active=False, now=NOW)
+
+    s.sync(ADDRESSES[1:3], now=NOW + 1)
+    assert s.interval(ADDRESSES[0]) is None
+    pinned.add(ADDRESSES[2])
+    s.sync(ADDRESSES[1:3], now=NOW + 1)
+    # Pin baru langsung jatuh tempo dan memakai interval minimum
+    assert s.pop_due(now=NOW + 1) == [ADDRESSES[2]]
+    assert s.interval(ADDRESSES[2]) == 15
+    s.complete(ADDRESSES[2], active=False, now=NOW + 1)
+    assert s.interval(ADDRESSES[2]) == 15 and s.stats()['pinned'] == 1
@@ -0,0 +1,75 @@
+import time
+import pytest
+from hypertracker.hyperliquid import parse_clearinghouse_state
+from hypertracker.positions import modify_data
+from hypertracker.sharding import ShardManager, partition, shard_for
+from mock_server import MockServer, make_clearinghouse_state
+
+ADDRESSES = [f"0x{i:040x}" for i in range(100)]
+
+def test_partition_is_stable_and_case_insensitive():
+    shards = partition(ADDRESSES, 4)
+    assert sorted(a for shard in shards for a in shard) == sorted(ADDRESSES)
+    assert all(shard_for(a, 4) == shard_for(a.upper().replace("0X", "0x"), 4) for a in ADDRESSES)
+    assert all(shard for shard in shards)
+
+@pytest.mark.parametrize("start_method", [None, "spawn"])
+def test_workers_start_restart_and_stop(start_method):
+    manager = ShardManager(2, {'log_level': 30}, start_method=start_method)
+    manager.start()
+    try:
+        assert manager.update([]) == []
+        manager.set_pinned(set())
+        assert all(process.is_alive() for process in manager._processes)
+
+        manager._processes[0].kill()
+        manager._processes[0].join(5)
+        assert manager.check_workers() == [0] and manager.restarts == 1
+        assert manager._processes[0].is_alive()
+    finally:
+        manager.stop()
+    # Worker keluar sendiri lewat perintah None, bukan terminate()
+    assert [process.exitcode for process in manager._processes] == [0, 0]
+
+def test_respawned_worker_resumes_polling_and_pins():
+    addresses = ADDRESSES[:8]
+    shard = partition(addresses, 2)[0]
+    pinned = shard[0]
+    with MockServer(n_positions=3) as server:
+        # Hanya alamat yang dipin di-poll ulang (interval dasar jauh lebih lama dari durasi tes)
+        manager = ShardManager(2, {
+            'log_level': 30, 'api_url': f"{server.url}/info", 'concurrency': 4,
+            'scheduler': {'min_interval': 0.2, 'max_interval': 1000, 'base_interval': 1000},
+            'ratelimit': {'weight_per_minute': 1e9},
+        })
+        manager.start()
+        try:
+            manager.update(addresses)
+            manager.set_pinned({pinned})
+            manager._processes[0].kill()
+            manager._processes[0].join(5)
+            manager.get_results(timeout=0.2)
+
+            # Worker baru mulai dari state siklus 0 yang dipegang proses utama, server sudah di siklus 1
+            server.cycle = 1
+            states = {a: modify_data(parse_clearinghouse_state(a, make_clearinghouse_state(a, 3, 0))) for a in addresses}
+            assert manager.check_workers(states) == [0]
+
+            polls = []
+            deadline = time.monotonic() + 15
+            while time.monotonic() < deadline and polls.count(pinned) < 4:
+                for shard_id, batch, _, _ in manager.get_results(timeout=0.5):
+                    if shard_id != 0:
+                        continue
+                    for address, _, events, error in batch:
+                        assert error is None
+                        # Poll pertama setiap alamat menghasilkan event perubahan siklus 0 -> 1
+                        if address not in polls:
+                            assert events
+                        polls.append(address)
+        finally:
+            manager.stop()
+    assert set(polls) == set(shard)
+    # Pin ikut dikirim ulang ke worker baru, sehingga alamat yang dipin terus di-poll dengan interval minimum
+    assert polls.count(pinned) >= 4
+    assert all(polls.count(address) == 1 for address in shard if address != pinned)
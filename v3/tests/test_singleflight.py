@@ -0,0 +1,87 @@
+import threading
+import time
+from hypertracker import singleflight
+from hypertracker.singleflight import SingleFlight
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def run_concurrently(flight, key, function, n: int = 8) -> list:
+    results, errors = [], []
+    barrier = threading.Barrier(n)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(flight.do(key, function))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results + errors
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight(freshness=0)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"positions": []}
+
+    results = run_concurrently(flight, ("clearinghouseState", "0xa"), fetch)
+    assert len(calls) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+    assert flight.stats()["executed"] == 1 and flight.stats()["shared"] == 7
+    # freshness 0: hasil tidak di-cache
+    flight.do(("clearinghouseState", "0xa"), fetch)
+    assert len(calls) == 2
+
+def test_errors_reach_all_waiters_and_are_not_cached():
+    flight = SingleFlight(freshness=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("500")
+
+    results = run_concurrently(flight, "k", fetch, n=4)
+    assert len(calls) == 1 and all(isinstance(r, ValueError) for r in results) and len(results) == 4
+    assert flight.do("k", lambda: "ok") == "ok"
+
+def test_result_reused_until_freshness_expires(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(singleflight, "time", clock)
+    flight = SingleFlight(freshness=2.0)
+    values = iter(range(10))
+    fetch = lambda: next(values)
+
+    assert flight.do("k", fetch) == 0
+    clock.now += 1.9
+    assert flight.do("k", fetch) == 0 and flight.cached == 1
+    clock.now += 0.2
+    assert flight.do("k", fetch) == 1
+    # Key berbeda tidak berbagi hasil
+    assert flight.do("other", fetch) == 2
+
+    flight.forget("k")
+    assert flight.do("k", fetch) == 3
+    assert flight.stats() == {"executed": 4, "shared": 0, "cached": 1, "coalesced_ratio": 0.2}
+
+def test_expired_entries_evicted_at_capacity(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(singleflight, "time", clock)
+    flight = SingleFlight(freshness=1.0, max_entries=3)
+    for key in range(3):
+        flight.do(key, lambda: key)
+    clock.now += 5
+    flight.do("new", lambda: None)
+    assert list(flight._calls) == ["new"]
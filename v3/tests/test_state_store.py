@@ -0,0 +1,64 @@
+import pytest
+from hypertracker import main
+from hypertracker.position_store import PositionStateStore
+from hypertracker.positions import Position
+from hypertracker.state_store import StateStore
+
+ADDRESSES = [f"0x{i:040x}" for i in range(3)]
+
+def snapshot(size: float) -> dict:
+    return {
+        "BTC": Position("BTC", size, 10.0, 65000.5, abs(size) * 65000.5, -12.25, 59000.0, update_time="2026-01-02 03:04:05"),
+        "kPEPE": Position("kPEPE", -size * 1000, 3.0, 0.0123, 12.3, 0.5, 0.0, update_time="2026-01-02 03:04:05"),
+    }
+
+@pytest.mark.parametrize("journal_mode", ["WAL", "DELETE"])
+def test_save_load_round_trip(tmp_path, journal_mode):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path, journal_mode=journal_mode)
+    store.save({ADDRESSES[0]: snapshot(1.5), ADDRESSES[1]: snapshot(-2.0), ADDRESSES[2]: {}})
+    store.save({ADDRESSES[1]: snapshot(3.0)})
+    store.delete([ADDRESSES[2]])
+    store.close()
+
+    reopened = StateStore(path, journal_mode=journal_mode)
+    assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == journal_mode
+    assert reopened.load() == {ADDRESSES[0]: snapshot(1.5), ADDRESSES[1]: snapshot(3.0)}
+    assert reopened.load([ADDRESSES[1], "0xunknown"]) == {ADDRESSES[1]: snapshot(3.0)}
+
+    target = PositionStateStore()
+    assert reopened.load_into(target, [ADDRESSES[0]]) == 1
+    assert target.keys() == [ADDRESSES[0]] and target[ADDRESSES[0]] == snapshot(1.5)
+    reopened.close()
+
+def test_failed_save_rolls_back_and_checkpoint_requeues(tmp_path, monkeypatch):
+    store = StateStore(str(tmp_path / "state.db"))
+    states = PositionStateStore()
+    states.update({address: snapshot(1.0) for address in ADDRESSES})
+    monkeypatch.setattr(main, "state_store", store)
+    monkeypatch.setattr(main, "previous_positions", states)
+    monkeypatch.setattr(main, "dirty_addresses", set(ADDRESSES[:2]))
+
+    # Tabel hilang: INSERT gagal di tengah transaksi, save melapor gagal tanpa exception
+    store._conn.execute("ALTER TABLE tracker_state RENAME TO broken")
+    main.checkpoint_state()
+    assert not store._conn.in_transaction
+    assert main.dirty_addresses == set(ADDRESSES[:2])
+
+    # Alamat yang berubah selama checkpoint gagal tetap ikut checkpoint berikutnya
+    main.dirty_addresses.add(ADDRESSES[2])
+    store._conn.execute("ALTER TABLE broken RENAME TO tracker_state")
+    main.checkpoint_state()
+    assert main.dirty_addresses == set()
+    assert store.load() == {address: snapshot(1.0) for address in ADDRESSES}
+
+def test_save_survives_failed_begin(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    other = StateStore(str(tmp_path / "state.db"))
+    other._conn.execute("BEGIN EXCLUSIVE")
+    store._conn.execute("PRAGMA busy_timeout=0")
+    # Database dikunci koneksi lain: save melapor gagal tanpa exception dan koneksi tetap bisa dipakai
+    assert store.save({ADDRESSES[0]: snapshot(1.0)}) is False
+    other._conn.execute("ROLLBACK")
+    assert store.save({ADDRESSES[0]: snapshot(1.0)}) is True
+    assert other.load() == {ADDRESSES[0]: snapshot(1.0)}
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+import pytest
+from hypertracker import main, shared, stream
+from hypertracker.exposure import ExposureTracker
+from hypertracker.position_store import PositionStateStore
+from hypertracker.registry import AddressRegistry
+from hypertracker.hyperliquid import parse_clearinghouse_state
+from mock_server import MockWebSocketServer, make_clearinghouse_state
+from hypertracker.stream import PositionStream
+
+ADDRESSES = [f"0x{i:040x}" for i in range(5)]
+
+def channels(addresses) -> set:
+    return {(kind, a) for a in addresses for kind in ("webData2", "userFills")}
+
+async def wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("kondisi tidak tercapai sebelum timeout")
+        await asyncio.sleep(0.01)
+
+class Harness:
+    """
+    PositionStream yang terhubung ke MockWebSocketServer, dengan REST snapshot dan callback yang dicatat.
+    """
+
+    def __init__(self, server, addresses, per_connection: int = 2):
+        self.addresses = list(addresses)
+        self.snapshots = []
+        self.fetched = Counter()
+        self.invalidated = []
+        self._lock = threading.Lock()
+        self.stream = PositionStream(lambda: self.addresses, self.on_snapshot, self.fetch, url=server.url,
+                                     addresses_per_connection=per_connection, concurrency=4,
+                                     invalidate_snapshot=self.invalidated.append)
+
+    def on_snapshot(self, user_address, leaderboard_info):
+        with self._lock:
+            self.snapshots.append((user_address, leaderboard_info))
+
+    def fetch(self, user_address):
+        with self._lock:
+            self.fetched[user_address] += 1
+        return parse_clearinghouse_state(user_address, make_clearinghouse_state(user_address, 3))
+
+def run(scenario):
+    async def main():
+        async with MockWebSocketServer() as server:
+            await scenario(server)
+    asyncio.run(main())
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(stream, "BACKOFF_MIN", 0.01)
+
+def test_subscribes_over_few_connections_and_forwards_pushes():
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES, per_connection=2)
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.subscribed() == channels(ADDRESSES))
+        assert server.connects == 3 and len(harness.stream.connections) == 3
+        # Setiap koneksi baru direkonsiliasi dengan snapshot REST
+        await wait_for(lambda: set(harness.fetched) == set(ADDRESSES) and len(harness.snapshots) == len(ADDRESSES))
+
+        assert await server.push_state(ADDRESSES[0], seed=1) == 1
+        await wait_for(lambda: len(harness.snapshots) > len(ADDRESSES))
+        user_address, info = harness.snapshots[-1]
+        assert user_address == ADDRESSES[0]
+        assert len(info["positions"]) == server.n_positions
+        await harness.stream.close()
+    run(scenario)
+
+def test_reconnect_resubscribes_and_reconciles_with_rest():
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES[:2], per_connection=2)
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.subscribed() == channels(ADDRESSES[:2]))
+        await wait_for(lambda: all(harness.fetched[a] == 1 for a in ADDRESSES[:2]))
+
+        await server.drop_connections()
+        await wait_for(lambda: server.connects == 2 and server.subscribed() == channels(ADDRESSES[:2]))
+        # Push yang terlewat selama koneksi putus ditutup oleh snapshot REST setelah reconnect
+        await wait_for(lambda: all(harness.fetched[a] == 2 for a in ADDRESSES[:2]))
+        await harness.stream.close()
+    run(scenario)
+
+def test_fill_invalidates_cache_and_reconciles():
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES[:1])
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: harness.fetched[ADDRESSES[0]] == 1)
+
+        before = len(harness.snapshots)
+        assert await server.push_fill(ADDRESSES[0]) == 1
+        await wait_for(lambda: harness.fetched[ADDRESSES[0]] == 2)
+        await wait_for(lambda: len(harness.snapshots) > before)
+        assert harness.invalidated == [ADDRESSES[0]]
+        await harness.stream.close()
+    run(scenario)
+
+def test_removed_addresses_unsubscribe_and_empty_connection_closes():
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES[:4], per_connection=2)
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.subscribed() == channels(ADDRESSES[:4]) and server.open_connections == 2)
+
+        # Satu alamat keluar: hanya channel alamat itu yang di-unsubscribe
+        harness.addresses = ADDRESSES[1:4]
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.subscribed() == channels(ADDRESSES[1:4]))
+        assert ("unsubscribe", "webData2", ADDRESSES[0]) in server.log
+
+        # Koneksi kedua kehilangan semua alamatnya dan ditutup
+        harness.addresses = ADDRESSES[1:2]
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.open_connections == 1)
+        assert [c.task is None for c in harness.stream.connections] == [False, True]
+
+        # Slot kosong dipakai lagi untuk alamat baru
+        harness.addresses = ADDRESSES[1:2] + [ADDRESSES[0], ADDRESSES[4]]
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: server.subscribed() == channels(harness.addresses))
+        assert len(harness.stream.connections) == 2 and server.open_connections == 2
+        await harness.stream.close()
+    run(scenario)
+
+def test_pushes_for_untracked_addresses_are_ignored():
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES[:1])
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: harness.fetched[ADDRESSES[0]] == 1)
+        await wait_for(lambda: len(harness.snapshots) == 1)
+
+        await harness.stream.handle_message('{"channel": "webData2", "data": {"user": "0xunknown", "clearinghouseState": {}}}')
+        await harness.stream.handle_message("not json")
+        assert len(harness.snapshots) == 1
+        await harness.stream.close()
+    run(scenario)
+
+def test_new_batch_is_subscribed_before_concurrent_reconcile(monkeypatch):
+    order = []
+    subscription_messages = stream._subscription_messages
+
+    def record_subscription(method, user_address):
+        order.append((method, user_address))
+        return subscription_messages(method, user_address)
+    monkeypatch.setattr(stream, "_subscription_messages", record_subscription)
+
+    async def scenario(server):
+        harness = Harness(server, ADDRESSES[:3], per_connection=2)
+        await harness.stream._sync_watchlist()
+        await wait_for(lambda: len(harness.snapshots) == 3 and all(c.ws is not None for c in harness.stream.connections))
+        harness.addresses = ADDRESSES[1:3]
+        await harness.stream._sync_watchlist()
+
+        # Dua alamat baru jatuh ke dua koneksi aktif yang berbeda; snapshot REST dibuat lambat
+        in_flight, peak, lock = [0], [0], threading.Lock()
+        fetch = harness.fetch
+        def slow_fetch(user_address):
+            with lock:
+                order.append(("fetch", user_address))
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.3)
+            with lock:
+                in_flight[0] -= 1
+            return fetch(user_address)
+        harness.stream.fetch_snapshot = slow_fetch
+
+        del order[:]
+        harness.addresses = ADDRESSES[1:5]
+        await harness.stream._sync_watchlist()
+        assert {harness.stream._owner[a] for a in ADDRESSES[3:5]} == set(harness.stream.connections)
+        # Seluruh batch di-subscribe sebelum rekonsiliasi pertama, lalu kedua koneksi direkonsiliasi bersamaan
+        assert [kind for kind, _ in order] == ["subscribe", "subscribe", "fetch", "fetch"]
+        assert peak[0] == 2 and len(harness.snapshots) == 5
+        await wait_for(lambda: server.subscribed() == channels(ADDRESSES[1:5]))
+        await harness.stream.close()
+    run(scenario)
+
+def test_stream_history_records_only_changes(tmp_path, monkeypatch):
+    registry = AddressRegistry(str(tmp_path / "addresses.json"))
+    registry.add(ADDRESSES[0])
+    recorded = []
+    monkeypatch.setattr(main, "address_registry", registry)
+    monkeypatch.setattr(main, "previous_positions", PositionStateStore())
+    monkeypatch.setattr(main, "dirty_addresses", set())
+    monkeypatch.setattr(main, "lease_table", None)
+    monkeypatch.setattr(main, "notify", lambda user_address, text: None)
+    monkeypatch.setattr(main, "outage_tracker", main.OutageTracker(lambda text: None))
+    monkeypatch.setattr(shared, "exposure_tracker", ExposureTracker())
+    monkeypatch.setattr(shared, "history_store", type("History", (), {"record": staticmethod(recorded.append)})())
+
+    def push(seed):
+        main.process_address(ADDRESSES[0], parse_clearinghouse_state(ADDRESSES[0], make_clearinghouse_state(ADDRESSES[0], 3, seed)))
+
+    # Snapshot pertama dan push berulang tanpa perubahan posisi tidak menulis history
+    push(0)
+    push(0)
+    push(0)
+    assert recorded == []
+    push(1)
+    assert len(recorded) == 1 and list(recorded[0]) == [ADDRESSES[0]]